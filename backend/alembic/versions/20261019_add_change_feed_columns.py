@@ -0,0 +1,38 @@
+"""add created_at to messages and guesses for the change feed
+
+Revision ID: 20261019_add_change_feed_columns
+Revises: 20261019_add_session_participants
+Create Date: 2026-10-19 18:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20261019_add_change_feed_columns"
+down_revision = "20261019_add_session_participants"
+branch_labels = None
+depends_on = None
+
+
+TABLES = ("messages", "guesses")
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column("created_at", sa.DateTime(timezone=True), nullable=True))
+        # Existing rows never recorded when they were written; their session's
+        # creation time puts them before anything written from now on
+        op.execute(
+            f"UPDATE {table} SET created_at = "
+            f"(SELECT sessions.created_at FROM sessions WHERE sessions.id = {table}.session_id) "
+            "WHERE created_at IS NULL"
+        )
+        op.create_index(f"ix_{table}_created_at_id", table, ["created_at", "id"])
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_index(f"ix_{table}_created_at_id", table_name=table)
+        op.drop_column(table, "created_at")
@@ -0,0 +1,34 @@
+"""add llm call event query indexes
+
+Revision ID: 20261019_add_llm_call_event_query_indexes
+Revises: 20261019_add_llm_call_rollups
+Create Date: 2026-10-19 11:00:00.000000
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20261019_add_llm_call_event_query_indexes"
+down_revision = "20261019_add_llm_call_rollups"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = {
+    "ix_llm_call_events_created_at_id": ["created_at", "id"],
+    "ix_llm_call_events_participant_created_at": ["participant_id", "created_at"],
+    "ix_llm_call_events_provider_model_created_at": ["provider", "model", "created_at"],
+    "ix_llm_call_events_status_created_at": ["status", "created_at"],
+}
+
+
+def upgrade() -> None:
+    # On the partitioned Postgres table these cascade to every partition
+    for name, columns in INDEXES.items():
+        op.create_index(name, "llm_call_events", columns)
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.drop_index(name, table_name="llm_call_events")
@@ -0,0 +1,55 @@
+"""add llm call rollups and watermarks
+
+Revision ID: 20261019_add_llm_call_rollups
+Revises: 20261019_partition_llm_call_events
+Create Date: 2026-10-19 10:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "20261019_add_llm_call_rollups"
+down_revision = "20261019_partition_llm_call_events"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_call_rollups",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("provider", sa.String(length=32), nullable=False),
+        sa.Column("model", sa.String(length=128), nullable=False),
+        sa.Column("participant_role", sa.String(length=32), nullable=False),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("call_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latency_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latency_sum_ms", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latency_max_ms", sa.Integer(), nullable=True),
+        sa.Column("latency_buckets", sa.JSON(), nullable=False),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("completion_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint(
+            "bucket_start", "provider", "model", "participant_role", "status",
+            name="uq_llm_call_rollups_bucket_key",
+        ),
+    )
+
+    op.create_table(
+        "rollup_watermarks",
+        sa.Column("name", sa.String(length=64), primary_key=True, nullable=False),
+        sa.Column("last_created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_event_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("rollup_watermarks")
+    op.drop_table("llm_call_rollups")
@@ -0,0 +1,91 @@
+"""add full-text search over messages.comms and internal_thoughts
+
+Revision ID: 20261019_add_message_search
+Revises: 20261019_add_session_archived_at
+Create Date: 2026-10-19 20:00:00.000000
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20261019_add_message_search"
+down_revision = "20261019_add_session_archived_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        # Stored generated column: rewrites messages once, then maintained by Postgres on write
+        op.execute(
+            "ALTER TABLE messages ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(comms, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(internal_thoughts, '')), 'B')"
+            ") STORED"
+        )
+        op.execute("CREATE INDEX IF NOT EXISTS ix_messages_search_vector ON messages USING GIN (search_vector)")
+    elif bind.dialect.name == "sqlite":
+        exists = bind.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'messages_search_keys'"
+        ).first()
+        if exists:
+            # Already created at startup (app.core.search_index)
+            return
+        # Drop an earlier startup-created index keyed on messages.rowid
+        for trigger in ("messages_fts_insert", "messages_fts_delete", "messages_fts_update"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS messages_fts")
+        # Keyed on messages_search_keys, not messages.rowid, which VACUUM may renumber
+        op.execute(
+            "CREATE TABLE messages_search_keys (key INTEGER PRIMARY KEY, message_id UUID NOT NULL UNIQUE)"
+        )
+        op.execute(
+            "CREATE VIEW messages_search_source AS "
+            "SELECT k.key, k.message_id, m.comms, m.internal_thoughts "
+            "FROM messages_search_keys k JOIN messages m ON m.id = k.message_id"
+        )
+        op.execute(
+            "CREATE VIRTUAL TABLE messages_fts USING fts5("
+            "message_id UNINDEXED, comms, internal_thoughts, "
+            "content='messages_search_source', content_rowid='key', tokenize='porter unicode61')"
+        )
+        op.execute(
+            "CREATE TRIGGER messages_fts_insert AFTER INSERT ON messages BEGIN "
+            "INSERT INTO messages_search_keys(message_id) VALUES (new.id); "
+            "INSERT INTO messages_fts(rowid, message_id, comms, internal_thoughts) "
+            "SELECT key, new.id, new.comms, new.internal_thoughts FROM messages_search_keys "
+            "WHERE message_id = new.id; END"
+        )
+        op.execute(
+            "CREATE TRIGGER messages_fts_delete AFTER DELETE ON messages BEGIN "
+            "INSERT INTO messages_fts(messages_fts, rowid, message_id, comms, internal_thoughts) "
+            "SELECT 'delete', key, old.id, old.comms, old.internal_thoughts FROM messages_search_keys "
+            "WHERE message_id = old.id; "
+            "DELETE FROM messages_search_keys WHERE message_id = old.id; END"
+        )
+        op.execute(
+            "CREATE TRIGGER messages_fts_update AFTER UPDATE OF comms, internal_thoughts ON messages BEGIN "
+            "INSERT INTO messages_fts(messages_fts, rowid, message_id, comms, internal_thoughts) "
+            "SELECT 'delete', key, old.id, old.comms, old.internal_thoughts FROM messages_search_keys "
+            "WHERE message_id = old.id; "
+            "INSERT INTO messages_fts(rowid, message_id, comms, internal_thoughts) "
+            "SELECT key, new.id, new.comms, new.internal_thoughts FROM messages_search_keys "
+            "WHERE message_id = new.id; END"
+        )
+        op.execute("INSERT INTO messages_search_keys(message_id) SELECT id FROM messages")
+        op.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_messages_search_vector")
+        op.execute("ALTER TABLE messages DROP COLUMN IF EXISTS search_vector")
+    elif bind.dialect.name == "sqlite":
+        for trigger in ("messages_fts_insert", "messages_fts_delete", "messages_fts_update"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS messages_fts")
+        op.execute("DROP VIEW IF EXISTS messages_search_source")
+        op.execute("DROP TABLE IF EXISTS messages_search_keys")
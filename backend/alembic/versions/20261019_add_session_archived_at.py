@@ -0,0 +1,24 @@
+"""add sessions.archived_at for cold-storage archival
+
+Revision ID: 20261019_add_session_archived_at
+Revises: 20261019_add_change_feed_columns
+Create Date: 2026-10-19 19:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20261019_add_session_archived_at"
+down_revision = "20261019_add_change_feed_columns"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("sessions", sa.Column("archived_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("sessions", "archived_at")
@@ -0,0 +1,114 @@
+"""add session event log and snapshots
+
+Revision ID: 20261019_add_session_event_log
+Revises: 20261019_add_session_summary_columns
+Create Date: 2026-10-19 14:00:00.000000
+"""
+
+import json
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "20261019_add_session_event_log"
+down_revision = "20261019_add_session_summary_columns"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    session_events = op.create_table(
+        "session_events",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("session_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("turn", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(length=16), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["session_id"], ["sessions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("session_id", "seq", name="uq_session_events_session_seq"),
+    )
+    op.create_table(
+        "session_snapshots",
+        sa.Column("session_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("last_seq", sa.Integer(), nullable=False),
+        sa.Column("turn_number", sa.Integer(), nullable=False),
+        sa.Column("state", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["session_id"], ["sessions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("session_id"),
+    )
+
+    # Backfill the log from messages/guesses in the order next_turn applies
+    # them in memory: per turn, each guess and its [System] feedback line,
+    # then the turn's messages. No snapshots are written; the first turn
+    # played after the upgrade creates one.
+    bind = op.get_bind()
+    sessions = bind.execute(sa.text("SELECT id, participants FROM sessions")).fetchall()
+    for session in sessions:
+        participants = session.participants
+        if isinstance(participants, str):
+            participants = json.loads(participants)
+        names = {pid: (meta or {}).get("name") for pid, meta in (participants or {}).items()}
+
+        turns = {}
+        for row in bind.execute(
+            sa.text(
+                "SELECT turn, participant_id, guess, correct, tries_remaining FROM guesses "
+                "WHERE session_id = :sid ORDER BY turn, id"
+            ),
+            {"sid": session.id},
+        ):
+            if row.correct:
+                feedback = "Correct!"
+            elif row.tries_remaining <= 0:
+                feedback = "Incorrect. No tries remaining."
+            else:
+                feedback = "Incorrect."
+            name = names.get(row.participant_id) or row.participant_id
+            turns.setdefault(row.turn, []).extend([
+                ("guess", {
+                    "participant_id": row.participant_id,
+                    "guess": row.guess,
+                    "correct": bool(row.correct),
+                    "tries_remaining": row.tries_remaining,
+                }),
+                ("system", {
+                    "participant_id": "system",
+                    "comms": f"Guess from {name}: '{row.guess}'. Result: {feedback}",
+                }),
+            ])
+        for row in bind.execute(
+            sa.text("SELECT turn, participant_id, comms FROM messages WHERE session_id = :sid ORDER BY turn, id"),
+            {"sid": session.id},
+        ):
+            turns.setdefault(row.turn, []).append(("message", {
+                "participant_id": row.participant_id,
+                "comms": row.comms,
+                "participant_name": names.get(row.participant_id),
+            }))
+
+        rows = []
+        for turn in sorted(turns):
+            for kind, payload in turns[turn]:
+                rows.append({
+                    "id": uuid.uuid4(),
+                    "session_id": session.id if isinstance(session.id, uuid.UUID) else uuid.UUID(str(session.id)),
+                    "seq": len(rows) + 1,
+                    "turn": turn,
+                    "kind": kind,
+                    "payload": payload,
+                })
+        if rows:
+            op.bulk_insert(session_events, rows)
+
+
+def downgrade() -> None:
+    op.drop_table("session_snapshots")
+    op.drop_table("session_events")
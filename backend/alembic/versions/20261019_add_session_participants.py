@@ -0,0 +1,80 @@
+"""add session participants table
+
+Revision ID: 20261019_add_session_participants
+Revises: 20261019_add_idempotency_keys
+Create Date: 2026-10-19 17:00:00.000000
+"""
+
+import json
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "20261019_add_session_participants"
+down_revision = "20261019_add_idempotency_keys"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    session_participants = op.create_table(
+        "session_participants",
+        sa.Column("session_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("participant_id", sa.String(length=64), nullable=False),
+        sa.Column("provider", sa.String(length=32), nullable=False),
+        sa.Column("model", sa.String(length=128), nullable=True),
+        sa.Column("role", sa.String(length=16), nullable=False),
+        sa.Column("name", sa.Text(), nullable=True),
+        sa.Column("order", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["session_id"], ["sessions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("session_id", "participant_id"),
+    )
+    op.create_index(
+        "ix_session_participants_provider_role", "session_participants", ["provider", "role", "session_id"]
+    )
+    op.create_index(
+        "ix_session_participants_model_role", "session_participants", ["model", "role", "session_id"]
+    )
+
+    # Backfill from the participants JSON. The model was never stored with the
+    # session; take it from the participant's logged LLM calls where there are any
+    bind = op.get_bind()
+    models = {}
+    for row in bind.execute(
+        sa.text(
+            "SELECT session_id, participant_id, model FROM llm_call_events "
+            "WHERE session_id IS NOT NULL AND participant_id IS NOT NULL AND model IS NOT NULL "
+            "ORDER BY created_at"
+        )
+    ):
+        models.setdefault((str(row.session_id), row.participant_id), row.model)
+
+    rows = []
+    for session in bind.execute(sa.text("SELECT id, participants FROM sessions")):
+        participants = session.participants
+        if isinstance(participants, str):
+            participants = json.loads(participants)
+        session_id = session.id if isinstance(session.id, uuid.UUID) else uuid.UUID(str(session.id))
+        for pid, meta in (participants or {}).items():
+            meta = meta or {}
+            rows.append({
+                "session_id": session_id,
+                "participant_id": pid,
+                "provider": meta.get("provider") or "openai",
+                "model": models.get((str(session.id), pid)),
+                "role": meta.get("role") or "bystander",
+                "name": meta.get("name"),
+                "order": meta.get("order"),
+            })
+    if rows:
+        op.bulk_insert(session_participants, rows)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_session_participants_model_role", table_name="session_participants")
+    op.drop_index("ix_session_participants_provider_role", table_name="session_participants")
+    op.drop_table("session_participants")
@@ -0,0 +1,92 @@
+"""add denormalized session summary columns
+
+Revision ID: 20261019_add_session_summary_columns
+Revises: 20261019_add_sessions_created_at_index
+Create Date: 2026-10-19 13:00:00.000000
+"""
+
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20261019_add_session_summary_columns"
+down_revision = "20261019_add_sessions_created_at_index"
+branch_labels = None
+depends_on = None
+
+
+TRIES_TOTAL = 3
+
+
+def upgrade() -> None:
+    op.add_column("sessions", sa.Column("turn_number", sa.Integer(), nullable=False, server_default="1"))
+    op.add_column("sessions", sa.Column("message_count", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("sessions", sa.Column("tries_remaining", sa.JSON(), nullable=True))
+    op.add_column("sessions", sa.Column("game_over", sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.add_column("sessions", sa.Column("game_status", sa.String(length=16), nullable=True))
+    op.add_column("sessions", sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index("ix_sessions_game_status_created_at", "sessions", ["game_status", "created_at"])
+
+    # Backfill from messages/guesses using the same rules next_turn applies:
+    # a correct guess wins; a receiver reaching zero tries loses.
+    bind = op.get_bind()
+    message_stats = {
+        row.session_id: (row.count, row.max_turn)
+        for row in bind.execute(
+            sa.text(
+                "SELECT session_id, count(*) AS count, max(turn) AS max_turn "
+                "FROM messages GROUP BY session_id"
+            )
+        )
+    }
+    guesses_by_session = {}
+    for row in bind.execute(
+        sa.text(
+            "SELECT session_id, participant_id, correct, tries_remaining "
+            "FROM guesses ORDER BY session_id, turn"
+        )
+    ):
+        guesses_by_session.setdefault(row.session_id, []).append(row)
+
+    sessions = bind.execute(sa.text("SELECT id, participants FROM sessions")).fetchall()
+    for session in sessions:
+        participants = session.participants
+        if isinstance(participants, str):
+            participants = json.loads(participants)
+        receivers = [pid for pid, meta in (participants or {}).items() if (meta or {}).get("role") == "receiver"]
+        tries = {pid: TRIES_TOTAL for pid in receivers}
+
+        game_status = None
+        for guess in guesses_by_session.get(session.id, []):
+            if guess.participant_id in tries and guess.tries_remaining is not None:
+                tries[guess.participant_id] = guess.tries_remaining
+            if guess.correct:
+                game_status = "win"
+            elif game_status is None and guess.tries_remaining == 0:
+                game_status = "loss"
+
+        count, max_turn = message_stats.get(session.id, (0, 0))
+        bind.execute(
+            sa.text(
+                "UPDATE sessions SET turn_number = :turn_number, message_count = :message_count, "
+                "tries_remaining = :tries, game_over = :game_over, game_status = :game_status "
+                "WHERE id = :id"
+            ).bindparams(sa.bindparam("tries", type_=sa.JSON())),
+            {
+                "turn_number": (max_turn or 0) + 1,
+                "message_count": count or 0,
+                "tries": tries,
+                "game_over": game_status is not None,
+                "game_status": game_status,
+                "id": session.id,
+            },
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sessions_game_status_created_at", table_name="sessions")
+    for column in ("updated_at", "game_status", "game_over", "tries_remaining", "message_count", "turn_number"):
+        op.drop_column("sessions", column)
@@ -0,0 +1,24 @@
+"""add session turn lease
+
+Revision ID: 20261019_add_session_turn_lease
+Revises: 20261019_add_session_event_log
+Create Date: 2026-10-19 15:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20261019_add_session_turn_lease"
+down_revision = "20261019_add_session_event_log"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("sessions", sa.Column("turn_started_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("sessions", "turn_started_at")
@@ -0,0 +1,25 @@
+"""add sessions.turn_token so turn leases are matched on a random token
+
+Revision ID: 20261019_add_session_turn_token
+Revises: 20261019_add_message_search
+Create Date: 2026-10-19 21:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "20261019_add_session_turn_token"
+down_revision = "20261019_add_message_search"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("sessions", sa.Column("turn_token", postgresql.UUID(as_uuid=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("sessions", "turn_token")
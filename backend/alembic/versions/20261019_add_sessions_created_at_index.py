@@ -0,0 +1,23 @@
+"""add sessions created_at keyset index
+
+Revision ID: 20261019_add_sessions_created_at_index
+Revises: 20261019_add_llm_call_event_query_indexes
+Create Date: 2026-10-19 12:00:00.000000
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20261019_add_sessions_created_at_index"
+down_revision = "20261019_add_llm_call_event_query_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_sessions_created_at_id", "sessions", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sessions_created_at_id", table_name="sessions")
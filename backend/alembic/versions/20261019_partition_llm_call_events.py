@@ -0,0 +1,119 @@
+"""partition llm call events by month
+
+Revision ID: 20261019_partition_llm_call_events
+Revises: 20241005_add_llm_call_events
+Create Date: 2026-10-19 09:00:00.000000
+"""
+
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20261019_partition_llm_call_events"
+down_revision = "20241005_add_llm_call_events"
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = """
+    id UUID NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    session_id UUID REFERENCES sessions(id) ON DELETE SET NULL,
+    participant_id VARCHAR(64),
+    participant_role VARCHAR(32),
+    participant_name VARCHAR(128),
+    provider VARCHAR(32),
+    model VARCHAR(128),
+    turn_number INTEGER,
+    latency_ms INTEGER,
+    prompt_text TEXT,
+    request_payload JSON,
+    response_text TEXT,
+    response_payload JSON,
+    status VARCHAR(32) NOT NULL DEFAULT 'unknown',
+    status_detail TEXT,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    total_tokens INTEGER,
+    context_snapshot JSON
+"""
+
+COLUMN_NAMES = (
+    "id, created_at, session_id, participant_id, participant_role, participant_name, "
+    "provider, model, turn_number, latency_ms, prompt_text, request_payload, response_text, "
+    "response_payload, status, status_detail, prompt_tokens, completion_tokens, total_tokens, "
+    "context_snapshot"
+)
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + (value.month - 1) + months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        # SQLite dev databases keep a plain table; archival deletes in batches there.
+        return
+
+    op.execute("ALTER TABLE llm_call_events RENAME TO llm_call_events_legacy")
+    op.execute(
+        "ALTER INDEX ix_llm_call_events_session_created_at "
+        "RENAME TO ix_llm_call_events_legacy_session_created_at"
+    )
+    op.execute(
+        f"CREATE TABLE llm_call_events ({COLUMNS}, PRIMARY KEY (id, created_at)) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    op.execute(
+        "CREATE INDEX ix_llm_call_events_session_created_at "
+        "ON llm_call_events (session_id, created_at)"
+    )
+
+    # One partition per month from the oldest existing row through three months ahead
+    now = datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM llm_call_events_legacy")).scalar()
+    month = now
+    if oldest is not None:
+        month = oldest.astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    last = _add_months(now, 3)
+    while month <= last:
+        end = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE llm_call_events_y{month.year:04d}m{month.month:02d} "
+            f"PARTITION OF llm_call_events FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        month = end
+    op.execute("CREATE TABLE llm_call_events_default PARTITION OF llm_call_events DEFAULT")
+
+    op.execute(
+        f"INSERT INTO llm_call_events ({COLUMN_NAMES}) "
+        f"SELECT {COLUMN_NAMES} FROM llm_call_events_legacy"
+    )
+    op.execute("DROP TABLE llm_call_events_legacy")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE llm_call_events RENAME TO llm_call_events_partitioned")
+    op.execute(
+        "ALTER INDEX ix_llm_call_events_session_created_at "
+        "RENAME TO ix_llm_call_events_partitioned_session_created_at"
+    )
+    op.execute(f"CREATE TABLE llm_call_events ({COLUMNS}, PRIMARY KEY (id))")
+    op.execute(
+        "CREATE INDEX ix_llm_call_events_session_created_at "
+        "ON llm_call_events (session_id, created_at)"
+    )
+    op.execute(
+        f"INSERT INTO llm_call_events ({COLUMN_NAMES}) "
+        f"SELECT {COLUMN_NAMES} FROM llm_call_events_partitioned"
+    )
+    op.execute("DROP TABLE llm_call_events_partitioned CASCADE")
@@ -1,4 +1,4 @@
-from .agent_manager import HiddenMessageAgent
+from .agent_manager import HiddenMessageAgent, default_model
 from .schemas import AgentOutput, AgentContext
 
-__all__ = ["HiddenMessageAgent", "AgentOutput", "AgentContext"]
\ No newline at end of file
+__all__ = ["HiddenMessageAgent", "default_model", "AgentOutput", "AgentContext"]
\ No newline at end of file
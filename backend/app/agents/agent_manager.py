@@ -25,6 +25,25 @@ SECRET_WORDS = [
     "nebula", "resonance", "fractal", "zenith", "odyssey", "enigma"
 ]
 
+
+def default_model(provider: str) -> str:
+    """Model string a provider's agents run on, from env defaults.
+
+    Defaults follow Pydantic AI KnownModelName suggestions.
+    """
+    provider_map = {
+        # Defaults configurable via env, with requested overrides
+        "openai": os.getenv("OPENAI_DEFAULT_MODEL", "openai:gpt-5"),
+        "anthropic": os.getenv("ANTHROPIC_DEFAULT_MODEL", "anthropic:claude-sonnet-4-20250514"),
+        "google": os.getenv("GOOGLE_DEFAULT_MODEL", "google:gemini-1.5-flash"),
+        "google-gla": os.getenv("GOOGLE_GLA_DEFAULT_MODEL", "google-gla:gemini-2.5-pro"),
+    }
+    model = provider_map.get(provider)
+    if model is None:
+        raise ValueError(f"Unsupported provider: {provider}")
+    return model
+
+
 class HiddenMessageAgent:
     """Manages AI agents for the hidden message game"""
 
@@ -35,21 +54,8 @@ class HiddenMessageAgent:
         self.logger = get_logger("agents.manager")
 
     def _get_model_string(self, provider: str) -> str:
-        """Convert provider name to model string using env defaults.
-
-        Defaults follow Pydantic AI KnownModelName suggestions.
-        """
-        provider_map = {
-            # Defaults configurable via env, with requested overrides
-            "openai": os.getenv("OPENAI_DEFAULT_MODEL", "openai:gpt-5"),
-            "anthropic": os.getenv("ANTHROPIC_DEFAULT_MODEL", "anthropic:claude-sonnet-4-20250514"),
-            "google": os.getenv("GOOGLE_DEFAULT_MODEL", "google:gemini-1.5-flash"),
-            "google-gla": os.getenv("GOOGLE_GLA_DEFAULT_MODEL", "google-gla:gemini-2.5-pro"),
-        }
-        model = provider_map.get(provider)
-        if model is None:
-            raise ValueError(f"Unsupported provider: {provider}")
-        return model
+        """Convert provider name to model string using env defaults."""
+        return default_model(provider)
 
     def _create_agent(self, role: str, provider: str, *, model_override: Optional[str] = None) -> Agent[AgentOutput]:
         """Create a Pydantic AI agent for specific role using provider."""
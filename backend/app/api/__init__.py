@@ -1,4 +1,10 @@
 from .routes import router
+from .analytics import router as analytics_router
+from .changes import router as changes_router
+from .events import router as events_router
+from .export import router as export_router
+from .metrics import router as metrics_router
+from .search import router as search_router
 from .schemas import (
     StartSessionRequest,
     StartSessionResponse,
@@ -8,6 +14,12 @@ from .schemas import (
 
 __all__ = [
     "router",
+    "analytics_router",
+    "changes_router",
+    "events_router",
+    "export_router",
+    "metrics_router",
+    "search_router",
     "StartSessionRequest",
     "StartSessionResponse",
     "NextTurnRequest",
@@ -0,0 +1,68 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.analytics import GROUP_FIELDS, estimate_percentile, query_rollups
+from ..core.logging import get_logger
+from ..models import get_read_db
+from .schemas import LLMCallAnalyticsItem, LLMCallAnalyticsResponse
+
+router = APIRouter(prefix="/analytics")
+logger = get_logger("api.analytics")
+
+
+@router.get("/llm-calls", response_model=LLMCallAnalyticsResponse)
+async def llm_call_analytics(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    group_by: str = Query(",".join(GROUP_FIELDS), description="Comma-separated subset of provider,model,role,status"),
+    granularity: Literal["hour", "day", "total"] = "total",
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+    role: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Latency percentiles, token usage and error rates answered from hourly rollups.
+
+    Read-only: rollups are refreshed in the background (see app.core.analytics).
+    """
+    fields = [f.strip() for f in group_by.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in GROUP_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown group_by fields: {', '.join(unknown)}")
+
+    groups = await query_rollups(
+        db,
+        since=since,
+        until=until,
+        group_by=fields,
+        granularity=granularity,
+        provider=provider,
+        model=model,
+        role=role,
+    )
+
+    items = []
+    for group in groups:
+        acc = group.acc
+        items.append(
+            LLMCallAnalyticsItem(
+                bucket_start=group.bucket_start,
+                **group.key,
+                calls=acc.call_count,
+                errors=group.error_count,
+                error_rate=(group.error_count / acc.call_count) if acc.call_count else 0.0,
+                latency_avg_ms=(acc.latency_sum_ms / acc.latency_count) if acc.latency_count else None,
+                latency_p50_ms=estimate_percentile(acc.latency_buckets, 0.50, acc.latency_max_ms),
+                latency_p90_ms=estimate_percentile(acc.latency_buckets, 0.90, acc.latency_max_ms),
+                latency_p99_ms=estimate_percentile(acc.latency_buckets, 0.99, acc.latency_max_ms),
+                latency_max_ms=acc.latency_max_ms,
+                prompt_tokens=acc.prompt_tokens,
+                completion_tokens=acc.completion_tokens,
+                total_tokens=acc.total_tokens,
+            )
+        )
+
+    return LLMCallAnalyticsResponse(granularity=granularity, group_by=fields, items=items)
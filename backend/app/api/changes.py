@@ -0,0 +1,119 @@
+"""Change feed over messages, guesses and llm_call_events.
+
+Rows of each table are ordered by ``(created_at, id)`` and the cursor holds
+the last position returned per table, so a consumer can tail the database
+with ``GET /api/changes?since=<next_cursor>`` and never sees a row twice.
+
+``created_at`` is set when the row is inserted, not when its transaction
+commits, so a slow transaction can make a row appear behind the cursor.
+Rows younger than CHANGES_SETTLE_SECONDS are therefore held back until
+every transaction that could still insert before them has finished.
+
+Imports bypass the feed: scripts/import_data.py keeps each row's original
+``created_at``, which is usually behind a tailing consumer's cursor, so
+imported rows are only seen by reading again from an older ``since``.
+An ISO ``since`` without a timezone is taken as UTC.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import heapq
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.logging import get_logger
+from ..models import GuessModel, LLMCallEventModel, MessageModel, get_read_db
+from ..models.database import utcnow
+from .pagination import decode_cursor, encode_cursor
+from .schemas import ChangeFeedResponse, ChangeItem
+
+router = APIRouter(prefix="/changes")
+logger = get_logger("api.changes")
+
+CHANGES_SETTLE_SECONDS = float(os.getenv("CHANGES_SETTLE_SECONDS", "5"))
+
+CHANGE_TABLES = {
+    "messages": MessageModel,
+    "guesses": GuessModel,
+    "llm_call_events": LLMCallEventModel,
+}
+
+Position = Optional[Tuple[datetime, Any]]
+
+
+def _parse_since(since: Optional[str]) -> Dict[str, Position]:
+    """Positions per table from a cursor, or from an ISO timestamp to start at."""
+    if not since:
+        return {table: None for table in CHANGE_TABLES}
+    try:
+        start = datetime.fromisoformat(since)
+    except ValueError:
+        values = decode_cursor(since, 2 * len(CHANGE_TABLES))
+        positions = {}
+        for i, table in enumerate(CHANGE_TABLES):
+            created_at, row_id = values[2 * i], values[2 * i + 1]
+            positions[table] = (created_at, row_id) if created_at is not None else None
+        return positions
+    # Stored timestamps are UTC; without this an offset or naive value compares wrongly
+    start = start.replace(tzinfo=timezone.utc) if start.tzinfo is None else start.astimezone(timezone.utc)
+    # No id yet: rows at `start` itself are included
+    return {table: (start, None) for table in CHANGE_TABLES}
+
+
+def _encode_positions(positions: Dict[str, Position]) -> str:
+    values: List[Any] = []
+    for table in CHANGE_TABLES:
+        values.extend(positions[table] or (None, None))
+    return encode_cursor(values)
+
+
+@router.get("", response_model=ChangeFeedResponse)
+async def list_changes(
+    since: Optional[str] = Query(
+        None, description="next_cursor of a previous page, or an ISO timestamp to start from"
+    ),
+    tables: Optional[str] = Query(None, description="Comma-separated subset of messages, guesses, llm_call_events"),
+    limit: int = Query(200, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Rows written after `since`, oldest first across the selected tables"""
+    selected = list(CHANGE_TABLES)
+    if tables:
+        selected = [name.strip() for name in tables.split(",") if name.strip()]
+        unknown = [name for name in selected if name not in CHANGE_TABLES]
+        if unknown:
+            raise HTTPException(status_code=422, detail=f"Unknown tables: {', '.join(unknown)}")
+
+    positions = _parse_since(since)
+    settled_before = utcnow() - timedelta(seconds=CHANGES_SETTLE_SECONDS)
+
+    # Up to `limit` rows from each table, then the oldest `limit` of them overall
+    per_table = []
+    for table in selected:
+        model = CHANGE_TABLES[table]
+        query = select(model.__table__).where(model.created_at < settled_before)
+        position = positions[table]
+        if position is not None:
+            created_at, row_id = position
+            if row_id is None:
+                query = query.where(model.created_at >= created_at)
+            else:
+                query = query.where(
+                    or_(model.created_at > created_at, and_(model.created_at == created_at, model.id > row_id))
+                )
+        query = query.order_by(model.created_at.asc(), model.id.asc()).limit(limit + 1)
+        rows = (await db.execute(query)).mappings().all()
+        per_table.append([(row["created_at"], str(row["id"]), table, dict(row)) for row in rows])
+
+    merged = list(heapq.merge(*per_table, key=lambda item: (item[0], item[1])))
+    page = merged[:limit]
+    has_more = len(merged) > limit
+
+    changes = []
+    for created_at, _, table, row in page:
+        positions[table] = (created_at, row["id"])
+        changes.append(ChangeItem(table=table, row=row))
+
+    return ChangeFeedResponse(changes=changes, next_cursor=_encode_positions(positions), has_more=has_more)
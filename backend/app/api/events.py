@@ -0,0 +1,101 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.logging import get_logger
+from ..models import LLMCallEventModel, get_read_db
+from .pagination import decode_cursor, encode_cursor
+from .schemas import LLMCallEventListResponse
+
+router = APIRouter(prefix="/llm-events")
+logger = get_logger("api.events")
+
+_COLUMNS = {c.name: c for c in LLMCallEventModel.__table__.columns}
+
+# Prompt/response bodies and context snapshots dominate row size; they are
+# only returned when explicitly requested via `fields`.
+LARGE_FIELDS = ("prompt_text", "request_payload", "response_text", "response_payload", "context_snapshot")
+DEFAULT_FIELDS = tuple(name for name in _COLUMNS if name not in LARGE_FIELDS)
+
+
+def _resolve_fields(fields: Optional[str]) -> List[str]:
+    if not fields:
+        return list(DEFAULT_FIELDS)
+    if fields.strip() == "*":
+        return list(_COLUMNS)
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in _COLUMNS]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown fields: {', '.join(unknown)}")
+    # Sort keys are always selected so the cursor can be built
+    return list(dict.fromkeys(["id", "created_at", *requested]))
+
+
+@router.get("", response_model=LLMCallEventListResponse)
+async def list_llm_events(
+    session_id: Optional[UUID] = None,
+    participant_id: Optional[str] = None,
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    fields: Optional[str] = Query(None, description="Comma-separated columns, or * for all"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """List LLM call events, newest first, with keyset pagination"""
+    selected = _resolve_fields(fields)
+    event = LLMCallEventModel
+
+    query = select(*(_COLUMNS[name] for name in selected))
+    if session_id is not None:
+        query = query.where(event.session_id == session_id)
+    if participant_id is not None:
+        query = query.where(event.participant_id == participant_id)
+    if provider is not None:
+        query = query.where(event.provider == provider)
+    if model is not None:
+        query = query.where(event.model == model)
+    if status is not None:
+        query = query.where(event.status == status)
+    if since is not None:
+        query = query.where(event.created_at >= since)
+    if until is not None:
+        query = query.where(event.created_at < until)
+
+    after = decode_cursor(cursor, 2)
+    if after is not None:
+        last_created_at, last_id = after
+        query = query.where(
+            or_(
+                event.created_at < last_created_at,
+                and_(event.created_at == last_created_at, event.id < last_id),
+            )
+        )
+
+    query = query.order_by(event.created_at.desc(), event.id.desc()).limit(limit + 1)
+    rows = (await db.execute(query)).mappings().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1]["created_at"], rows[-1]["id"]])
+
+    return LLMCallEventListResponse(items=[dict(row) for row in rows], next_cursor=next_cursor)
+
+
+@router.get("/{event_id}")
+async def get_llm_event(event_id: UUID, db: AsyncSession = Depends(get_read_db)):
+    """Return a single LLM call event including prompt and response bodies"""
+    row = (
+        await db.execute(select(*_COLUMNS.values()).where(LLMCallEventModel.id == event_id))
+    ).mappings().first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="LLM call event not found")
+    return dict(row)
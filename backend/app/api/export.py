@@ -0,0 +1,82 @@
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+
+from ..core.export import EXPORT_MODELS, EXPORT_TABLES, ExportFilters, iter_export_batches
+from ..core.logging import get_logger
+from ..core.row_writers import ParquetWriter, pyarrow_available, remove_partial
+from ..models import get_read_sessionmaker
+from .serialization import dumps
+
+router = APIRouter(prefix="/export")
+logger = get_logger("api.export")
+
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+@router.get("/{table}")
+async def export_table(
+    table: str,
+    format: Literal["ndjson", "parquet"] = "ndjson",
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    provider: Optional[str] = None,
+    status: Optional[Literal["win", "loss", "active", "over"]] = None,
+    session_factory=Depends(get_read_sessionmaker),
+):
+    """Export a whole table (see app.core.export for the filters).
+
+    NDJSON is streamed as it is read. Parquet needs a seekable file, so it
+    is written to a temporary file batch by batch and sent from there;
+    pyarrow's encoding runs in the threadpool so it does not stall other
+    requests. Without pyarrow the NDJSON stream is returned instead. For
+    very large ranges prefer ``scripts/export_data.py``, which writes
+    Parquet without holding a request open.
+    """
+    if table not in EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown table; expected one of {', '.join(EXPORT_TABLES)}")
+    filters = ExportFilters(
+        created_after=created_after, created_before=created_before, provider=provider, status=status
+    )
+    stamp = f"{datetime.now():%Y%m%d-%H%M%S}"
+
+    if format == "parquet" and pyarrow_available():
+        tmp_dir = Path(tempfile.mkdtemp(prefix="hm-export-"))
+        writer = ParquetWriter(tmp_dir / f"{table}.parquet", EXPORT_MODELS[table].__table__)
+        try:
+            async with session_factory() as db:
+                async for batch in iter_export_batches(db, table, filters):
+                    await run_in_threadpool(writer.write_batch, batch)
+            await run_in_threadpool(writer.close)
+        except Exception:
+            remove_partial(writer)
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        logger.info("Exported %s rows of %s as Parquet", writer.rows_written, table)
+        return FileResponse(
+            writer.path,
+            media_type=PARQUET_MEDIA_TYPE,
+            filename=f"{table}-{stamp}.parquet",
+            background=BackgroundTask(shutil.rmtree, tmp_dir, ignore_errors=True),
+        )
+    if format == "parquet":
+        logger.warning("pyarrow is not installed; exporting %s as NDJSON instead", table)
+
+    async def lines():
+        async with session_factory() as db:
+            async for batch in iter_export_batches(db, table, filters):
+                yield b"".join(dumps(row) + b"\n" for row in batch)
+
+    return StreamingResponse(
+        lines(),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{table}-{stamp}.ndjson"'},
+    )
@@ -0,0 +1,141 @@
+"""NDJSON rendering of a session's history, one row at a time.
+
+The regular history endpoint materialises every message and guess as a
+Pydantic object before serialising; for sessions with hundreds of turns and
+long ``internal_thoughts`` that is the largest allocation in the API. This
+module iterates the rows with a server-side cursor (``stream_scalars``) and
+yields the body in chunks of HISTORY_STREAM_BATCH_SIZE lines, so memory
+stays flat however long the session is.
+
+Line format, one JSON object per line:
+
+    {"type": "session", "session_id": ..., "topic": ..., ..., "latest_turn": N}
+    {"type": "message", <SessionHistoryMessage fields>}   (by turn, then id)
+    {"type": "guess", <SessionHistoryGuess fields>}       (by turn, then id)
+
+Archived sessions (see core.session_archive) produce the same lines from
+their transcript, which is read whole; transcripts are bounded by the
+length of a finished game.
+"""
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence
+from uuid import UUID
+import json
+import os
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
+
+from ..models import GuessModel, MessageModel
+from .schemas import SessionHistoryGuess, SessionHistoryMessage
+
+HISTORY_STREAM_BATCH_SIZE = int(os.getenv("HISTORY_STREAM_BATCH_SIZE", "200"))
+
+
+def session_header_line(row, latest_turn: Optional[int]) -> bytes:
+    header = {
+        "type": "session",
+        "session_id": str(row.id),
+        "topic": row.topic,
+        "secret_word": row.secret_word,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "participants": row.participants or {},
+        "latest_turn": latest_turn,
+    }
+    return json.dumps(header, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _typed_line(kind: str, item_json: str) -> bytes:
+    # item_json is a serialised object; splice the type tag in front of its fields
+    if item_json == "{}":
+        return f'{{"type":"{kind}"}}\n'.encode("utf-8")
+    return f'{{"type":"{kind}",{item_json[1:]}\n'.encode("utf-8")
+
+
+def _message_line(msg, meta: Dict[str, Any], include_thoughts: bool) -> bytes:
+    return _typed_line(
+        "message",
+        SessionHistoryMessage(
+            turn=msg.turn,
+            participant_id=msg.participant_id,
+            participant_name=meta.get("name"),
+            participant_role=meta.get("role"),
+            comms=msg.comms,
+            internal_thoughts=msg.internal_thoughts if include_thoughts else "",
+        ).model_dump_json(exclude=None if include_thoughts else {"internal_thoughts"}),
+    )
+
+
+def _guess_line(guess, meta: Dict[str, Any]) -> bytes:
+    return _typed_line(
+        "guess",
+        SessionHistoryGuess(
+            turn=guess.turn,
+            participant_id=guess.participant_id,
+            participant_name=meta.get("name"),
+            participant_role=meta.get("role"),
+            guess=guess.guess,
+            correct=guess.correct,
+            tries_remaining=guess.tries_remaining,
+        ).model_dump_json(),
+    )
+
+
+async def history_lines(
+    db: AsyncSession,
+    session_id: UUID,
+    participants_meta: Dict[str, Dict[str, Any]],
+    *,
+    since_turn: Optional[int] = None,
+    include_thoughts: bool = True,
+    batch_size: int = HISTORY_STREAM_BATCH_SIZE,
+) -> AsyncIterator[bytes]:
+    """Yield the message and guess lines of a session, `batch_size` rows per chunk."""
+
+    def meta(participant_id: str) -> Dict[str, Any]:
+        return participants_meta.get(participant_id) or {}
+
+    message_query = select(MessageModel).where(MessageModel.session_id == session_id)
+    guess_query = select(GuessModel).where(GuessModel.session_id == session_id)
+    if since_turn is not None:
+        message_query = message_query.where(MessageModel.turn > since_turn)
+        guess_query = guess_query.where(GuessModel.turn > since_turn)
+    if not include_thoughts:
+        # Never fetched, not just dropped from the output
+        message_query = message_query.options(defer(MessageModel.internal_thoughts))
+
+    messages = await db.stream_scalars(
+        message_query.order_by(MessageModel.turn.asc(), MessageModel.id.asc())
+        .execution_options(yield_per=batch_size)
+    )
+    async for batch in messages.partitions(batch_size):
+        yield b"".join(_message_line(msg, meta(msg.participant_id), include_thoughts) for msg in batch)
+
+    guesses = await db.stream_scalars(
+        guess_query.order_by(GuessModel.turn.asc(), GuessModel.id.asc())
+        .execution_options(yield_per=batch_size)
+    )
+    async for batch in guesses.partitions(batch_size):
+        yield b"".join(_guess_line(guess, meta(guess.participant_id)) for guess in batch)
+
+
+def archived_history_lines(
+    messages: Sequence[Any],
+    guesses: Sequence[Any],
+    participants_meta: Dict[str, Dict[str, Any]],
+    *,
+    include_thoughts: bool = True,
+    batch_size: int = HISTORY_STREAM_BATCH_SIZE,
+) -> Iterator[bytes]:
+    """The same lines for an archived session, from rows already read out of the transcript store."""
+
+    def meta(participant_id: str) -> Dict[str, Any]:
+        return participants_meta.get(participant_id) or {}
+
+    for start in range(0, len(messages), batch_size):
+        yield b"".join(
+            _message_line(msg, meta(msg.participant_id), include_thoughts)
+            for msg in messages[start:start + batch_size]
+        )
+    for start in range(0, len(guesses), batch_size):
+        yield b"".join(_guess_line(guess, meta(guess.participant_id)) for guess in guesses[start:start + batch_size])
@@ -0,0 +1,106 @@
+"""Conditional GET, Cache-Control and content negotiation for the session read endpoints.
+
+next_turn bumps ``turn_number`` and ``message_count`` (and sets the game
+outcome) in the same transaction as the turn's rows, so those columns
+identify a version of the session's history without reading message rows.
+Once the game is over that version is final, and responses say so with a
+long public max-age that Caddy or a CDN can honour.
+
+Bodies of at least COMPRESS_MIN_BYTES are compressed with brotli (when the
+optional ``brotli`` package is installed) or gzip, per Accept-Encoding.
+A compressed or MessagePack body is a different representation, so its
+ETag is sent weak; If-None-Match compares weakly and still matches it.
+"""
+from typing import Optional
+import gzip
+import os
+
+from fastapi import Request, Response
+
+from .response_cache import CachedBody
+from .serialization import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, json_to_msgpack, negotiate_media_type
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPLETED_SESSION_MAX_AGE = int(os.getenv("COMPLETED_SESSION_MAX_AGE", "86400"))
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+
+def session_etag(row, variant: str = "") -> str:
+    """Strong ETag for a representation of the session `row` (any object with the summary columns)."""
+    outcome = row.game_status or ("over" if row.game_over else "active")
+    tag = f"t{row.turn_number}-m{row.message_count}-{outcome}"
+    if variant:
+        tag = f"{tag}-{variant}"
+    return f'"{tag}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header against `etag` (weak comparison, as RFC 9110 requires for GET)."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def cache_control(final: bool) -> str:
+    if final:
+        return f"public, max-age={COMPLETED_SESSION_MAX_AGE}, immutable"
+    # Always revalidate; with an ETag that costs one small query
+    return "no-cache"
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Preferred supported content coding in `accept_encoding`, or None for identity."""
+    if not accept_encoding:
+        return None
+    offered = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                q = float(value)
+            except ValueError:
+                q = 0.0
+        offered[coding.strip().lower()] = q
+    supported = ["br", "gzip"] if brotli is not None else ["gzip"]
+    ranked = [(offered.get(coding, offered.get("*", 0.0)), -i, coding) for i, coding in enumerate(supported)]
+    q, _, coding = max(ranked)
+    return coding if q > 0 else None
+
+
+def compress(body: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def cached_response(entry: CachedBody, request: Request) -> Response:
+    """Send a rendered body with its validators, or 304 when the client already has it.
+
+    The body is converted to MessagePack and compressed as the request's
+    Accept and Accept-Encoding headers ask.
+    """
+    headers = {"Cache-Control": cache_control(entry.final), "Vary": "Accept, Accept-Encoding"}
+    media_type = negotiate_media_type(request.headers.get("accept"))
+    body = entry.body
+    if body and media_type == MSGPACK_MEDIA_TYPE:
+        body = json_to_msgpack(body)
+    coding = choose_encoding(request.headers.get("accept-encoding")) if len(body) >= COMPRESS_MIN_BYTES else None
+
+    if entry.etag:
+        transformed = coding is not None or media_type != JSON_MEDIA_TYPE
+        headers["ETag"] = f"W/{entry.etag}" if transformed else entry.etag
+        if etag_matches(request.headers.get("if-none-match"), entry.etag):
+            return Response(status_code=304, headers=headers)
+    if coding is not None:
+        body = compress(body, coding)
+        headers["Content-Encoding"] = coding
+    return Response(content=body, media_type=media_type, headers=headers)
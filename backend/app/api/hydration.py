@@ -0,0 +1,137 @@
+from typing import Dict, List, Optional
+from uuid import UUID
+import os
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import MessageModel, SessionEventModel, SessionModel, SessionSnapshotModel
+from .session_log import apply_event
+from .session_state import SessionState
+
+ROLE_PRIORITY = {"communicator": 0, "receiver": 1, "bystander": 2}
+
+
+def participants_from_meta(participants_meta: Optional[Dict[str, dict]]) -> List[dict]:
+    """Expand the stored participants mapping into SessionState participant dicts."""
+    participants = []
+    for pid, meta in (participants_meta or {}).items():
+        meta = meta or {}
+        role = meta.get("role") or "bystander"
+        order = meta.get("order")
+        participants.append({
+            "id": pid,
+            "name": meta.get("name") or "Unknown",
+            "role": role,
+            "provider": meta.get("provider") or "openai",
+            "order": order if order is not None else ROLE_PRIORITY.get(role, 99),
+        })
+    return participants
+
+
+def receiver_tries(stored: Optional[Dict[str, int]], participants: List[dict]) -> Dict[str, int]:
+    """Tries remaining per receiver from the session summary, defaulting to a full set."""
+    total_tries = int(os.getenv("TRIES_TOTAL", "3"))
+    stored = stored or {}
+    return {
+        p["id"]: int(stored.get(p["id"], total_tries))
+        for p in participants
+        if p["role"] == "receiver"
+    }
+
+
+async def load_session_state(
+    db: AsyncSession,
+    session_id: UUID,
+    *,
+    include_history: bool = True,
+) -> Optional[SessionState]:
+    """Rebuild a SessionState from the database, normally in a single round-trip.
+
+    The session summary columns, the latest snapshot and the events appended
+    since it are fetched with one LEFT JOIN and replayed in seq order, so the
+    cost is bounded by SNAPSHOT_EVERY turns rather than the session length.
+    Sessions that predate the event log fall back to one extra query over
+    message comms. With include_history=False only the summary row is read.
+    Returns None when the session does not exist.
+    """
+    columns = [
+        SessionModel.topic,
+        SessionModel.secret_word,
+        SessionModel.participants,
+        SessionModel.turn_number,
+        SessionModel.tries_remaining,
+        SessionModel.game_over,
+        SessionModel.game_status,
+    ]
+    query = select(*columns).where(SessionModel.id == session_id)
+    if include_history:
+        query = (
+            query.add_columns(
+                SessionSnapshotModel.state,
+                SessionSnapshotModel.last_seq,
+                SessionSnapshotModel.turn_number.label("snapshot_turn"),
+                SessionEventModel.seq,
+                SessionEventModel.turn,
+                SessionEventModel.kind,
+                SessionEventModel.payload,
+            )
+            .outerjoin(SessionSnapshotModel, SessionSnapshotModel.session_id == SessionModel.id)
+            .outerjoin(
+                SessionEventModel,
+                and_(
+                    SessionEventModel.session_id == SessionModel.id,
+                    SessionEventModel.seq > func.coalesce(SessionSnapshotModel.last_seq, 0),
+                ),
+            )
+            .order_by(SessionEventModel.seq.asc())
+        )
+
+    rows = (await db.execute(query)).all()
+    if not rows:
+        return None
+
+    head = rows[0]
+    if include_history and head.state is not None:
+        state = SessionState.from_dict(
+            session_id, head.state, event_seq=head.last_seq, snapshot_turn=head.snapshot_turn
+        )
+    else:
+        participants = participants_from_meta(head.participants)
+        state = SessionState(
+            session_id=session_id,
+            topic=head.topic,
+            secret_word=head.secret_word,
+            participants=participants,
+            turn_number=head.turn_number or 1,
+            tries_remaining=receiver_tries(head.tries_remaining, participants),
+            game_over=bool(head.game_over),
+            game_status=head.game_status,
+        )
+    if not include_history:
+        return state
+
+    events = [row for row in rows if row.seq is not None]
+    for row in events:
+        apply_event(state, row.kind, row.payload, row.turn)
+        state.event_seq = row.seq
+
+    if head.state is None and not events:
+        # Written before the event log existed: rebuild history from message
+        # comms; the next turn snapshots it.
+        names = {p["id"]: p["name"] for p in state.participants}
+        messages = await db.execute(
+            select(MessageModel.participant_id, MessageModel.comms)
+            .where(MessageModel.session_id == session_id)
+            .order_by(MessageModel.turn.asc(), MessageModel.id.asc())
+        )
+        state.conversation_history = [
+            {
+                "participant_id": row.participant_id,
+                "comms": row.comms,
+                "participant_name": names.get(row.participant_id),
+            }
+            for row in messages
+        ]
+
+    return state
@@ -0,0 +1,267 @@
+"""Idempotency-Key support for endpoints that call the models or create rows.
+
+A request carrying an ``Idempotency-Key`` header runs at most once per key:
+
+- duplicates arriving while the first is still running wait for it, through a
+  shared future in this worker or by polling the key's row from other workers;
+- later duplicates get the stored body back with ``Idempotent-Replayed: true``
+  without touching any provider.
+
+Only successful responses are stored. After an error the key is released so
+the client can retry with it. Reusing a key for a different request is a 422.
+Completed keys are kept for IDEMPOTENCY_TTL_SECONDS, both in the
+idempotency_keys table and in a bounded in-process cache in front of it.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import hashlib
+import itertools
+import os
+import time
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.logging import get_logger
+from ..models import IdempotencyKeyModel
+from ..models.database import utcnow
+
+logger = get_logger("api.idempotency")
+
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+# How long a claimed key may stay in progress before another worker may take it over
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "300"))
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+POLL_INTERVAL_SECONDS = 0.25
+PURGE_EVERY = 100
+
+REPLAY_HEADER = "Idempotent-Replayed"
+
+
+@dataclass
+class StoredResponse:
+    request_hash: str
+    status_code: int
+    body: Any
+    expires_at: datetime
+
+
+_completed: "OrderedDict[str, StoredResponse]" = OrderedDict()
+_in_flight: Dict[str, Tuple[str, "asyncio.Future"]] = {}
+_claims = itertools.count(1)
+
+
+def request_fingerprint(endpoint: str, payload: BaseModel) -> str:
+    return hashlib.sha256(f"{endpoint}\n{payload.model_dump_json()}".encode("utf-8")).hexdigest()
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes for timezone-aware columns
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _mismatch() -> HTTPException:
+    return HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+
+
+def _replay(stored: StoredResponse, fingerprint: str) -> JSONResponse:
+    if stored.request_hash != fingerprint:
+        raise _mismatch()
+    return JSONResponse(status_code=stored.status_code, content=stored.body, headers={REPLAY_HEADER: "true"})
+
+
+def _cached(key: str) -> Optional[StoredResponse]:
+    stored = _completed.get(key)
+    if stored is None:
+        return None
+    if stored.expires_at <= utcnow():
+        del _completed[key]
+        return None
+    _completed.move_to_end(key)
+    return stored
+
+
+def _remember(key: str, stored: StoredResponse) -> None:
+    _completed[key] = stored
+    _completed.move_to_end(key)
+    while len(_completed) > IDEMPOTENCY_CACHE_SIZE:
+        _completed.popitem(last=False)
+
+
+async def run_idempotent(
+    db: AsyncSession,
+    key: Optional[str],
+    endpoint: str,
+    payload: BaseModel,
+    run: Callable[[], Awaitable[Any]],
+) -> Any:
+    """Run `run` once per Idempotency-Key; duplicates get the first outcome."""
+    if key is None:
+        return await run()
+    fingerprint = request_fingerprint(endpoint, payload)
+
+    stored = _cached(key)
+    if stored is not None:
+        return _replay(stored, fingerprint)
+
+    pending = _in_flight.get(key)
+    if pending is not None:
+        pending_hash, future = pending
+        if pending_hash != fingerprint:
+            raise _mismatch()
+        logger.info("Idempotency-Key %s is in flight in this worker; waiting for it", key)
+        return _replay(await asyncio.shield(future), fingerprint)
+
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[key] = (fingerprint, future)
+    try:
+        stored = await _claim(db, key, endpoint, fingerprint)
+        if stored is None:
+            try:
+                result = await run()
+            except BaseException:
+                await _release(db, key)
+                raise
+            stored = await _complete(db, key, fingerprint, result)
+            future.set_result(stored)
+            return result
+        _remember(key, stored)
+        future.set_result(stored)
+        return _replay(stored, fingerprint)
+    except Exception as e:
+        if not future.done():
+            future.set_exception(e)
+        raise
+    except BaseException:
+        if not future.done():
+            future.set_exception(HTTPException(status_code=409, detail="Original request was cancelled; retry"))
+        raise
+    finally:
+        _in_flight.pop(key, None)
+        if future.done() and not future.cancelled():
+            future.exception()  # mark retrieved when nobody was waiting
+
+
+async def _claim(db: AsyncSession, key: str, endpoint: str, fingerprint: str) -> Optional[StoredResponse]:
+    """Take ownership of `key`, or return the response another request already stored for it."""
+    if next(_claims) % PURGE_EVERY == 0:
+        await db.execute(delete(IdempotencyKeyModel).where(IdempotencyKeyModel.expires_at < utcnow()))
+        await db.commit()
+
+    deadline = time.monotonic() + IDEMPOTENCY_LOCK_SECONDS
+    while True:
+        now = utcnow()
+        try:
+            await db.execute(
+                insert(IdempotencyKeyModel).values(
+                    key=key,
+                    endpoint=endpoint,
+                    request_hash=fingerprint,
+                    locked_until=now + timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS),
+                    created_at=now,
+                    expires_at=now + timedelta(seconds=IDEMPOTENCY_TTL_SECONDS),
+                )
+            )
+            await db.commit()
+            return None
+        except IntegrityError:
+            await db.rollback()
+
+        row = (await db.execute(
+            select(
+                IdempotencyKeyModel.request_hash,
+                IdempotencyKeyModel.status_code,
+                IdempotencyKeyModel.response,
+                IdempotencyKeyModel.locked_until,
+                IdempotencyKeyModel.expires_at,
+            ).where(IdempotencyKeyModel.key == key)
+        )).one_or_none()
+        if row is None:
+            continue
+        if row.request_hash != fingerprint:
+            raise _mismatch()
+
+        if _aware(row.expires_at) <= now:
+            await db.execute(
+                delete(IdempotencyKeyModel).where(
+                    IdempotencyKeyModel.key == key, IdempotencyKeyModel.expires_at == row.expires_at
+                )
+            )
+            await db.commit()
+            continue
+        if row.status_code is not None:
+            return StoredResponse(fingerprint, row.status_code, row.response, _aware(row.expires_at))
+
+        if row.locked_until is None or _aware(row.locked_until) <= now:
+            # The owner died without finishing; take the key over
+            taken = await db.execute(
+                update(IdempotencyKeyModel)
+                .where(
+                    IdempotencyKeyModel.key == key,
+                    IdempotencyKeyModel.status_code.is_(None),
+                    IdempotencyKeyModel.locked_until == row.locked_until,
+                )
+                .values(locked_until=now + timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS))
+            )
+            await db.commit()
+            if taken.rowcount == 1:
+                logger.warning("Took over abandoned Idempotency-Key %s", key)
+                return None
+            continue
+
+        # Don't sit on a pooled connection between polls
+        await db.rollback()
+        if time.monotonic() >= deadline:
+            raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+        await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+
+async def _complete(db: AsyncSession, key: str, fingerprint: str, result: Any) -> StoredResponse:
+    stored = StoredResponse(
+        request_hash=fingerprint,
+        status_code=200,
+        body=jsonable_encoder(result),
+        expires_at=utcnow() + timedelta(seconds=IDEMPOTENCY_TTL_SECONDS),
+    )
+    _remember(key, stored)
+    try:
+        await db.execute(
+            update(IdempotencyKeyModel)
+            .where(IdempotencyKeyModel.key == key)
+            .values(
+                status_code=stored.status_code,
+                response=stored.body,
+                locked_until=None,
+                expires_at=stored.expires_at,
+            )
+        )
+        await db.commit()
+    except Exception:
+        # The work itself is committed; other workers will see the key as
+        # abandoned once its lock lapses
+        await db.rollback()
+        logger.exception("Failed to store response for Idempotency-Key %s", key)
+    return stored
+
+
+async def _release(db: AsyncSession, key: str) -> None:
+    try:
+        await db.rollback()
+        await db.execute(
+            delete(IdempotencyKeyModel).where(
+                IdempotencyKeyModel.key == key, IdempotencyKeyModel.status_code.is_(None)
+            )
+        )
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        logger.exception("Failed to release Idempotency-Key %s; it unlocks on its own", key)
@@ -0,0 +1,39 @@
+from fastapi import APIRouter
+
+from ..core.db_metrics import DB_SLOW_QUERY_MS, pool_stats, query_totals
+from ..models import engine, read_engine
+from .schemas import (
+    DatabaseMetricsResponse,
+    DatabasePoolMetrics,
+    ResponseCacheMetricsResponse,
+    SessionStoreMetricsResponse,
+)
+from .response_cache import response_cache
+from .session_store import session_store
+
+router = APIRouter(prefix="/metrics")
+
+
+@router.get("/session-store", response_model=SessionStoreMetricsResponse)
+async def session_store_metrics():
+    """Resident sessions, estimated memory and evictions for this worker's session store"""
+    return SessionStoreMetricsResponse(backend=session_store.name, **session_store.stats())
+
+
+@router.get("/response-cache", response_model=ResponseCacheMetricsResponse)
+async def response_cache_metrics():
+    """Entries, size and hit rate of this worker's history/status/list response cache"""
+    return ResponseCacheMetricsResponse(backend=response_cache.name, **response_cache.stats())
+
+
+@router.get("/db", response_model=DatabaseMetricsResponse)
+async def database_metrics():
+    """Connection pool occupancy and checkout waits, plus query totals, for this worker"""
+    return DatabaseMetricsResponse(
+        pool=DatabasePoolMetrics(**pool_stats(engine)),
+        read_pool=DatabasePoolMetrics(**pool_stats(read_engine)) if read_engine is not engine else None,
+        queries=query_totals.count,
+        query_time_ms=round(query_totals.total_ms, 3),
+        slow_queries=query_totals.slow,
+        slow_query_threshold_ms=DB_SLOW_QUERY_MS,
+    )
@@ -0,0 +1,44 @@
+"""Opaque keyset cursors shared by the paginated list endpoints."""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort-key values of the last returned row."""
+    plain = []
+    for value in values:
+        if isinstance(value, datetime):
+            plain.append({"dt": value.isoformat()})
+        elif isinstance(value, UUID):
+            plain.append({"uuid": str(value)})
+        else:
+            plain.append(value)
+    raw = json.dumps(plain, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: Optional[str], size: int) -> Optional[List[Any]]:
+    """Decode a cursor produced by `encode_cursor`; raises 400 when malformed."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        plain = json.loads(raw)
+        if not isinstance(plain, list) or len(plain) != size:
+            raise ValueError("wrong cursor size")
+        values = []
+        for value in plain:
+            if isinstance(value, dict) and "dt" in value:
+                values.append(datetime.fromisoformat(value["dt"]))
+            elif isinstance(value, dict) and "uuid" in value:
+                values.append(UUID(value["uuid"]))
+            else:
+                values.append(value)
+        return values
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -0,0 +1,242 @@
+"""Read-through cache for the session read endpoints.
+
+History, status and list responses are cached as serialized JSON, grouped
+by scope: one scope per session (``str(session_id)``) plus ``LIST_SCOPE``
+for the session list. A write drops the whole scope: next_turn invalidates
+its session and the list, start_session the list.
+
+A finished game never changes again, so its entries are kept for
+RESPONSE_CACHE_FINAL_TTL_SECONDS. Entries of games in progress and of the
+list only live for RESPONSE_CACHE_TTL_SECONDS. That bounds how stale another
+worker's in-memory copy can be; the Redis backend shares invalidations
+between workers.
+
+Selected with RESPONSE_CACHE: ``memory`` (default), ``redis`` or ``off``.
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+import json
+import os
+import time
+
+from ..core.logging import get_logger
+
+logger = get_logger("api.response_cache")
+
+RESPONSE_CACHE = os.getenv("RESPONSE_CACHE", "memory").lower()
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "5"))
+RESPONSE_CACHE_FINAL_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_FINAL_TTL_SECONDS", "86400"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+LIST_SCOPE = "sessions"
+
+
+@dataclass
+class CachedBody:
+    """A rendered response: JSON body, its ETag if any, and whether it can still change."""
+
+    body: bytes
+    etag: Optional[str] = None
+    final: bool = False
+
+    def encode(self) -> bytes:
+        return json.dumps(
+            {"body": self.body.decode("utf-8"), "etag": self.etag, "final": self.final},
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    @classmethod
+    def decode(cls, payload: bytes) -> "CachedBody":
+        data = json.loads(payload)
+        return cls(body=data["body"].encode("utf-8"), etag=data.get("etag"), final=bool(data.get("final")))
+
+
+def entry_ttl(entry: CachedBody) -> float:
+    return RESPONSE_CACHE_FINAL_TTL_SECONDS if entry.final else RESPONSE_CACHE_TTL_SECONDS
+
+
+class ResponseCache(ABC):
+    name = "abstract"
+
+    @abstractmethod
+    async def get(self, scope: str, variant: str) -> Optional[CachedBody]:
+        ...
+
+    @abstractmethod
+    async def set(self, scope: str, variant: str, entry: CachedBody) -> None:
+        ...
+
+    @abstractmethod
+    async def invalidate(self, scope: str) -> None:
+        """Drop every cached variant of `scope`."""
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class NullResponseCache(ResponseCache):
+    name = "off"
+
+    async def get(self, scope: str, variant: str) -> Optional[CachedBody]:
+        return None
+
+    async def set(self, scope: str, variant: str, entry: CachedBody) -> None:
+        return None
+
+    async def invalidate(self, scope: str) -> None:
+        return None
+
+
+class InMemoryResponseCache(ResponseCache):
+    """Process-local LRU bounded by entry count and total body size."""
+
+    name = "memory"
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        # (scope, variant) -> (expires at, entry), oldest first
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, CachedBody]]" = OrderedDict()
+        self._scopes: Dict[str, set] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get(self, scope: str, variant: str) -> Optional[CachedBody]:
+        key = (scope, variant)
+        item = self._entries.get(key)
+        if item is None or item[0] <= self.clock():
+            if item is not None:
+                self._drop(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    async def set(self, scope: str, variant: str, entry: CachedBody) -> None:
+        key = (scope, variant)
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (self.clock() + entry_ttl(entry), entry)
+        self._scopes.setdefault(scope, set()).add(variant)
+        self._bytes += len(entry.body)
+        while self._entries and (
+            (self.max_entries and len(self._entries) > self.max_entries)
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    async def invalidate(self, scope: str) -> None:
+        for variant in list(self._scopes.get(scope, ())):
+            self._drop((scope, variant))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries or None,
+            "max_bytes": self.max_bytes or None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _drop(self, key: Tuple[str, str]) -> None:
+        _, entry = self._entries.pop(key)
+        self._bytes -= len(entry.body)
+        variants = self._scopes.get(key[0])
+        if variants is not None:
+            variants.discard(key[1])
+            if not variants:
+                del self._scopes[key[0]]
+
+
+class RedisResponseCache(ResponseCache):
+    """One key per entry, each with its own TTL, plus a set per scope naming them.
+
+    Invalidation deletes the scope's keys in one DEL shared by all workers.
+    Entries don't share an expiry: a short-lived in-progress entry must not
+    live on because a final entry of the same scope was written after it.
+
+    `client` needs async ``get``, ``set``, ``sadd``, ``smembers``, ``expire``
+    and ``delete``.
+    """
+
+    name = "redis"
+
+    def __init__(self, client, *, prefix: str = "hm:response:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str = REDIS_URL, **kwargs) -> "RedisResponseCache":
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("RESPONSE_CACHE=redis needs the optional 'redis' package (pip install '.[redis]')") from e
+        return cls(redis.from_url(url), **kwargs)
+
+    def _key(self, scope: str) -> str:
+        return f"{self.prefix}{scope}"
+
+    def _entry_key(self, scope: str, variant: str) -> str:
+        return f"{self.prefix}{scope}:{variant}"
+
+    # A cache outage degrades to reading the database, never to an error
+
+    async def get(self, scope: str, variant: str) -> Optional[CachedBody]:
+        try:
+            payload = await self.client.get(self._entry_key(scope, variant))
+        except Exception as e:
+            logger.warning("Response cache read failed: %s", e)
+            return None
+        return CachedBody.decode(payload) if payload is not None else None
+
+    async def set(self, scope: str, variant: str, entry: CachedBody) -> None:
+        key = self._key(scope)
+        entry_key = self._entry_key(scope, variant)
+        try:
+            # Registered before it is written, so an invalidation running
+            # concurrently either sees the key or runs before the write
+            await self.client.sadd(key, entry_key)
+            # Outlives any member, so invalidation can always find them
+            await self.client.expire(key, int(max(RESPONSE_CACHE_FINAL_TTL_SECONDS, RESPONSE_CACHE_TTL_SECONDS)) + 1)
+            await self.client.set(entry_key, entry.encode(), ex=max(1, int(entry_ttl(entry))))
+        except Exception as e:
+            logger.warning("Response cache write failed: %s", e)
+
+    async def invalidate(self, scope: str) -> None:
+        key = self._key(scope)
+        try:
+            entry_keys = await self.client.smembers(key)
+            await self.client.delete(key, *entry_keys)
+        except Exception:
+            logger.exception("Response cache invalidation of %s failed; entries expire on their own", scope)
+
+
+def create_response_cache(kind: str = RESPONSE_CACHE) -> ResponseCache:
+    if kind == "memory":
+        return InMemoryResponseCache()
+    if kind == "redis":
+        return RedisResponseCache.from_url(REDIS_URL)
+    if kind == "off":
+        return NullResponseCache()
+    raise ValueError(f"Unknown RESPONSE_CACHE {kind!r}; expected memory, redis or off")
+
+
+response_cache = create_response_cache()
@@ -1,12 +1,26 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID, uuid4
-from typing import Dict, Optional
+from datetime import datetime
+from typing import Any, Dict, Literal, Optional
+import json
 import os
-from sqlalchemy import select
-
-from ..models import get_db, SessionModel, MessageModel, GuessModel
-from ..agents import HiddenMessageAgent
+from sqlalchemy import and_, or_, select, update
+
+from ..models import (
+    get_db,
+    get_read_db,
+    get_read_sessionmaker,
+    SessionModel,
+    MessageModel,
+    GuessModel,
+    SessionParticipantModel,
+    SessionSnapshotModel,
+)
+from ..models.database import mark_written, reads_are_current, reads_from_primary, utcnow
+from ..agents import HiddenMessageAgent, default_model
 from .schemas import (
     StartSessionRequest,
     StartSessionResponse,
@@ -15,15 +29,24 @@ from .schemas import (
     MessageResponse,
     GuessResult,
     SessionHistoryResponse,
-    SessionHistoryMessage,
-    SessionHistoryGuess,
     SessionListResponse,
-    SessionListItem,
     SessionStatusResponse,
     ParticipantInfo,
 )
-from .session_state import SessionState, active_sessions
+from .session_state import SessionState
+from .session_store import session_store
+from .turn_guard import claim_turn, release_turn, single_flight, turn_conflict, turn_guard
+from .hydration import load_session_state
+from .idempotency import run_idempotent
+from .session_log import record_event, snapshot_due, write_snapshot
+from .pagination import decode_cursor, encode_cursor
+from .http_cache import cache_control, cached_response, etag_matches, session_etag
+from .history_stream import archived_history_lines, history_lines, session_header_line
+from .serialization import dumps
+from .response_cache import LIST_SCOPE, CachedBody, response_cache
 from ..core.logging import get_logger
+from ..core.session_archive import archived_history
+from ..core.transcript_store import TranscriptCorrupted, get_transcript_store
 
 router = APIRouter()
 
@@ -31,12 +54,37 @@ router = APIRouter()
 agent_manager = HiddenMessageAgent()
 logger = get_logger("api.routes")
 
+
+# Page size for /sessions when a cursor is passed without a limit
+DEFAULT_LIST_PAGE_SIZE = 100
+
+IdempotencyKey = Header(
+    None,
+    alias="Idempotency-Key",
+    max_length=255,
+    description="Retries with the same key return the first response instead of repeating the request",
+)
+
+
 @router.post("/start-session", response_model=StartSessionResponse)
 async def start_session(
     request: StartSessionRequest,
-    db: AsyncSession = Depends(get_db)
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    idempotency_key: Optional[str] = IdempotencyKey,
 ):
     """Initialize a new conversation session with agents"""
+    result = await run_idempotent(db, idempotency_key, "start-session", request, lambda: _start_session(request, db))
+    if isinstance(result, StartSessionResponse):
+        mark_written(result.session_id, response)
+        await response_cache.invalidate(LIST_SCOPE)
+    elif result.status_code < 400:
+        # A replay is returned as its own response, so the cookie goes on that
+        mark_written(json.loads(result.body)["session_id"], result)
+    return result
+
+
+async def _start_session(request: StartSessionRequest, db: AsyncSession) -> StartSessionResponse:
     try:
         # Initialize agents and get secret word (use provided or randomize)
         # Build participants mapping and receiver tries
@@ -60,28 +108,50 @@ async def start_session(
             agents=agents_map
         )
 
+        # Set initial tries for receivers only
+        initial_tries = {p["id"]: 3 for p in participants if p["role"] == "receiver"}
+
         # Create session in database
         session_id = uuid4()
         session = SessionModel(
             id=session_id,
             topic=request.topic,
             secret_word=secret_word,
-            participants={p["id"]: {"provider": p["provider"], "role": p["role"], "name": p.get("name")} for p in participants}
+            participants={
+                p["id"]: {"provider": p["provider"], "role": p["role"], "name": p.get("name"), "order": p["order"]}
+                for p in participants
+            },
+            tries_remaining=initial_tries,
         )
         db.add(session)
-        await db.commit()
-
-        # Store session state in memory
-        # Set initial tries for receivers only
-        initial_tries = {p["id"]: 3 for p in participants if p["role"] == "receiver"}
+        await db.flush()
+        db.add_all([
+            SessionParticipantModel(
+                session_id=session_id,
+                participant_id=p["id"],
+                provider=p["provider"],
+                model=default_model(p["provider"]),
+                role=p["role"],
+                name=p["name"],
+                order=p["order"],
+            )
+            for p in participants
+        ])
 
-        active_sessions[session_id] = SessionState(
+        state = SessionState(
             session_id=session_id,
             topic=request.topic,
             secret_word=secret_word,
             participants=participants,
-            tries_remaining=initial_tries
+            tries_remaining=initial_tries,
+            snapshot_turn=1,
         )
+        # Seed the event log with an empty snapshot so hydration never has to
+        # fall back to the messages table for new sessions
+        db.add(SessionSnapshotModel(session_id=session_id, last_seq=0, turn_number=1, state=state.to_dict()))
+        await db.commit()
+
+        await session_store.put(state)
 
         from .schemas import ParticipantInfo
         
@@ -108,98 +178,58 @@ async def start_session(
 @router.post("/next-turn", response_model=NextTurnResponse)
 async def next_turn(
     request: NextTurnRequest,
-    db: AsyncSession = Depends(get_db)
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    idempotency_key: Optional[str] = IdempotencyKey,
 ):
     """Execute the next conversation turn"""
-    # Check if session exists
-    if request.session_id not in active_sessions:
-        # Attempt to hydrate in-memory state from DB
+    # Concurrent calls for one session in this worker share a single execution
+    result = await run_idempotent(
+        db,
+        idempotency_key,
+        "next-turn",
+        request,
+        lambda: single_flight(request.session_id, lambda: _play_turn(request, db)),
+    )
+    # A replay is returned as its own response, so the cookie goes on that
+    mark_written(request.session_id, result if isinstance(result, Response) else response)
+    await response_cache.invalidate(str(request.session_id))
+    await response_cache.invalidate(LIST_SCOPE)
+    return result
+
+
+async def _play_turn(request: NextTurnRequest, db: AsyncSession) -> NextTurnResponse:
+    """Play one turn in short transactions.
+
+    Load the state and claim the turn (committed), run the models without
+    any transaction open, then write the turn's rows in a second short
+    transaction. The request's session therefore holds a pooled connection
+    only while it is actually talking to the database, not for the tens of
+    seconds the model calls take.
+    """
+    # Hydrate from the DB when the session is not in memory, or when its
+    # in-memory history is empty (e.g. it was restored by the status endpoint)
+    session_state = await session_store.get(request.session_id)
+    if session_state is None or not session_state.conversation_history:
         try:
-            session_row = (await db.execute(select(SessionModel).where(SessionModel.id == request.session_id))).scalar_one_or_none()
-            if not session_row:
-                raise HTTPException(status_code=404, detail="Session not found")
-
-            # Participants mapping is stored on the session row
-            participants_map: Dict[str, Dict[str, str]] = session_row.participants
-            participants_list = [
-                {"id": pid, "provider": meta.get("provider"), "role": meta.get("role"), "order": None, "name": meta.get("name")}
-                for pid, meta in participants_map.items()
-            ]
-            agents_map = {pid: {"provider": meta.get("provider"), "role": meta.get("role")} for pid, meta in participants_map.items()}
-
-            # Build conversation history and determine next turn number
-            result_msgs = await db.execute(
-                select(MessageModel).where(MessageModel.session_id == request.session_id).order_by(MessageModel.turn.asc())
-            )
-            msgs = list(result_msgs.scalars())
-            # Include participant names in conversation history for better LLM context
-            conversation_history = [
-                {
-                    "participant_id": m.participant_id,
-                    "comms": m.comms,
-                    "participant_name": participants_map.get(m.participant_id, {}).get("name")
-                }
-                for m in msgs
-            ]
-            next_turn = (max((m.turn for m in msgs), default=0) + 1) or 1
-
-            # Compute tries remaining for receivers
-            receivers = {pid for pid, meta in participants_map.items() if meta.get("role") == "receiver"}
-            tries_remaining: Dict[str, int] = {pid: 3 for pid in receivers}
-            result_guesses = await db.execute(
-                select(GuessModel).where(GuessModel.session_id == request.session_id).order_by(GuessModel.turn.desc())
-            )
-            for g in result_guesses.scalars():
-                if g.participant_id in receivers and g.tries_remaining is not None:
-                    # first occurrence per agent is latest due to desc order
-                    if tries_remaining.get(g.participant_id, None) == 3:
-                        tries_remaining[g.participant_id] = g.tries_remaining
-
-            active_sessions[request.session_id] = SessionState(
-                session_id=request.session_id,
-                topic=session_row.topic,
-                secret_word=session_row.secret_word,
-                participants=participants_list,
-                conversation_history=conversation_history,
-                turn_number=next_turn,
-                tries_remaining=tries_remaining,
-            )
-            # Recreate in-memory agents so get_agent_response can resolve ids
-            await agent_manager.initialize_agents(session_row.secret_word, agents=agents_map)
-            logger.debug(f"Hydrated session {request.session_id} from DB: turn={next_turn}, receivers={list(receivers)}")
-        except HTTPException:
-            raise
+            loaded = await load_session_state(db, request.session_id)
         except Exception as e:
             logger.error(f"Failed to hydrate session {request.session_id}: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail="Failed to load session state")
+        if loaded is None:
+            raise HTTPException(status_code=404, detail="Session not found")
 
-    session_state = active_sessions[request.session_id]
-
-    # If the in-memory history is empty (e.g., after resume), repopulate from DB for accuracy
-    if not session_state.conversation_history:
-        try:
-            history_result = await db.execute(
-                select(MessageModel)
-                .where(MessageModel.session_id == request.session_id)
-                .order_by(MessageModel.turn.asc(), MessageModel.id.asc())
-            )
-            history_messages = list(history_result.scalars())
-            if history_messages:
-                participant_lookup = {p.get("id"): p for p in session_state.participants}
-                session_state.conversation_history = [
-                    {
-                        "participant_id": message.participant_id,
-                        "comms": message.comms,
-                        "participant_name": (participant_lookup.get(message.participant_id) or {}).get("name"),
-                    }
-                    for message in history_messages
-                ]
-        except Exception as hydrate_err:
-            logger.warning(
-                "Failed to repopulate conversation history for session %s: %s",
-                request.session_id,
-                hydrate_err,
+        if session_state is None:
+            session_state = loaded
+            await session_store.put(session_state)
+            logger.debug(
+                f"Hydrated session {request.session_id} from DB: turn={loaded.turn_number}, "
+                f"receivers={list(loaded.tries_remaining)}"
             )
+        else:
+            session_state.conversation_history = loaded.conversation_history
+            session_state.event_seq = loaded.event_seq
+            session_state.snapshot_turn = loaded.snapshot_turn
 
     expected_participants = {p["id"] for p in session_state.participants}
     cached_participants = set(agent_manager.agents.keys())
@@ -220,6 +250,17 @@ async def next_turn(
     if session_state.game_over:
         raise HTTPException(status_code=400, detail="Game is already over")
 
+    # Claim this turn before paying for model calls; another worker already
+    # playing or past it means our copy of the state is stale
+    claimed_turn = session_state.turn_number
+    try:
+        lease = await claim_turn(db, request.session_id, claimed_turn)
+    except HTTPException:
+        await session_store.delete(request.session_id)
+        raise
+    # claim_turn committed, returning the connection to the pool; nothing
+    # below touches `db` until the turn's rows are written
+
     try:
         # Run conversation turn
         result = await agent_manager.run_conversation_turn(
@@ -285,6 +326,12 @@ async def next_turn(
                 current_tries = session_state.tries_remaining.get(msg["participant_id"], total_tries)
                 logger.debug(f"Updating tries for {msg['participant_id']}: {current_tries} -> {max(current_tries-1, 0)}")
                 session_state.tries_remaining[msg["participant_id"]] = max(current_tries - 1, 0)
+                record_event(db, session_state, "guess", {
+                    "participant_id": msg["participant_id"],
+                    "guess": msg["guess"],
+                    "correct": is_correct,
+                    "tries_remaining": session_state.tries_remaining[msg["participant_id"]],
+                })
 
                 # Save guess to database
                 guess_record = GuessModel(
@@ -316,25 +363,51 @@ async def next_turn(
                     feedback_msg = "Incorrect."
 
                 # Add guess feedback to conversation history for agents
-                session_state.conversation_history.append({
+                feedback_entry = {
                     "participant_id": "system",
                     "comms": f"Guess from {participant.get('name', msg['participant_id'])}: '{msg['guess']}'. Result: {feedback_msg}"
-                })
+                }
+                session_state.conversation_history.append(feedback_entry)
+                record_event(db, session_state, "system", feedback_entry)
 
         # Update session state with new messages from this turn
         # This now happens *before* this function returns, so we remove it from agent_manager
         for msg in result.get("messages", []):
             participant = next((p for p in session_state.participants if p["id"] == msg["participant_id"]), {"name": "Unknown"})
-            session_state.conversation_history.append({
+            history_entry = {
                 "participant_id": msg["participant_id"],
                 "comms": msg["comms"],
                 "participant_name": participant.get("name")
-            })
+            }
+            session_state.conversation_history.append(history_entry)
+            record_event(db, session_state, "message", history_entry)
 
         session_state.turn_number += 1
+        if snapshot_due(session_state):
+            await write_snapshot(db, session_state)
+
+        # Keep the session summary in step with the rows written for this turn,
+        # bumping the version only if we still hold the turn
+        summary = await db.execute(
+            update(SessionModel)
+            .where(*turn_guard(request.session_id, claimed_turn, lease))
+            .values(
+                turn_number=session_state.turn_number,
+                message_count=SessionModel.message_count + len(result["messages"]),
+                tries_remaining=dict(session_state.tries_remaining),
+                game_over=session_state.game_over,
+                game_status=session_state.game_status,
+                updated_at=utcnow(),
+                turn_token=None,
+                turn_started_at=None,
+            )
+        )
+        if summary.rowcount != 1:
+            raise turn_conflict(request.session_id)
 
-        # Commit database changes
+        # Commit database changes, then publish the new state to other workers
         await db.commit()
+        await session_store.put(session_state)
 
         return NextTurnResponse(
             messages=response_messages,
@@ -343,148 +416,155 @@ async def next_turn(
             game_status=session_state.game_status
         )
 
+    except HTTPException:
+        await db.rollback()
+        await release_turn(db, request.session_id, claimed_turn, lease)
+        await session_store.delete(request.session_id)
+        raise
     except Exception as e:
         await db.rollback()
+        await release_turn(db, request.session_id, claimed_turn, lease)
+        # The in-memory state may hold half of the failed turn; rehydrate next time
+        await session_store.delete(request.session_id)
         logger.exception("next_turn failed")
         raise HTTPException(status_code=500, detail=f"Failed to execute turn: {str(e)}")
 
 @router.get("/sessions", response_model=SessionListResponse)
-async def list_sessions(db: AsyncSession = Depends(get_db)):
-    """Get list of all sessions with basic info"""
-    logger.debug("Listing all sessions")
-    
-    # Get all sessions ordered by created_at descending (newest first)
-    sessions_result = await db.execute(
-        select(SessionModel).order_by(SessionModel.created_at.desc())
+async def list_sessions(
+    http_request: Request,
+    status: Optional[Literal["win", "loss", "active", "over"]] = None,
+    provider: Optional[Literal["openai", "anthropic", "google", "google-gla"]] = None,
+    model: Optional[str] = None,
+    role: Optional[Literal["communicator", "receiver", "bystander"]] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    sort: Literal["created_at", "message_count"] = "created_at",
+    order: Literal["asc", "desc"] = "desc",
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(
+        None, ge=1, le=500, description="Page size; without limit or cursor every session is returned"
+    ),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """List sessions with message counts and game status from the summary columns"""
+    variant = "list:" + "&".join(sorted(f"{k}={v}" for k, v in http_request.query_params.multi_items()))
+    use_cache = not reads_from_primary(http_request)
+    if use_cache:
+        cached = await response_cache.get(LIST_SCOPE, variant)
+        if cached is not None:
+            return cached_response(cached, http_request)
+
+    logger.debug(
+        "Listing sessions (status=%s provider=%s model=%s role=%s sort=%s %s)",
+        status, provider, model, role, sort, order,
     )
-    session_rows = list(sessions_result.scalars())
-    
-    sessions_list = []
-    for session in session_rows:
-        # Count messages for this session
-        message_count_result = await db.execute(
-            select(MessageModel).where(MessageModel.session_id == session.id)
-        )
-        message_count = len(list(message_count_result.scalars()))
-        
-        # Check if game is over (receiver guessed correctly or ran out of tries)
-        guesses_result = await db.execute(
-            select(GuessModel)
-            .where(GuessModel.session_id == session.id)
-            .order_by(GuessModel.turn.desc())
+
+    query = select(
+        SessionModel.id,
+        SessionModel.topic,
+        SessionModel.created_at,
+        SessionModel.message_count,
+        SessionModel.game_over,
+        SessionModel.game_status,
+    )
+
+    if status in ("win", "loss"):
+        query = query.where(SessionModel.game_status == status)
+    elif status == "over":
+        query = query.where(SessionModel.game_over.is_(True))
+    elif status == "active":
+        query = query.where(SessionModel.game_over.is_(False))
+    # provider/model/role must all hold for the same participant, e.g. "anthropic as receiver"
+    participant_filters = [
+        condition
+        for condition in (
+            SessionParticipantModel.provider == provider if provider is not None else None,
+            SessionParticipantModel.model == model if model is not None else None,
+            SessionParticipantModel.role == role if role is not None else None,
         )
-        guess_rows = list(guesses_result.scalars())
-        
-        game_over = False
-        game_status = None
-        
-        if guess_rows:
-            # Check if any guess was correct
-            correct_guess = any(g.correct for g in guess_rows)
-            if correct_guess:
-                game_over = True
-                game_status = "win"
-            else:
-                # Check if tries exhausted
-                last_guess = guess_rows[0]
-                if last_guess.tries_remaining == 0:
-                    game_over = True
-                    game_status = "loss"
-        
-        sessions_list.append(
-            SessionListItem(
-                session_id=session.id,
-                topic=session.topic,
-                created_at=session.created_at,
-                message_count=message_count,
-                game_over=game_over,
-                game_status=game_status,
-            )
+        if condition is not None
+    ]
+    if participant_filters:
+        query = query.where(
+            select(SessionParticipantModel.session_id)
+            .where(SessionParticipantModel.session_id == SessionModel.id, *participant_filters)
+            .exists()
         )
-    
-    return SessionListResponse(sessions=sessions_list)
+    if created_after is not None:
+        query = query.where(SessionModel.created_at >= created_after)
+    if created_before is not None:
+        query = query.where(SessionModel.created_at < created_before)
+
+    sort_column = SessionModel.created_at if sort == "created_at" else SessionModel.message_count
+    after = decode_cursor(cursor, 2)
+    if after is not None:
+        last_value, last_id = after
+        if order == "desc":
+            query = query.where(or_(sort_column < last_value, and_(sort_column == last_value, SessionModel.id < last_id)))
+        else:
+            query = query.where(or_(sort_column > last_value, and_(sort_column == last_value, SessionModel.id > last_id)))
+
+    if order == "desc":
+        query = query.order_by(sort_column.desc(), SessionModel.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), SessionModel.id.asc())
+    if limit is None and cursor is not None:
+        limit = DEFAULT_LIST_PAGE_SIZE
+    if limit is not None:
+        query = query.limit(limit + 1)
+    rows = (await db.execute(query)).all()
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([last.created_at if sort == "created_at" else last.message_count, last.id])
+
+    # Plain dicts in the SessionListResponse shape; see serialization
+    listing = {
+        "sessions": [
+            {
+                "session_id": row.id,
+                "topic": row.topic,
+                "created_at": row.created_at,
+                "message_count": row.message_count,
+                "game_over": row.game_over,
+                "game_status": row.game_status,
+            }
+            for row in rows
+        ],
+        "next_cursor": next_cursor,
+    }
+    entry = CachedBody(dumps(listing))
+    if use_cache:
+        await response_cache.set(LIST_SCOPE, variant, entry)
+    return cached_response(entry, http_request)
 
 
 @router.get("/session/{session_id}/status", response_model=SessionStatusResponse)
-async def get_session_status(session_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_session_status(
+    session_id: UUID,
+    http_request: Request,
+    db: AsyncSession = Depends(get_read_db),
+):
     """Get current status of a session"""
-    
-    # If session is not in memory, load it from database
-    if session_id not in active_sessions:
-        # Load from database
-        session_row = (
-            await db.execute(select(SessionModel).where(SessionModel.id == session_id))
-        ).scalar_one_or_none()
-        
-        if not session_row:
+    use_cache = not reads_from_primary(http_request)
+    if use_cache:
+        cached = await response_cache.get(str(session_id), "status")
+        if cached is not None:
+            return cached_response(cached, http_request)
+
+    # If the session is not in the store, load it from the database (summary columns only)
+    session_state = await session_store.get(session_id)
+    if session_state is None:
+        session_state = await load_session_state(db, session_id, include_history=False)
+        if session_state is None:
             raise HTTPException(status_code=404, detail="Session not found")
-        
-        # Restore session to memory
-        participants_meta = session_row.participants or {}
-        participants = []
-        for pid, pdata in participants_meta.items():
-            participants.append({
-                "id": pid,
-                "name": pdata.get("name", "Unknown"),
-                "role": pdata.get("role", "bystander"),
-                "provider": pdata.get("provider", "openai"),
-                "order": pdata.get("order", 0)
-            })
-        
-        # Calculate turn number from messages
-        messages_result = await db.execute(
-            select(MessageModel)
-            .where(MessageModel.session_id == session_id)
-            .order_by(MessageModel.turn.desc())
-        )
-        last_message = messages_result.scalars().first()
-        turn_number = last_message.turn if last_message else 0
-        
-        # Calculate tries remaining from guesses
-        guesses_result = await db.execute(
-            select(GuessModel)
-            .where(GuessModel.session_id == session_id)
-            .order_by(GuessModel.turn.desc())
-        )
-        guess_list = list(guesses_result.scalars())
-        tries_remaining = {p["id"]: 3 for p in participants if p["role"] == "receiver"}
-        for guess in guess_list:
-            if guess.participant_id in tries_remaining:
-                tries_remaining[guess.participant_id] = guess.tries_remaining
-                break
-        
-        # Check game over status
-        game_over = any(guess.correct for guess in guess_list) or \
-                    any(tries == 0 for tries in tries_remaining.values())
-        
-        # Determine game status
-        game_status = None
-        if game_over:
-            has_correct = any(guess.correct for guess in guess_list)
-            game_status = "win" if has_correct else "loss"
-        
-        # Restore to memory
-        active_sessions[session_id] = SessionState(
-            session_id=session_id,
-            topic=session_row.topic,
-            secret_word=session_row.secret_word,
-            participants=participants,
-            tries_remaining=tries_remaining,
-            turn_number=turn_number,
-            game_over=game_over,
-            game_status=game_status
-        )
-        
-        # Re-initialize agents for this session
-        agents_map = {p["id"]: {"provider": p["provider"], "role": p["role"]} for p in participants}
-        await agent_manager.initialize_agents(
-            secret_word=session_row.secret_word,
-            agents=agents_map
-        )
-    
-    session_state = active_sessions[session_id]
+        # next_turn trusts the store; a lagging replica's turn_number would make it refuse the next turn
+        if reads_are_current(http_request):
+            await session_store.put(session_state)
 
-    return SessionStatusResponse(
+    status = SessionStatusResponse(
         session_id=session_id,
         topic=session_state.topic,
         turn_number=session_state.turn_number,
@@ -502,15 +582,50 @@ async def get_session_status(session_id: UUID, db: AsyncSession = Depends(get_db
             for p in session_state.participants
         ]
     )
+    entry = CachedBody(status.model_dump_json().encode("utf-8"), final=session_state.game_over)
+    if use_cache:
+        await response_cache.set(str(session_id), "status", entry)
+    return cached_response(entry, http_request)
+
+
+async def _archived_rows(session_id: UUID, since_turn: Optional[int]):
+    """Messages and guesses of an archived session, read from the transcript store."""
+    try:
+        # Index scan, decompression and JSON parsing of the whole transcript; keep them off the event loop
+        transcript = await run_in_threadpool(get_transcript_store().get, session_id)
+    except TranscriptCorrupted:
+        logger.exception(f"Archived transcript of session {session_id} is corrupted")
+        transcript = None
+    if transcript is None:
+        # The row says archived but this worker cannot read it (e.g. TRANSCRIPT_ARCHIVE_DIR not shared)
+        raise HTTPException(status_code=503, detail="Archived session history is unavailable")
+    return archived_history(transcript, since_turn)
 
 
 @router.get("/session/{session_id}/history", response_model=SessionHistoryResponse)
-async def get_session_history(session_id: UUID, db: AsyncSession = Depends(get_db)):
-    """Return the full chat history for a session"""
-    
-    logger.debug(f"UI requested history for session {session_id}")
-    
-    
+async def get_session_history(
+    session_id: UUID,
+    http_request: Request,
+    since_turn: Optional[int] = Query(
+        None, ge=0, description="Only return messages and guesses from turns after this one"
+    ),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Return the chat history for a session, in full or from `since_turn` on.
+
+    Answers 304 when the client's ETag still matches; that check reads
+    only the session row, or nothing at all when the response is cached.
+    """
+    logger.debug(f"UI requested history for session {session_id} (since_turn={since_turn})")
+
+    variant = f"history:{since_turn}"
+    use_cache = not reads_from_primary(http_request)
+    if use_cache:
+        cached = await response_cache.get(str(session_id), variant)
+        if cached is not None:
+            return cached_response(cached, http_request)
+
     session_row = (
         await db.execute(select(SessionModel).where(SessionModel.id == session_id))
     ).scalar_one_or_none()
@@ -518,56 +633,129 @@ async def get_session_history(session_id: UUID, db: AsyncSession = Depends(get_d
     if not session_row:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    participants_meta: Dict[str, Dict[str, Optional[str]]] = session_row.participants or {}
+    etag = session_etag(session_row, f"s{since_turn}" if since_turn is not None else "")
+    if etag_matches(if_none_match, etag):
+        return cached_response(CachedBody(b"", etag=etag, final=session_row.game_over), http_request)
 
-    messages_result = await db.execute(
-        select(MessageModel)
-        .where(MessageModel.session_id == session_id)
-        .order_by(MessageModel.turn.asc(), MessageModel.id.asc())
-    )
-    message_rows = list(messages_result.scalars())
+    participants_meta: Dict[str, Dict[str, Any]] = session_row.participants or {}
 
-    guesses_result = await db.execute(
-        select(GuessModel)
-        .where(GuessModel.session_id == session_id)
-        .order_by(GuessModel.turn.asc(), GuessModel.id.asc())
-    )
-    guess_rows = list(guesses_result.scalars())
-
-    messages = [
-        SessionHistoryMessage(
-            turn=msg.turn,
-            participant_id=msg.participant_id,
-            participant_name=(participants_meta.get(msg.participant_id) or {}).get("name"),
-            participant_role=(participants_meta.get(msg.participant_id) or {}).get("role"),
-            comms=msg.comms,
-            internal_thoughts=msg.internal_thoughts,
+    if session_row.archived_at is not None:
+        message_rows, guess_rows = await _archived_rows(session_id, since_turn)
+    else:
+        message_query = select(MessageModel).where(MessageModel.session_id == session_id)
+        guess_query = select(GuessModel).where(GuessModel.session_id == session_id)
+        if since_turn is not None:
+            message_query = message_query.where(MessageModel.turn > since_turn)
+            guess_query = guess_query.where(GuessModel.turn > since_turn)
+
+        messages_result = await db.execute(
+            message_query.order_by(MessageModel.turn.asc(), MessageModel.id.asc())
         )
-        for msg in message_rows
-    ]
+        message_rows = list(messages_result.scalars())
 
-    guesses = [
-        SessionHistoryGuess(
-            turn=guess.turn,
-            participant_id=guess.participant_id,
-            participant_name=(participants_meta.get(guess.participant_id) or {}).get("name"),
-            participant_role=(participants_meta.get(guess.participant_id) or {}).get("role"),
-            guess=guess.guess,
-            correct=guess.correct,
-            tries_remaining=guess.tries_remaining,
+        guesses_result = await db.execute(
+            guess_query.order_by(GuessModel.turn.asc(), GuessModel.id.asc())
         )
-        for guess in guess_rows
-    ]
+        guess_rows = list(guesses_result.scalars())
+
+    def meta(participant_id: str) -> Dict[str, Any]:
+        return participants_meta.get(participant_id) or {}
+
+    # Plain dicts in the SessionHistoryResponse shape; see serialization
+    history = {
+        "session_id": session_row.id,
+        "topic": session_row.topic,
+        "secret_word": session_row.secret_word,
+        "created_at": session_row.created_at,
+        "participants": participants_meta,
+        "messages": [
+            {
+                "turn": msg.turn,
+                "participant_id": msg.participant_id,
+                "participant_name": meta(msg.participant_id).get("name"),
+                "participant_role": meta(msg.participant_id).get("role"),
+                "comms": msg.comms,
+                "internal_thoughts": msg.internal_thoughts,
+            }
+            for msg in message_rows
+        ],
+        "guesses": [
+            {
+                "turn": guess.turn,
+                "participant_id": guess.participant_id,
+                "participant_name": meta(guess.participant_id).get("name"),
+                "participant_role": meta(guess.participant_id).get("role"),
+                "guess": guess.guess,
+                "correct": guess.correct,
+                "tries_remaining": guess.tries_remaining,
+            }
+            for guess in guess_rows
+        ],
+        "latest_turn": session_row.turn_number - 1,
+    }
+    entry = CachedBody(dumps(history), etag=etag, final=session_row.game_over)
+    if use_cache:
+        await response_cache.set(str(session_id), variant, entry)
+    return cached_response(entry, http_request)
+
+
+@router.get("/session/{session_id}/history/stream")
+async def stream_session_history(
+    session_id: UUID,
+    since_turn: Optional[int] = Query(
+        None, ge=0, description="Only return messages and guesses from turns after this one"
+    ),
+    include_thoughts: bool = Query(True, description="Include each message's internal_thoughts"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
+    session_factory=Depends(get_read_sessionmaker),
+):
+    """Stream the history as NDJSON (see history_stream) with memory flat in the session length.
+
+    Not cached server-side: holding the rendered body is what this
+    endpoint exists to avoid. ETag revalidation works as for /history.
+    """
+    session_row = (
+        await db.execute(select(SessionModel).where(SessionModel.id == session_id))
+    ).scalar_one_or_none()
+
+    if not session_row:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    variant = f"ndjson-s{since_turn}" + ("" if include_thoughts else "-nothoughts")
+    etag = session_etag(session_row, variant)
+    headers = {"ETag": etag, "Cache-Control": cache_control(session_row.game_over)}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    header_line = session_header_line(session_row, session_row.turn_number - 1)
+    participants_meta: Dict[str, Dict[str, Any]] = session_row.participants or {}
+
+    if session_row.archived_at is not None:
+        messages, guesses = await _archived_rows(session_id, since_turn)
+
+        def archived_body():
+            yield header_line
+            yield from archived_history_lines(
+                messages, guesses, participants_meta, include_thoughts=include_thoughts
+            )
+
+        return StreamingResponse(archived_body(), media_type="application/x-ndjson", headers=headers)
+
+    async def body():
+        yield header_line
+        async with session_factory() as stream_db:
+            async for chunk in history_lines(
+                stream_db,
+                session_id,
+                participants_meta,
+                since_turn=since_turn,
+                include_thoughts=include_thoughts,
+            ):
+                yield chunk
+
+    return StreamingResponse(body(), media_type="application/x-ndjson", headers=headers)
 
-    return SessionHistoryResponse(
-        session_id=session_row.id,
-        topic=session_row.topic,
-        secret_word=session_row.secret_word,
-        created_at=session_row.created_at,
-        participants=participants_meta,
-        messages=messages,
-        guesses=guesses,
-    )
 
 @router.get("/health")
 async def health_check():
@@ -1,6 +1,6 @@
 from datetime import datetime
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Literal
+from typing import Any, Optional, List, Dict, Literal
 from uuid import UUID
 
 class AgentConfig(BaseModel):
@@ -90,9 +90,11 @@ class SessionHistoryResponse(BaseModel):
     topic: str
     secret_word: str
     created_at: datetime
-    participants: Dict[str, Dict[str, Optional[str]]]
+    participants: Dict[str, Dict[str, Any]]
     messages: List[SessionHistoryMessage]
     guesses: List[SessionHistoryGuess]
+    # Last completed turn; pass it back as since_turn to fetch only what follows
+    latest_turn: Optional[int] = None
 
 
 class SessionListItem(BaseModel):
@@ -106,6 +108,7 @@ class SessionListItem(BaseModel):
 
 class SessionListResponse(BaseModel):
     sessions: List[SessionListItem]
+    next_cursor: Optional[str] = None
 
 
 class SessionStatusResponse(BaseModel):
@@ -115,4 +118,112 @@ class SessionStatusResponse(BaseModel):
     game_over: bool
     game_status: Optional[str] = None
     tries_remaining: Dict[str, int]
-    participants: List[ParticipantInfo]
\ No newline at end of file
+    participants: List[ParticipantInfo]
+
+class LLMCallAnalyticsItem(BaseModel):
+    bucket_start: Optional[datetime] = None
+    provider: Optional[str] = None
+    model: Optional[str] = None
+    role: Optional[str] = None
+    status: Optional[str] = None
+    calls: int
+    errors: int
+    error_rate: float
+    latency_avg_ms: Optional[float] = None
+    latency_p50_ms: Optional[int] = None
+    latency_p90_ms: Optional[int] = None
+    latency_p99_ms: Optional[int] = None
+    latency_max_ms: Optional[int] = None
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+
+
+class LLMCallAnalyticsResponse(BaseModel):
+    granularity: str
+    group_by: List[str]
+    items: List[LLMCallAnalyticsItem]
+
+
+class SessionStoreMetricsResponse(BaseModel):
+    backend: str
+    resident_sessions: Optional[int] = None
+    estimated_bytes: Optional[int] = None
+    max_sessions: Optional[int] = None
+    max_bytes: Optional[int] = None
+    idle_ttl_seconds: Optional[float] = None
+    hits: Optional[int] = None
+    misses: Optional[int] = None
+    evictions: Dict[str, int] = Field(default_factory=dict)
+
+
+class ResponseCacheMetricsResponse(BaseModel):
+    backend: str
+    entries: Optional[int] = None
+    bytes: Optional[int] = None
+    max_entries: Optional[int] = None
+    max_bytes: Optional[int] = None
+    hits: Optional[int] = None
+    misses: Optional[int] = None
+    evictions: Optional[int] = None
+
+
+class DatabasePoolMetrics(BaseModel):
+    pool_class: str
+    size: Optional[int] = None
+    checkedin: Optional[int] = None
+    checkedout: Optional[int] = None
+    overflow: Optional[int] = None
+    max_overflow: Optional[int] = None
+    checkouts: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    timeouts: int = 0
+
+
+class DatabaseMetricsResponse(BaseModel):
+    pool: DatabasePoolMetrics
+    read_pool: Optional[DatabasePoolMetrics] = None
+    queries: int
+    query_time_ms: float
+    slow_queries: int
+    slow_query_threshold_ms: float
+
+
+class LLMCallEventListResponse(BaseModel):
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+
+class ChangeItem(BaseModel):
+    table: Literal["messages", "guesses", "llm_call_events"]
+    row: Dict[str, Any]
+
+
+class ChangeFeedResponse(BaseModel):
+    changes: List[ChangeItem]
+    # Always set; pass it back as `since` to continue from here
+    next_cursor: str
+    has_more: bool
+
+
+class SearchHit(BaseModel):
+    message_id: UUID
+    session_id: UUID
+    topic: str
+    turn: int
+    participant_id: str
+    participant_name: Optional[str] = None
+    participant_role: Optional[str] = None
+    provider: Optional[str] = None
+    model: Optional[str] = None
+    comms: str
+    internal_thoughts: str
+    created_at: Optional[datetime] = None
+    # Higher is better; only comparable within one query
+    score: float
+
+
+class SearchResponse(BaseModel):
+    hits: List[SearchHit]
+    next_cursor: Optional[str] = None
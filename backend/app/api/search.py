@@ -0,0 +1,142 @@
+"""Full-text search over message comms and internal_thoughts.
+
+``GET /api/search?q=acrostic&role=communicator&provider=anthropic``
+
+Hits are ordered by relevance, then message id, and paged with a
+``(score, id)`` keyset cursor. Relevance is ``ts_rank_cd`` on Postgres and
+``bm25`` on SQLite; in both, a match in comms counts for more than one in
+internal_thoughts. See core.search_index for how the index is kept.
+
+Query syntax follows Postgres ``websearch_to_tsquery``: every word must
+match, "quoted phrases" match as phrases and -word excludes. SQLite
+translates those three forms to FTS5 (``or`` is just a word there).
+
+bm25 depends on corpus statistics, so on SQLite pages can shift if
+messages are written between requests; ts_rank_cd scores do not.
+"""
+from typing import Any, Dict, Literal, Optional
+import re
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import Float, and_, column, func, literal_column, or_, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.logging import get_logger
+from ..core.search_index import FTS_TABLE, SEARCH_CONFIG
+from ..models import MessageModel, SessionModel, SessionParticipantModel, get_read_db
+from .pagination import decode_cursor, encode_cursor
+from .schemas import SearchHit, SearchResponse
+
+router = APIRouter(prefix="/search")
+logger = get_logger("api.search")
+
+# Relative weight of a match in comms vs internal_thoughts for SQLite's bm25
+# (Postgres weights them A and B in the generated column)
+FTS_COLUMN_WEIGHTS = (2.0, 1.0)
+
+_TERM = re.compile(r'(-?)"([^"]*)"|(-?)(\S+)')
+
+
+def fts5_query(q: str) -> Optional[str]:
+    """Translate websearch-style input into an FTS5 expression; None when nothing would match."""
+    include, exclude = [], []
+    for match in _TERM.finditer(q):
+        negated = match.group(1) or match.group(3)
+        term = (match.group(2) if match.group(2) is not None else match.group(4)).strip()
+        if not term:
+            continue
+        # Quoting makes every term a plain string or phrase, never FTS5 syntax
+        quoted = '"' + term.replace('"', '""') + '"'
+        (exclude if negated else include).append(quoted)
+    if not include:
+        return None
+    return " AND ".join(include) + "".join(f" NOT {term}" for term in exclude)
+
+
+def _match_and_score(dialect: str, q: str):
+    """The WHERE condition, FROM clause and relevance expression for `q`."""
+    messages = MessageModel.__table__
+    if dialect == "postgresql":
+        vector = literal_column("messages.search_vector")
+        tsquery = func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), q)
+        return vector.op("@@")(tsquery), messages, func.ts_rank_cd(vector, tsquery, type_=Float)
+
+    # Joined on message_id, never on messages.rowid (see core.search_index)
+    fts = table(FTS_TABLE, column("message_id"))
+    source = messages.join(fts, fts.c.message_id == messages.c.id)
+    # bm25 is lower-is-better; negate it so both dialects sort by score descending
+    score = -func.bm25(literal_column(FTS_TABLE), *FTS_COLUMN_WEIGHTS, type_=Float)
+    return literal_column(FTS_TABLE).op("MATCH")(fts5_query(q)), source, score
+
+
+@router.get("", response_model=SearchResponse)
+async def search_messages(
+    q: str = Query(..., min_length=1, max_length=500, description='Words, "phrases" and -excluded words'),
+    role: Optional[Literal["communicator", "receiver", "bystander"]] = None,
+    provider: Optional[Literal["openai", "anthropic", "google", "google-gla"]] = None,
+    model: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Messages whose comms or internal_thoughts match `q`, best match first"""
+    dialect = db.bind.dialect.name
+    if dialect == "sqlite" and fts5_query(q) is None:
+        return SearchResponse(hits=[])
+
+    logger.debug("Searching messages for %r (role=%s provider=%s model=%s)", q, role, provider, model)
+    condition, source, score = _match_and_score(dialect, q)
+    source = source.join(SessionModel, SessionModel.id == MessageModel.session_id).outerjoin(
+        SessionParticipantModel,
+        and_(
+            SessionParticipantModel.session_id == MessageModel.session_id,
+            SessionParticipantModel.participant_id == MessageModel.participant_id,
+        ),
+    )
+    matches = (
+        select(
+            MessageModel.id,
+            MessageModel.session_id,
+            SessionModel.topic,
+            MessageModel.turn,
+            MessageModel.participant_id,
+            SessionParticipantModel.name.label("participant_name"),
+            SessionParticipantModel.role.label("participant_role"),
+            SessionParticipantModel.provider,
+            SessionParticipantModel.model,
+            MessageModel.comms,
+            MessageModel.internal_thoughts,
+            MessageModel.created_at,
+            score.label("score"),
+        )
+        .select_from(source)
+        .where(condition)
+    )
+    for attribute, value in (("role", role), ("provider", provider), ("model", model)):
+        if value is not None:
+            matches = matches.where(getattr(SessionParticipantModel, attribute) == value)
+
+    # Keyset over the computed score, so it is applied around the ranked matches
+    ranked = matches.subquery()
+    query = select(ranked)
+    after = decode_cursor(cursor, 2)
+    if after is not None:
+        last_score, last_id = after
+        query = query.where(
+            or_(ranked.c.score < last_score, and_(ranked.c.score == last_score, ranked.c.id > last_id))
+        )
+    query = query.order_by(ranked.c.score.desc(), ranked.c.id.asc()).limit(limit + 1)
+
+    rows = (await db.execute(query)).mappings().all()
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1]
+        next_cursor = encode_cursor([last["score"], last["id"]])
+
+    hits = []
+    for row in page:
+        hit: Dict[str, Any] = dict(row)
+        hit["message_id"] = hit.pop("id")
+        hits.append(SearchHit(**hit))
+    return SearchResponse(hits=hits, next_cursor=next_cursor)
@@ -0,0 +1,87 @@
+"""Encoding of the large read responses (history, session list).
+
+Those endpoints build plain dicts from rows and encode them here instead of
+constructing a Pydantic model per message; the route's ``response_model``
+still documents the shape. orjson is used when installed (the ``speedups``
+extra) and produces the same JSON as Pydantic: UUIDs as strings, datetimes
+in ISO 8601 with ``Z`` for UTC. Without it the standard library encoder is
+used.
+
+Clients that send ``Accept: application/msgpack`` get MessagePack when the
+optional ``msgpack`` package is installed, and JSON otherwise.
+"""
+from datetime import date, datetime
+from typing import Any, Optional
+from uuid import UUID
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without the speedups extra
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_ALIASES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_UTC_Z)
+    return json.dumps(payload, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(body: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def _quality(accept: str, media_types) -> float:
+    best = 0.0
+    for media_range in accept.split(","):
+        media_type, *params = (part.strip() for part in media_range.split(";"))
+        if media_type.lower() not in media_types:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        best = max(best, q)
+    return best
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """MSGPACK_MEDIA_TYPE if the client prefers it (and it is available), otherwise JSON."""
+    if not accept or msgpack is None:
+        return JSON_MEDIA_TYPE
+    msgpack_q = _quality(accept, _MSGPACK_ALIASES)
+    if msgpack_q <= 0:
+        return JSON_MEDIA_TYPE
+    json_q = _quality(accept, (JSON_MEDIA_TYPE, "application/*", "*/*"))
+    return MSGPACK_MEDIA_TYPE if msgpack_q >= json_q else JSON_MEDIA_TYPE
+
+
+def json_to_msgpack(body: bytes) -> bytes:
+    """Re-encode a JSON body; cached entries are stored as JSON only."""
+    return msgpack.packb(loads(body), use_bin_type=True)
@@ -0,0 +1,61 @@
+from typing import Any, Dict
+import os
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import SessionEventModel, SessionSnapshotModel
+from ..models.database import utcnow
+from .session_state import SessionState
+
+# Snapshot the full SessionState every N turns; hydration replays at most N turns of events
+SNAPSHOT_EVERY = max(int(os.getenv("SESSION_SNAPSHOT_EVERY", "10")), 1)
+
+
+def record_event(db: AsyncSession, state: SessionState, kind: str, payload: Dict[str, Any]) -> None:
+    """Append an event for the turn in progress; flushed with the rest of the turn."""
+    state.event_seq += 1
+    db.add(SessionEventModel(
+        session_id=state.session_id,
+        seq=state.event_seq,
+        turn=state.turn_number,
+        kind=kind,
+        payload=payload,
+    ))
+
+
+def apply_event(state: SessionState, kind: str, payload: Dict[str, Any], turn: int) -> None:
+    """Replay one event onto a state, mirroring what next_turn did in memory."""
+    if kind in ("message", "system"):
+        state.conversation_history.append(dict(payload))
+    elif kind == "guess":
+        tries = payload["tries_remaining"]
+        state.tries_remaining[payload["participant_id"]] = tries
+        if payload["correct"]:
+            state.game_over = True
+            state.game_status = "win"
+        elif tries <= 0:
+            state.game_over = True
+            state.game_status = "loss"
+    state.turn_number = max(state.turn_number, turn + 1)
+
+
+def snapshot_due(state: SessionState) -> bool:
+    return state.snapshot_turn is None or state.turn_number - state.snapshot_turn >= SNAPSHOT_EVERY
+
+
+async def write_snapshot(db: AsyncSession, state: SessionState) -> None:
+    """Replace the session's snapshot with the current state."""
+    values = {
+        "last_seq": state.event_seq,
+        "turn_number": state.turn_number,
+        "state": state.to_dict(),
+    }
+    result = await db.execute(
+        update(SessionSnapshotModel)
+        .where(SessionSnapshotModel.session_id == state.session_id)
+        .values(**values, created_at=utcnow())
+    )
+    if result.rowcount == 0:
+        db.add(SessionSnapshotModel(session_id=state.session_id, **values))
+    state.snapshot_turn = state.turn_number
@@ -1,6 +1,19 @@
-from typing import Dict, Optional, List
+from typing import Any, Dict, Optional, List
 from uuid import UUID
 from dataclasses import dataclass, field
+from copy import deepcopy
+
+# Fields persisted in session snapshots; bookkeeping below is derived on load
+SNAPSHOT_FIELDS = (
+    "topic",
+    "secret_word",
+    "participants",
+    "conversation_history",
+    "turn_number",
+    "tries_remaining",
+    "game_over",
+    "game_status",
+)
 
 @dataclass
 class SessionState:
@@ -14,7 +27,19 @@ class SessionState:
     tries_remaining: Dict[str, int] = field(default_factory=dict)  # keyed by receiver id
     game_over: bool = False
     game_status: Optional[str] = None  # 'win' or 'loss'
+    # Event-log bookkeeping: last seq written and the turn of the latest snapshot
+    event_seq: int = 0
+    snapshot_turn: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the replayable part of the state for a snapshot."""
+        return {name: deepcopy(getattr(self, name)) for name in SNAPSHOT_FIELDS}
+
+    @classmethod
+    def from_dict(cls, session_id: UUID, data: Dict[str, Any], **bookkeeping) -> "SessionState":
+        """Rebuild a state from `to_dict` output."""
+        return cls(session_id=session_id, **{name: data[name] for name in SNAPSHOT_FIELDS if name in data}, **bookkeeping)
 
-# In-memory store for active sessions
-# In production, this should be Redis or similar
-active_sessions: Dict[UUID, SessionState] = {}
\ No newline at end of file
+# Storage of the in-memory SessionStore backend only; go through
+# session_store, which picks the backend (memory, Redis, database) and owns eviction
+active_sessions: Dict[UUID, SessionState] = {}
@@ -0,0 +1,266 @@
+"""Shared storage for in-flight SessionState.
+
+The API keeps the state of games being played between requests. With the
+default in-memory store that state is local to one process, so only a single
+worker can serve a game. The Redis and database stores let any worker pick up
+any session:
+
+- ``memory``   (default) the process-local ``active_sessions`` dict
+- ``redis``    serialized state under ``hm:session:<id>`` with a TTL; any
+               server speaking the Redis protocol works
+- ``database`` nothing cached; every request rehydrates from the session
+               event log and snapshots
+
+Selected with SESSION_STORE. next_turn mutates the state it gets and writes
+it back with ``put`` once its transaction has committed.
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
+import json
+import os
+import time
+
+from ..core.logging import get_logger
+from ..models.database import SessionLocal
+from .hydration import load_session_state
+from .session_state import SessionState, active_sessions
+
+logger = get_logger("api.session_store")
+
+SESSION_STORE = os.getenv("SESSION_STORE", "memory").lower()
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+SESSION_STORE_TTL_SECONDS = int(os.getenv("SESSION_STORE_TTL_SECONDS", "86400"))
+
+# Bounds for the in-memory store; 0 disables a limit
+SESSION_CACHE_MAX_SESSIONS = int(os.getenv("SESSION_CACHE_MAX_SESSIONS", "1000"))
+SESSION_CACHE_MAX_BYTES = int(os.getenv("SESSION_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+SESSION_CACHE_IDLE_TTL_SECONDS = float(os.getenv("SESSION_CACHE_IDLE_TTL_SECONDS", "1800"))
+
+
+def serialize_state(state: SessionState) -> bytes:
+    """Encode a SessionState, bookkeeping included, as compact JSON."""
+    data: Dict[str, Any] = state.to_dict()
+    data["session_id"] = str(state.session_id)
+    data["event_seq"] = state.event_seq
+    data["snapshot_turn"] = state.snapshot_turn
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def deserialize_state(payload: bytes) -> SessionState:
+    data = json.loads(payload)
+    return SessionState.from_dict(
+        UUID(data["session_id"]),
+        data,
+        event_seq=data.get("event_seq", 0),
+        snapshot_turn=data.get("snapshot_turn"),
+    )
+
+
+class SessionStore(ABC):
+    """Where SessionState lives between requests."""
+
+    name = "abstract"
+
+    @abstractmethod
+    async def get(self, session_id: UUID) -> Optional[SessionState]:
+        """Return the stored state, or None when this store doesn't have it."""
+
+    @abstractmethod
+    async def put(self, state: SessionState) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, session_id: UUID) -> None:
+        ...
+
+    def stats(self) -> Dict[str, Any]:
+        """Residency and eviction figures for /api/metrics; empty when the backend keeps none."""
+        return {}
+
+
+class InMemorySessionStore(SessionStore):
+    """Process-local store. Returns live objects, so writes are visible before ``put``.
+
+    Bounded LRU: past ``max_sessions`` or ``max_bytes`` (serialized size) the
+    least recently used sessions are dropped, sessions idle for longer than
+    ``idle_ttl_seconds`` expire, and finished games are not kept at all. An
+    evicted session is simply rehydrated from the database on its next use.
+    """
+
+    name = "memory"
+
+    def __init__(
+        self,
+        sessions: Optional[Dict[UUID, SessionState]] = None,
+        *,
+        max_sessions: int = SESSION_CACHE_MAX_SESSIONS,
+        max_bytes: int = SESSION_CACHE_MAX_BYTES,
+        idle_ttl_seconds: float = SESSION_CACHE_IDLE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.sessions = active_sessions if sessions is None else sessions
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.clock = clock
+        # LRU order, oldest first: session_id -> (last access, estimated bytes)
+        self._entries: "OrderedDict[UUID, tuple]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = {"capacity": 0, "memory": 0, "idle": 0, "game_over": 0}
+
+    async def get(self, session_id: UUID) -> Optional[SessionState]:
+        self._expire_idle()
+        state = self.sessions.get(session_id)
+        if state is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._track(state)
+        return state
+
+    async def put(self, state: SessionState) -> None:
+        if state.game_over:
+            # Finished games are read rarely and can't change; don't hold them
+            if self._discard(state.session_id):
+                self.evictions["game_over"] += 1
+            return
+        self.sessions[state.session_id] = state
+        self._track(state, resize=True)
+        self._expire_idle()
+        self._enforce_limits()
+
+    async def delete(self, session_id: UUID) -> None:
+        self._discard(session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        self._reconcile()
+        return {
+            "resident_sessions": len(self.sessions),
+            "estimated_bytes": self._bytes,
+            "max_sessions": self.max_sessions or None,
+            "max_bytes": self.max_bytes or None,
+            "idle_ttl_seconds": self.idle_ttl_seconds or None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": dict(self.evictions),
+        }
+
+    def _track(self, state: SessionState, *, resize: bool = False) -> None:
+        entry = self._entries.pop(state.session_id, None)
+        if entry is None or resize:
+            size = len(serialize_state(state))
+        else:
+            size = entry[1]
+        self._bytes += size - (entry[1] if entry else 0)
+        self._entries[state.session_id] = (self.clock(), size)
+
+    def _discard(self, session_id: UUID) -> bool:
+        entry = self._entries.pop(session_id, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+        return self.sessions.pop(session_id, None) is not None
+
+    def _evict_oldest(self, reason: str) -> None:
+        session_id = next(iter(self._entries))
+        self._discard(session_id)
+        self.evictions[reason] += 1
+        logger.debug("Evicted session %s from memory (%s)", session_id, reason)
+
+    def _expire_idle(self) -> None:
+        if not self.idle_ttl_seconds:
+            return
+        cutoff = self.clock() - self.idle_ttl_seconds
+        while self._entries and next(iter(self._entries.values()))[0] < cutoff:
+            self._evict_oldest("idle")
+
+    def _enforce_limits(self) -> None:
+        self._reconcile()
+        while self.max_sessions and len(self._entries) > self.max_sessions:
+            self._evict_oldest("capacity")
+        while self.max_bytes and self._bytes > self.max_bytes and len(self._entries) > 1:
+            self._evict_oldest("memory")
+
+    def _reconcile(self) -> None:
+        """Account for entries added to or removed from the dict directly."""
+        if len(self._entries) == len(self.sessions):
+            return
+        for session_id in [sid for sid in self._entries if sid not in self.sessions]:
+            self._bytes -= self._entries.pop(session_id)[1]
+        for session_id, state in list(self.sessions.items()):
+            if session_id not in self._entries:
+                self._track(state)
+
+
+class RedisSessionStore(SessionStore):
+    """Serialized state in Redis (or anything speaking its protocol).
+
+    `client` needs async ``get``, ``set(name, value, ex=)`` and ``delete``,
+    as provided by ``redis.asyncio.Redis``.
+    """
+
+    name = "redis"
+
+    def __init__(self, client, *, prefix: str = "hm:session:", ttl_seconds: Optional[int] = SESSION_STORE_TTL_SECONDS):
+        self.client = client
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+
+    @classmethod
+    def from_url(cls, url: str = REDIS_URL, **kwargs) -> "RedisSessionStore":
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("SESSION_STORE=redis needs the optional 'redis' package (pip install '.[redis]')") from e
+        return cls(redis.from_url(url), **kwargs)
+
+    def _key(self, session_id: UUID) -> str:
+        return f"{self.prefix}{session_id}"
+
+    async def get(self, session_id: UUID) -> Optional[SessionState]:
+        payload = await self.client.get(self._key(session_id))
+        return deserialize_state(payload) if payload is not None else None
+
+    async def put(self, state: SessionState) -> None:
+        await self.client.set(self._key(state.session_id), serialize_state(state), ex=self.ttl_seconds)
+
+    async def delete(self, session_id: UUID) -> None:
+        await self.client.delete(self._key(session_id))
+
+
+class DatabaseSessionStore(SessionStore):
+    """Stateless store: the event log written by next_turn already is the shared state."""
+
+    name = "database"
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+
+    async def get(self, session_id: UUID) -> Optional[SessionState]:
+        async with self.session_factory() as db:
+            return await load_session_state(db, session_id)
+
+    async def put(self, state: SessionState) -> None:
+        # Persisted by the turn's own transaction
+        return None
+
+    async def delete(self, session_id: UUID) -> None:
+        return None
+
+
+def create_session_store(kind: str = SESSION_STORE) -> SessionStore:
+    if kind == "memory":
+        return InMemorySessionStore()
+    if kind == "redis":
+        logger.info("Sharing session state through Redis at %s", REDIS_URL.split("@")[-1])
+        return RedisSessionStore.from_url(REDIS_URL)
+    if kind == "database":
+        return DatabaseSessionStore()
+    raise ValueError(f"Unknown SESSION_STORE {kind!r}; expected memory, redis or database")
+
+
+session_store = create_session_store()
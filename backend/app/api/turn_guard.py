@@ -0,0 +1,118 @@
+"""Make sure a session plays each turn exactly once.
+
+Within one worker, concurrent next-turn calls for the same session share a
+single execution: the first caller runs the turn, later callers wait for it
+and receive the same response (or the same error).
+
+Across workers, ``sessions.turn_number`` acts as the version. Before calling
+the models a turn claims it with a short lease: a random ``turn_token``,
+plus ``turn_started_at`` for expiry. The turn's final write only applies if
+the version and the token are still the ones it claimed. Whoever loses
+either race gets a 409 and no duplicate rows are written. A crashed
+worker's lease lapses after TURN_LEASE_SECONDS.
+"""
+
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, TypeVar
+from uuid import UUID, uuid4
+import asyncio
+import os
+
+from fastapi import HTTPException
+from sqlalchemy import or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.logging import get_logger
+from ..models import SessionModel
+from ..models.database import utcnow
+
+logger = get_logger("api.turn_guard")
+
+TURN_LEASE_SECONDS = int(os.getenv("TURN_LEASE_SECONDS", "300"))
+
+T = TypeVar("T")
+
+_in_flight: Dict[UUID, "asyncio.Future"] = {}
+
+
+async def single_flight(session_id: UUID, run: Callable[[], Awaitable[T]]) -> T:
+    """Run `run` unless a turn for this session is already executing here; then share its outcome."""
+    pending = _in_flight.get(session_id)
+    if pending is not None:
+        logger.info("Turn for session %s already running in this worker; waiting for it", session_id)
+        return await asyncio.shield(pending)
+
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[session_id] = future
+    try:
+        result = await run()
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    except BaseException:
+        # Cancelled (e.g. the client went away): waiters should simply retry
+        future.set_exception(HTTPException(status_code=409, detail="Concurrent turn was cancelled; retry"))
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        _in_flight.pop(session_id, None)
+        if future.done() and not future.cancelled():
+            future.exception()  # mark retrieved when nobody was waiting
+
+
+def turn_conflict(session_id: UUID) -> HTTPException:
+    return HTTPException(
+        status_code=409,
+        detail=f"Session {session_id} is already playing this turn or has moved on; reload and retry",
+    )
+
+
+async def claim_turn(db: AsyncSession, session_id: UUID, turn_number: int) -> UUID:
+    """Take the lease on `turn_number` and commit it; raises 409 if someone else holds or passed it.
+
+    Returns the lease token that `turn_guard` and `release_turn` match on.
+    """
+    token = uuid4()
+    now = utcnow()
+    result = await db.execute(
+        update(SessionModel)
+        .where(
+            SessionModel.id == session_id,
+            SessionModel.turn_number == turn_number,
+            SessionModel.game_over.is_(False),
+            or_(
+                SessionModel.turn_started_at.is_(None),
+                SessionModel.turn_started_at < now - timedelta(seconds=TURN_LEASE_SECONDS),
+            ),
+        )
+        .values(turn_token=token, turn_started_at=now)
+    )
+    await db.commit()
+    if result.rowcount != 1:
+        raise turn_conflict(session_id)
+    return token
+
+
+def turn_guard(session_id: UUID, turn_number: int, token: UUID):
+    """WHERE clause for the turn's final write: still our version, still our lease."""
+    return (
+        SessionModel.id == session_id,
+        SessionModel.turn_number == turn_number,
+        SessionModel.turn_token == token,
+    )
+
+
+async def release_turn(db: AsyncSession, session_id: UUID, turn_number: int, token: UUID) -> None:
+    """Give the lease back after a failed turn so the session can be retried right away."""
+    try:
+        await db.execute(
+            update(SessionModel)
+            .where(*turn_guard(session_id, turn_number, token))
+            .values(turn_token=None, turn_started_at=None)
+        )
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        logger.exception("Failed to release turn lease for session %s; it expires on its own", session_id)
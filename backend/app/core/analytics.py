@@ -0,0 +1,348 @@
+"""Incremental hourly rollups over llm_call_events.
+
+`refresh_rollups` folds raw events past a stored watermark into
+`llm_call_rollups` (one row per hour/provider/model/role/status), so analytics
+queries read a few hundred aggregate rows instead of scanning the event table.
+
+Refreshes run off the request path: every ROLLUP_REFRESH_SECONDS in each API
+worker (see `refresh_rollups_periodically`), or from cron with
+scripts/refresh_rollups.py when that is set to 0. The analytics endpoint
+only reads rollups, so its numbers trail the events by up to that interval.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.llm_call_event import LLMCallEventModel
+from ..models.llm_call_rollup import LLMCallRollupModel, RollupWatermarkModel
+from .logging import get_logger
+
+
+logger = get_logger("core.analytics")
+
+WATERMARK_NAME = "llm_call_rollups"
+
+# Upper bounds (inclusive) of the latency histogram; one overflow bucket follows.
+LATENCY_BUCKETS_MS: Tuple[int, ...] = (100, 250, 500, 1000, 2500, 5000, 10000, 20000, 30000, 60000, 120000)
+
+# Events younger than this are left for the next refresh so rows whose
+# transaction is still open are not skipped by the watermark.
+ROLLUP_LAG_SECONDS = int(os.getenv("ROLLUP_LAG_SECONDS", "5"))
+# Interval of the in-process refresh; 0 leaves refreshing to the CLI
+ROLLUP_REFRESH_SECONDS = float(os.getenv("ROLLUP_REFRESH_SECONDS", "60"))
+
+UNKNOWN = "unknown"
+GROUP_FIELDS = ("provider", "model", "role", "status")
+
+_REFRESH_LOCK = asyncio.Lock()
+
+RollupKey = Tuple[datetime, str, str, str, str]
+
+
+def hour_start(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def bucket_index(latency_ms: int) -> int:
+    for index, bound in enumerate(LATENCY_BUCKETS_MS):
+        if latency_ms <= bound:
+            return index
+    return len(LATENCY_BUCKETS_MS)
+
+
+def estimate_percentile(buckets: Sequence[int], quantile: float, max_ms: Optional[int] = None) -> Optional[int]:
+    """Return the upper bound of the bucket holding the requested quantile."""
+    total = sum(buckets)
+    if total == 0:
+        return None
+    target = quantile * total
+    running = 0
+    for index, count in enumerate(buckets):
+        running += count
+        if running >= target:
+            if index < len(LATENCY_BUCKETS_MS):
+                bound = LATENCY_BUCKETS_MS[index]
+                return min(bound, max_ms) if max_ms is not None else bound
+            return max_ms
+    return max_ms
+
+
+@dataclass
+class RollupAccumulator:
+    call_count: int = 0
+    latency_count: int = 0
+    latency_sum_ms: int = 0
+    latency_max_ms: Optional[int] = None
+    latency_buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+
+    def add_event(self, latency_ms, prompt_tokens, completion_tokens, total_tokens) -> None:
+        self.call_count += 1
+        if latency_ms is not None:
+            self.latency_count += 1
+            self.latency_sum_ms += latency_ms
+            self.latency_max_ms = max(self.latency_max_ms or 0, latency_ms)
+            self.latency_buckets[bucket_index(latency_ms)] += 1
+        self.prompt_tokens += prompt_tokens or 0
+        self.completion_tokens += completion_tokens or 0
+        self.total_tokens += total_tokens or 0
+
+    def merge(self, other: "RollupAccumulator") -> None:
+        self.call_count += other.call_count
+        self.latency_count += other.latency_count
+        self.latency_sum_ms += other.latency_sum_ms
+        if other.latency_max_ms is not None:
+            self.latency_max_ms = max(self.latency_max_ms or 0, other.latency_max_ms)
+        for index, count in enumerate(other.latency_buckets):
+            if index < len(self.latency_buckets):
+                self.latency_buckets[index] += count
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.total_tokens += other.total_tokens
+
+    @classmethod
+    def from_row(cls, row: LLMCallRollupModel) -> "RollupAccumulator":
+        buckets = list(row.latency_buckets or [])
+        buckets += [0] * (len(LATENCY_BUCKETS_MS) + 1 - len(buckets))
+        return cls(
+            call_count=row.call_count or 0,
+            latency_count=row.latency_count or 0,
+            latency_sum_ms=row.latency_sum_ms or 0,
+            latency_max_ms=row.latency_max_ms,
+            latency_buckets=buckets,
+            prompt_tokens=row.prompt_tokens or 0,
+            completion_tokens=row.completion_tokens or 0,
+            total_tokens=row.total_tokens or 0,
+        )
+
+
+async def _merge_into_rollups(session: AsyncSession, batch: Dict[RollupKey, RollupAccumulator]) -> None:
+    rollup = LLMCallRollupModel
+    hours = {key[0] for key in batch}
+    existing_rows = (
+        await session.execute(select(rollup).where(rollup.bucket_start.in_(hours)))
+    ).scalars()
+    existing = {
+        (hour_start(row.bucket_start), row.provider, row.model, row.participant_role, row.status): row
+        for row in existing_rows
+    }
+
+    for key, acc in batch.items():
+        row = existing.get(key)
+        if row is None:
+            bucket_start, provider, model, role, status = key
+            session.add(
+                rollup(
+                    bucket_start=bucket_start,
+                    provider=provider,
+                    model=model,
+                    participant_role=role,
+                    status=status,
+                    call_count=acc.call_count,
+                    latency_count=acc.latency_count,
+                    latency_sum_ms=acc.latency_sum_ms,
+                    latency_max_ms=acc.latency_max_ms,
+                    latency_buckets=acc.latency_buckets,
+                    prompt_tokens=acc.prompt_tokens,
+                    completion_tokens=acc.completion_tokens,
+                    total_tokens=acc.total_tokens,
+                )
+            )
+            continue
+
+        merged = RollupAccumulator.from_row(row)
+        merged.merge(acc)
+        row.call_count = merged.call_count
+        row.latency_count = merged.latency_count
+        row.latency_sum_ms = merged.latency_sum_ms
+        row.latency_max_ms = merged.latency_max_ms
+        row.latency_buckets = merged.latency_buckets
+        row.prompt_tokens = merged.prompt_tokens
+        row.completion_tokens = merged.completion_tokens
+        row.total_tokens = merged.total_tokens
+
+
+async def refresh_rollups(
+    session: AsyncSession,
+    *,
+    batch_size: int = 5000,
+    now: Optional[datetime] = None,
+) -> int:
+    """Fold events newer than the watermark into hourly rollups.
+
+    Each batch is committed together with the watermark advance; the
+    watermark is updated with a compare-and-set so a concurrent refresh in
+    another process rolls back instead of double counting. Returns the number
+    of events folded in.
+    """
+    event = LLMCallEventModel
+    horizon = (now or datetime.now(timezone.utc)) - timedelta(seconds=ROLLUP_LAG_SECONDS)
+    folded = 0
+
+    async with _REFRESH_LOCK:
+        while True:
+            watermark = await session.get(RollupWatermarkModel, WATERMARK_NAME)
+            if watermark is None:
+                watermark = RollupWatermarkModel(name=WATERMARK_NAME)
+                session.add(watermark)
+                await session.flush()
+            last_created_at, last_id = watermark.last_created_at, watermark.last_event_id
+
+            query = (
+                select(
+                    event.id,
+                    event.created_at,
+                    event.provider,
+                    event.model,
+                    event.participant_role,
+                    event.status,
+                    event.latency_ms,
+                    event.prompt_tokens,
+                    event.completion_tokens,
+                    event.total_tokens,
+                )
+                .where(event.created_at <= horizon)
+                .order_by(event.created_at, event.id)
+                .limit(batch_size)
+            )
+            if last_created_at is not None:
+                query = query.where(
+                    or_(
+                        event.created_at > last_created_at,
+                        and_(event.created_at == last_created_at, event.id > last_id),
+                    )
+                )
+            rows = (await session.execute(query)).all()
+            if not rows:
+                await session.commit()
+                break
+
+            batch: Dict[RollupKey, RollupAccumulator] = {}
+            for row in rows:
+                key = (
+                    hour_start(row.created_at),
+                    row.provider or UNKNOWN,
+                    row.model or UNKNOWN,
+                    row.participant_role or UNKNOWN,
+                    row.status or UNKNOWN,
+                )
+                batch.setdefault(key, RollupAccumulator()).add_event(
+                    row.latency_ms, row.prompt_tokens, row.completion_tokens, row.total_tokens
+                )
+            await _merge_into_rollups(session, batch)
+
+            last = rows[-1]
+            advanced = await session.execute(
+                update(RollupWatermarkModel)
+                .where(RollupWatermarkModel.name == WATERMARK_NAME)
+                .where(
+                    RollupWatermarkModel.last_created_at.is_(None)
+                    if last_created_at is None
+                    else RollupWatermarkModel.last_created_at == last_created_at
+                )
+                .where(
+                    RollupWatermarkModel.last_event_id.is_(None)
+                    if last_id is None
+                    else RollupWatermarkModel.last_event_id == last_id
+                )
+                .values(last_created_at=last.created_at, last_event_id=last.id)
+                .execution_options(synchronize_session=False)
+            )
+            if advanced.rowcount != 1:
+                await session.rollback()
+                logger.info("Rollup watermark moved concurrently; leaving refresh to the other worker")
+                break
+
+            await session.commit()
+            session.expire(watermark)
+            folded += len(rows)
+            if len(rows) < batch_size:
+                break
+
+    if folded:
+        logger.debug("Folded %s llm_call_events into rollups", folded)
+    return folded
+
+
+async def refresh_rollups_periodically(
+    session_factory: Callable[[], AsyncSession],
+    interval: float = ROLLUP_REFRESH_SECONDS,
+) -> None:
+    """Run `refresh_rollups` every `interval` seconds, each time in a fresh session, until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_factory() as session:
+                await refresh_rollups(session)
+        except Exception:
+            logger.exception("Rollup refresh failed; retrying in %ss", interval)
+
+
+@dataclass
+class RollupGroup:
+    key: Dict[str, Optional[str]]
+    bucket_start: Optional[datetime]
+    acc: RollupAccumulator
+    error_count: int = 0
+
+
+async def query_rollups(
+    session: AsyncSession,
+    *,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    group_by: Iterable[str] = GROUP_FIELDS,
+    granularity: str = "total",
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+    role: Optional[str] = None,
+) -> List[RollupGroup]:
+    """Merge hourly rollup rows into the requested grouping and time granularity."""
+    rollup = LLMCallRollupModel
+    query = select(rollup)
+    if since is not None:
+        query = query.where(rollup.bucket_start >= hour_start(since))
+    if until is not None:
+        query = query.where(rollup.bucket_start < until)
+    if provider:
+        query = query.where(rollup.provider == provider)
+    if model:
+        query = query.where(rollup.model == model)
+    if role:
+        query = query.where(rollup.participant_role == role)
+
+    fields = [f for f in GROUP_FIELDS if f in set(group_by)]
+    groups: Dict[tuple, RollupGroup] = {}
+    for row in (await session.execute(query.order_by(rollup.bucket_start))).scalars():
+        values = {
+            "provider": row.provider,
+            "model": row.model,
+            "role": row.participant_role,
+            "status": row.status,
+        }
+        bucket = hour_start(row.bucket_start)
+        if granularity == "day":
+            bucket = bucket.replace(hour=0)
+        elif granularity != "hour":
+            bucket = None
+        group_key = (bucket,) + tuple(values[f] for f in fields)
+        group = groups.get(group_key)
+        if group is None:
+            group = RollupGroup(key={f: values[f] for f in fields}, bucket_start=bucket, acc=RollupAccumulator())
+            groups[group_key] = group
+        group.acc.merge(RollupAccumulator.from_row(row))
+        if row.status != "success":
+            group.error_count += row.call_count or 0
+
+    return list(groups.values())
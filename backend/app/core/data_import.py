@@ -0,0 +1,176 @@
+"""Load files written by the export or archive commands back into a database.
+
+Tables are loaded parents first: sessions, then session_participants,
+messages, guesses and llm_call_events. For each table every matching file
+in the input directory is read (``<table>.parquet``, ``<table>.jsonl.gz``,
+``<table>-<stamp>.ndjson``, ``llm_call_events_<month>.jsonl.gz``, ...).
+Rows are streamed in batches, so millions of messages never sit in
+memory at once.
+
+Each batch is written with ``INSERT ... ON CONFLICT DO NOTHING`` (sent
+as multi-row statements) and committed on its own. Rows whose primary key already exists are skipped,
+so an interrupted import can simply be run again. Inside a batch:
+
+- Postgres defers deferrable constraints and skips the synchronous WAL
+  flush on commit; a crash can lose the last batches, and re-running
+  restores them.
+- SQLite defers foreign-key checks to commit.
+
+Rows keep their original ``created_at``, so they do not show up for a
+consumer already tailing /api/changes past that time (see api.changes).
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import Table
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from .export import EXPORT_TABLES, EXPORT_MODELS
+from .logging import get_logger
+from .row_writers import READABLE_SUFFIXES, read_row_batches
+
+
+logger = get_logger("core.data_import")
+
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "2000"))
+
+
+@dataclass
+class ImportedTable:
+    table: str
+    files: List[Path] = field(default_factory=list)
+    rows_read: int = 0
+    rows_inserted: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_skipped(self) -> int:
+        return self.rows_read - self.rows_inserted
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.seconds if self.seconds else 0.0
+
+
+def find_table_files(input_dir: Path, table: str) -> List[Path]:
+    """Files in `input_dir` holding rows of `table`, oldest name first."""
+    found = []
+    for path in sorted(Path(input_dir).iterdir()):
+        name = path.name
+        suffix = next((s for s in READABLE_SUFFIXES if name.endswith(s)), None)
+        if suffix is None:
+            continue
+        stem = name[: -len(suffix)]
+        if stem == table or stem.startswith((f"{table}-", f"{table}_")):
+            found.append(path)
+    return found
+
+
+def _parse_datetime(value: Any) -> Any:
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _parse_uuid(value: Any) -> Any:
+    return uuid.UUID(str(value)) if value is not None and not isinstance(value, uuid.UUID) else value
+
+
+def _parse_json(value: Any) -> Any:
+    # Parquet files store JSON columns as JSON text (see ParquetWriter)
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def _coercers(table: Table) -> Dict[str, Callable[[Any], Any]]:
+    """Per-column conversion of stored values back to what the column type binds."""
+    coercers = {}
+    for column in table.columns:
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            continue
+        if python_type is uuid.UUID:
+            coercers[column.name] = _parse_uuid
+        elif python_type is datetime:
+            coercers[column.name] = _parse_datetime
+        elif python_type in (dict, list):
+            coercers[column.name] = _parse_json
+    return coercers
+
+
+def _insert_ignoring_duplicates(conn: AsyncConnection, table: Table):
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise RuntimeError(f"Import does not support the {dialect} dialect")
+    key = next(iter(table.primary_key.columns))
+    return insert(table).on_conflict_do_nothing().returning(key)
+
+
+async def _prepare_bulk_transaction(conn: AsyncConnection) -> None:
+    if conn.dialect.name == "postgresql":
+        await conn.exec_driver_sql("SET CONSTRAINTS ALL DEFERRED")
+        await conn.exec_driver_sql("SET LOCAL synchronous_commit = off")
+    elif conn.dialect.name == "sqlite":
+        await conn.exec_driver_sql("PRAGMA defer_foreign_keys = ON")
+
+
+async def import_tables(
+    engine: AsyncEngine,
+    input_dir: Path,
+    *,
+    tables: Sequence[str] = EXPORT_TABLES,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    progress: Optional[Callable[[ImportedTable], None]] = None,
+) -> List[ImportedTable]:
+    """Import every file for `tables` found in `input_dir`; returns per-table counts and timings."""
+    for table in tables:
+        if table not in EXPORT_MODELS:
+            raise ValueError(f"Unknown table {table!r}; expected one of {', '.join(EXPORT_TABLES)}")
+
+    results: List[ImportedTable] = []
+    # Parents before children, whatever order `tables` came in
+    for name in (t for t in EXPORT_TABLES if t in tables):
+        table = EXPORT_MODELS[name].__table__
+        coercers = _coercers(table)
+        report = ImportedTable(table=name, files=find_table_files(input_dir, name))
+        started = time.perf_counter()
+
+        for path in report.files:
+            for batch in read_row_batches(path, batch_size):
+                # Columns unknown to this schema (e.g. from a newer export) are dropped
+                rows = [
+                    {
+                        column: coercers[column](value) if column in coercers else value
+                        for column, value in row.items()
+                        if column in table.columns
+                    }
+                    for row in batch
+                ]
+                async with engine.begin() as conn:
+                    await _prepare_bulk_transaction(conn)
+                    result = await conn.execute(_insert_ignoring_duplicates(conn, table), rows)
+                    inserted = len(result.all())
+                report.rows_read += len(rows)
+                report.rows_inserted += inserted
+                report.seconds = time.perf_counter() - started
+                if progress is not None:
+                    progress(report)
+
+        report.seconds = time.perf_counter() - started
+        logger.info(
+            "Imported %s: %s rows read, %s inserted, %s skipped in %.1fs (%.0f rows/s)",
+            name, report.rows_read, report.rows_inserted, report.rows_skipped,
+            report.seconds, report.rows_per_second,
+        )
+        results.append(report)
+    return results
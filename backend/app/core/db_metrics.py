@@ -0,0 +1,189 @@
+"""Database instrumentation: per-request query stats, slow-query log and pool metrics.
+
+`instrument_engine` hooks an engine's cursor events. Every statement is
+counted and timed into process-wide totals and into the stats of the HTTP
+request that issued it (tracked with a ContextVar set by
+`QueryStatsMiddleware`). Statements slower than DB_SLOW_QUERY_MS are logged
+with their parameters reduced to types, so secrets and transcripts never
+reach the log.
+
+`InstrumentedAsyncAdaptedQueuePool` times every connection checkout, which
+is what saturation looks like from the application's side.
+"""
+
+from __future__ import annotations
+
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+import os
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from .logging import get_logger
+
+logger = get_logger("core.db_metrics")
+
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+# Adds X-DB-Query-Count / X-DB-Query-Time-Ms to every response; meant for debugging
+DB_DEBUG_HEADERS = os.getenv("DB_DEBUG_HEADERS", "false").lower() == "true"
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Query-Time-Ms"
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_ms: float = 0.0
+    slow: int = 0
+
+    def record(self, elapsed_ms: float, slow: bool) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.slow += slow
+
+
+@dataclass
+class PoolWaitStats:
+    checkouts: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    timeouts: int = 0
+
+    def record(self, elapsed_ms: float) -> None:
+        self.checkouts += 1
+        self.total_wait_ms += elapsed_ms
+        self.max_wait_ms = max(self.max_wait_ms, elapsed_ms)
+
+
+query_totals = QueryStats()
+_request_stats: ContextVar[Optional[QueryStats]] = ContextVar("db_request_stats", default=None)
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """Replace bound values with their type names, keeping the shape."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: one representative row is enough
+            return {"rows": len(parameters), "first": redact_parameters(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    slow = elapsed_ms >= DB_SLOW_QUERY_MS
+    query_totals.record(elapsed_ms, slow)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.record(elapsed_ms, slow)
+    if slow:
+        logger.warning(
+            "Slow query (%.1f ms): %s | params=%s",
+            elapsed_ms,
+            " ".join(statement.split()),
+            redact_parameters(parameters),
+        )
+
+
+def _handle_error(exception_context):
+    # Keep the timing stack balanced when a statement fails
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def instrument_engine(engine) -> None:
+    """Attach query counting/timing to an (async) engine."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waits = PoolWaitStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.waits.timeouts += 1
+            raise
+        finally:
+            self.waits.record((time.perf_counter() - started) * 1000)
+
+
+def pool_stats(engine) -> Dict[str, Any]:
+    """Current pool occupancy plus cumulative checkout waits."""
+    pool = getattr(engine, "sync_engine", engine).pool
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    stats["max_overflow"] = getattr(pool, "_max_overflow", None)
+    waits = getattr(pool, "waits", None)
+    if waits is not None:
+        stats["checkouts"] = waits.checkouts
+        stats["total_wait_ms"] = round(waits.total_wait_ms, 3)
+        stats["max_wait_ms"] = round(waits.max_wait_ms, 3)
+        stats["timeouts"] = waits.timeouts
+    return stats
+
+
+class QueryStatsMiddleware:
+    """Collect per-request query stats; optionally report them as response headers."""
+
+    def __init__(self, app, *, headers: Optional[bool] = None):
+        self.app = app
+        # None follows DB_DEBUG_HEADERS
+        self.headers = headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _request_stats.set(stats)
+
+        async def send_with_stats(message):
+            headers_on = DB_DEBUG_HEADERS if self.headers is None else self.headers
+            if headers_on and message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((QUERY_COUNT_HEADER.lower().encode(), str(stats.count).encode()))
+                headers.append((QUERY_TIME_HEADER.lower().encode(), f"{stats.total_ms:.2f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _request_stats.reset(token)
+            if stats.count:
+                logger.debug(
+                    "%s %s issued %d queries in %.1f ms",
+                    scope.get("method"),
+                    scope.get("path"),
+                    stats.count,
+                    stats.total_ms,
+                )
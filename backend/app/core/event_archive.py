@@ -0,0 +1,215 @@
+"""Monthly partition maintenance and rollover archival for llm_call_events.
+
+On Postgres the table is range-partitioned by month on `created_at`, so
+recent-event queries only touch the newest partitions and old months can be
+exported and dropped wholesale. SQLite has no partitioning; the same archive
+command exports a month and deletes it in batches instead.
+"""
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from ..models.llm_call_event import LLMCallEventModel
+from .logging import get_logger
+from .row_writers import open_row_writer, remove_partial
+
+
+logger = get_logger("core.event_archive")
+
+PARENT_TABLE = LLMCallEventModel.__tablename__
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+PARTITIONS_AHEAD = int(os.getenv("LLM_EVENT_PARTITIONS_AHEAD", "3"))
+RETENTION_MONTHS = int(os.getenv("LLM_EVENT_RETENTION_MONTHS", "6"))
+
+_PARTITION_RE = re.compile(rf"^{PARENT_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+@dataclass
+class ArchivedMonth:
+    month: datetime
+    rows: int
+    path: Optional[Path]
+    dropped: bool
+
+
+def month_start(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    value = value.astimezone(timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + (value.month - 1) + months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+async def is_partitioned(conn: AsyncConnection) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    relkind = (
+        await conn.execute(
+            text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"),
+            {"name": PARENT_TABLE},
+        )
+    ).scalar()
+    return relkind == "p"
+
+
+async def list_partitions(conn: AsyncConnection) -> List[datetime]:
+    """Return the month starts of all monthly partitions, oldest first."""
+    rows = await conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent"
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    months = []
+    for (name,) in rows:
+        match = _PARTITION_RE.match(name)
+        if match:
+            months.append(datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc))
+    return sorted(months)
+
+
+async def ensure_event_partitions(
+    conn: AsyncConnection,
+    *,
+    months_ahead: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> List[str]:
+    """Create the current and upcoming monthly partitions plus a DEFAULT catch-all.
+
+    No-op unless the table is a partitioned Postgres table. Returns the names
+    of partitions that were checked/created.
+    """
+    if not await is_partitioned(conn):
+        return []
+
+    ahead = PARTITIONS_AHEAD if months_ahead is None else months_ahead
+    current = month_start(now or datetime.now(timezone.utc))
+    created = []
+    for offset in range(ahead + 1):
+        start = add_months(current, offset)
+        end = add_months(start, 1)
+        name = partition_name(start)
+        try:
+            async with conn.begin_nested():
+                await conn.execute(
+                    text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "
+                        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                    )
+                )
+        except Exception as exc:
+            # Usually means the DEFAULT partition already holds rows for this range
+            logger.warning("Could not create partition %s: %s", name, exc)
+            continue
+        created.append(name)
+
+    await conn.execute(
+        text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT")
+    )
+    return created
+
+
+async def _months_before(conn: AsyncConnection, cutoff: datetime) -> List[datetime]:
+    if await is_partitioned(conn):
+        return [m for m in await list_partitions(conn) if m < cutoff]
+
+    table = LLMCallEventModel.__table__
+    oldest = (
+        await conn.execute(select(func.min(table.c.created_at)).where(table.c.created_at < cutoff))
+    ).scalar()
+    if oldest is None:
+        return []
+    if isinstance(oldest, str):
+        oldest = datetime.fromisoformat(oldest)
+    months = []
+    month = month_start(oldest)
+    while month < cutoff:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+async def archive_llm_events(
+    engine: AsyncEngine,
+    *,
+    output_dir: Path,
+    older_than_months: Optional[int] = None,
+    fmt: str = "jsonl",
+    batch_size: int = 1000,
+    dry_run: bool = False,
+    now: Optional[datetime] = None,
+) -> List[ArchivedMonth]:
+    """Export each month older than the retention window to a file, then drop it.
+
+    Partitioned Postgres tables detach and drop the whole partition; everything
+    else deletes the month's rows in `batch_size` chunks. A month is only
+    dropped after its file has been fully written.
+    """
+    retention = RETENTION_MONTHS if older_than_months is None else older_than_months
+    cutoff = add_months(month_start(now or datetime.now(timezone.utc)), -retention)
+    table = LLMCallEventModel.__table__
+
+    async with engine.connect() as conn:
+        partitioned = await is_partitioned(conn)
+        months = await _months_before(conn, cutoff)
+
+    results: List[ArchivedMonth] = []
+    for month in months:
+        end = add_months(month, 1)
+        in_month = (table.c.created_at >= month) & (table.c.created_at < end)
+
+        if dry_run:
+            async with engine.connect() as conn:
+                count = (await conn.execute(select(func.count()).select_from(table).where(in_month))).scalar_one()
+            results.append(ArchivedMonth(month=month, rows=count, path=None, dropped=False))
+            continue
+
+        writer = open_row_writer(Path(output_dir) / f"{PARENT_TABLE}_{month:%Y-%m}", fmt, table)
+        try:
+            async with engine.connect() as conn:
+                stream = await conn.stream(
+                    select(table).where(in_month).order_by(table.c.created_at, table.c.id)
+                )
+                async for batch in stream.mappings().partitions(batch_size):
+                    writer.write_batch(dict(row) for row in batch)
+            writer.close()
+        except Exception:
+            remove_partial(writer)
+            raise
+
+        if partitioned:
+            name = partition_name(month)
+            async with engine.begin() as conn:
+                await conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+                await conn.execute(text(f"DROP TABLE {name}"))
+        else:
+            while True:
+                async with engine.begin() as conn:
+                    ids = select(table.c.id).where(in_month).limit(batch_size).scalar_subquery()
+                    deleted = (await conn.execute(delete(table).where(table.c.id.in_(ids)))).rowcount
+                if not deleted or deleted < batch_size:
+                    break
+
+        logger.info("Archived %s rows of %s for %s to %s", writer.rows_written, PARENT_TABLE, f"{month:%Y-%m}", writer.path)
+        results.append(ArchivedMonth(month=month, rows=writer.rows_written, path=writer.path, dropped=True))
+
+    return results
@@ -0,0 +1,165 @@
+"""Bulk export of sessions, messages, guesses and llm_call_events for offline analysis.
+
+Each table is read with a server-side cursor and written in fixed-size
+batches through row_writers (Parquet row groups, or gzip JSONL without
+pyarrow), so memory use does not grow with the amount of data exported.
+The files load directly into DuckDB or pandas.
+
+Filters select sessions; participants, messages and guesses follow their
+session:
+
+- ``created_after``/``created_before`` bound ``sessions.created_at``. For
+  llm_call_events they bound the event's own ``created_at``, which on
+  Postgres also prunes the monthly partitions.
+- ``provider`` keeps sessions with a participant from that provider, and
+  events made against it.
+- ``status`` (win, loss, active, over) is the game outcome. Events are
+  kept when their session matches.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Union
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from ..models import GuessModel, LLMCallEventModel, MessageModel, SessionModel, SessionParticipantModel
+from .logging import get_logger
+from .row_writers import open_row_writer, remove_partial
+
+
+logger = get_logger("core.export")
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+EXPORT_TABLES = ("sessions", "session_participants", "messages", "guesses", "llm_call_events")
+SESSION_STATUSES = ("win", "loss", "active", "over")
+
+EXPORT_MODELS = {
+    "sessions": SessionModel,
+    "session_participants": SessionParticipantModel,
+    "messages": MessageModel,
+    "guesses": GuessModel,
+    "llm_call_events": LLMCallEventModel,
+}
+
+
+@dataclass
+class ExportFilters:
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    provider: Optional[str] = None
+    status: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.status is not None and self.status not in SESSION_STATUSES:
+            raise ValueError(f"Unknown status {self.status!r}; expected one of {', '.join(SESSION_STATUSES)}")
+
+
+@dataclass
+class ExportedTable:
+    table: str
+    rows: int
+    path: Path
+
+
+def _session_conditions(filters: ExportFilters, *, dates: bool = True) -> list:
+    conditions = []
+    if dates and filters.created_after is not None:
+        conditions.append(SessionModel.created_at >= filters.created_after)
+    if dates and filters.created_before is not None:
+        conditions.append(SessionModel.created_at < filters.created_before)
+    if filters.status in ("win", "loss"):
+        conditions.append(SessionModel.game_status == filters.status)
+    elif filters.status == "over":
+        conditions.append(SessionModel.game_over.is_(True))
+    elif filters.status == "active":
+        conditions.append(SessionModel.game_over.is_(False))
+    if filters.provider is not None:
+        conditions.append(
+            select(SessionParticipantModel.session_id)
+            .where(
+                SessionParticipantModel.session_id == SessionModel.id,
+                SessionParticipantModel.provider == filters.provider,
+            )
+            .exists()
+        )
+    return conditions
+
+
+def export_query(table: str, filters: Optional[ExportFilters] = None) -> Select:
+    """SELECT of every column of `table` matching `filters`, in a stable order."""
+    if table not in EXPORT_MODELS:
+        raise ValueError(f"Unknown table {table!r}; expected one of {', '.join(EXPORT_TABLES)}")
+    filters = filters or ExportFilters()
+    model = EXPORT_MODELS[table]
+    query = select(model.__table__)
+
+    if table == "sessions":
+        return query.where(*_session_conditions(filters)).order_by(SessionModel.created_at, SessionModel.id)
+
+    if table in ("session_participants", "messages", "guesses"):
+        conditions = _session_conditions(filters)
+        if conditions:
+            sessions = select(SessionModel.id).where(*conditions)
+            query = query.where(model.session_id.in_(sessions))
+        if table == "session_participants":
+            return query.order_by(model.session_id, model.participant_id)
+        return query.order_by(model.session_id, model.turn, model.id)
+
+    event = LLMCallEventModel
+    if filters.created_after is not None:
+        query = query.where(event.created_at >= filters.created_after)
+    if filters.created_before is not None:
+        query = query.where(event.created_at < filters.created_before)
+    if filters.provider is not None:
+        query = query.where(event.provider == filters.provider)
+    if filters.status is not None:
+        sessions = select(SessionModel.id).where(*_session_conditions(filters, dates=False))
+        query = query.where(event.session_id.in_(sessions))
+    return query.order_by(event.created_at, event.id)
+
+
+async def iter_export_batches(
+    conn: Union[AsyncConnection, AsyncSession],
+    table: str,
+    filters: Optional[ExportFilters] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> AsyncIterator[List[Dict]]:
+    """Yield the rows of `table` as dicts, `batch_size` at a time."""
+    stream = await conn.stream(export_query(table, filters).execution_options(yield_per=batch_size))
+    async for batch in stream.mappings().partitions(batch_size):
+        yield [dict(row) for row in batch]
+
+
+async def export_tables(
+    engine: AsyncEngine,
+    output_dir: Path,
+    *,
+    tables: Sequence[str] = EXPORT_TABLES,
+    filters: Optional[ExportFilters] = None,
+    fmt: str = "parquet",
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> List[ExportedTable]:
+    """Write one file per table to `output_dir`; a failed table leaves no partial file."""
+    for table in tables:
+        if table not in EXPORT_MODELS:
+            raise ValueError(f"Unknown table {table!r}; expected one of {', '.join(EXPORT_TABLES)}")
+
+    results: List[ExportedTable] = []
+    for table in tables:
+        writer = open_row_writer(Path(output_dir) / table, fmt, EXPORT_MODELS[table].__table__)
+        try:
+            async with engine.connect() as conn:
+                async for batch in iter_export_batches(conn, table, filters, batch_size):
+                    writer.write_batch(batch)
+            writer.close()
+        except Exception:
+            remove_partial(writer)
+            raise
+        logger.info("Exported %s rows of %s to %s", writer.rows_written, table, writer.path)
+        results.append(ExportedTable(table=table, rows=writer.rows_written, path=writer.path))
+    return results
@@ -8,6 +8,7 @@ from sqlalchemy.exc import OperationalError, ProgrammingError
 import asyncio
 
 from ..core.logging import get_logger
+from .event_archive import ensure_event_partitions
 from ..models.llm_call_event import LLMCallEventModel
 from ..models.database import SessionLocal
 
@@ -29,6 +30,7 @@ async def _ensure_table_exists(session: AsyncSession) -> None:
         try:
             async with session.bind.begin() as conn:
                 await conn.run_sync(LLMCallEventModel.__table__.create, checkfirst=True)
+                await ensure_event_partitions(conn)
         except Exception:
             logger.exception("Failed to ensure llm_call_events table exists")
         else:
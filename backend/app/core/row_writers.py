@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import gzip
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, List, Optional, Protocol
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from sqlalchemy import Table
+
+from .logging import get_logger
+
+
+logger = get_logger("core.row_writers")
+
+SUPPORTED_FORMATS = ("jsonl", "parquet")
+# Everything open_row_writer and the NDJSON export endpoint produce
+READABLE_SUFFIXES = (".parquet", ".jsonl.gz", ".jsonl", ".ndjson")
+
+
+def to_jsonable(value: Any) -> Any:
+    """Coerce a column value into something json.dumps can handle."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", errors="replace")
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    return str(value)
+
+
+def pyarrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class RowWriter(Protocol):
+    path: Path
+    rows_written: int
+
+    def write_batch(self, rows: Iterable[dict]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class JsonlGzipWriter:
+    """Appends rows as gzip-compressed JSON lines."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.rows_written = 0
+        self._fh = gzip.open(path, "wt", encoding="utf-8")
+
+    def write_batch(self, rows: Iterable[dict]) -> None:
+        for row in rows:
+            self._fh.write(json.dumps(to_jsonable(row), separators=(",", ":")))
+            self._fh.write("\n")
+            self.rows_written += 1
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+def arrow_schema(table: "Table"):
+    """Arrow schema for the rows of `table`, from its column types.
+
+    Taken from the table rather than inferred from the first batch, where a
+    nullable column can be all-NULL and later batches would not fit.
+    UUIDs, JSON and anything unrecognised are stored as strings (see
+    ParquetWriter._normalize).
+    """
+    import pyarrow as pa
+
+    fields = []
+    for column in table.columns:
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            python_type = None
+        if python_type is bool:
+            arrow_type = pa.bool_()
+        elif python_type is int:
+            arrow_type = pa.int64()
+        elif python_type in (float, Decimal):
+            arrow_type = pa.float64()
+        elif python_type is datetime:
+            arrow_type = pa.timestamp("us", tz="UTC" if getattr(column.type, "timezone", False) else None)
+        elif python_type is date:
+            arrow_type = pa.date32()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields)
+
+
+class ParquetWriter:
+    """Writes each batch as a Parquet row group.
+
+    JSON columns are stored as JSON strings so the schema stays stable across
+    batches whatever shape the payloads have. Pass the SQLAlchemy `table`
+    so column types come from the schema; without it they are inferred from
+    the first batch.
+    """
+
+    def __init__(self, path: Path, table: Optional["Table"] = None) -> None:
+        import pyarrow.parquet as pq
+
+        self.path = path
+        self.rows_written = 0
+        self._pq = pq
+        self._writer = None
+        self._schema = arrow_schema(table) if table is not None else None
+
+    def _normalize(self, row: dict) -> dict:
+        out = {}
+        for key, value in row.items():
+            if isinstance(value, (dict, list)):
+                out[key] = json.dumps(to_jsonable(value))
+            elif isinstance(value, UUID):
+                out[key] = str(value)
+            elif isinstance(value, Decimal):
+                out[key] = float(value)
+            else:
+                out[key] = value
+        return out
+
+    def write_batch(self, rows: Iterable[dict]) -> None:
+        import pyarrow as pa
+
+        batch = [self._normalize(row) for row in rows]
+        if not batch:
+            return
+        if self._schema is None:
+            table = pa.Table.from_pylist(batch)
+            # Nullable columns that happen to be all-NULL in the first batch
+            # would otherwise be typed as `null` and reject later values.
+            fields = [
+                pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f
+                for f in table.schema
+            ]
+            self._schema = pa.schema(fields)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(str(self.path), self._schema, compression="zstd")
+        table = pa.Table.from_pylist(batch, schema=self._schema)
+        self._writer.write_table(table)
+        self.rows_written += len(batch)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def open_row_writer(base_path: Path, fmt: str = "jsonl", table: Optional["Table"] = None) -> RowWriter:
+    """Open a writer for `base_path` (without extension) in the given format.
+
+    Parquet needs the optional `pyarrow` dependency; without it we fall back to
+    gzip JSONL so archival and export jobs keep working on slim installs.
+    """
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+    base_path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "parquet":
+        if pyarrow_available():
+            return ParquetWriter(base_path.with_name(base_path.name + ".parquet"), table)
+        logger.warning("pyarrow is not installed; writing %s as gzip JSONL instead", base_path.name)
+    return JsonlGzipWriter(base_path.with_name(base_path.name + ".jsonl.gz"))
+
+
+def remove_partial(writer: Optional[RowWriter]) -> None:
+    """Best-effort cleanup of a writer's file after a failed job."""
+    if writer is None:
+        return
+    try:
+        writer.close()
+    except Exception:
+        pass
+    try:
+        writer.path.unlink(missing_ok=True)
+    except OSError:
+        logger.warning("Could not remove partial file %s", writer.path)
+
+
+def read_row_batches(path: Path, batch_size: int) -> Iterator[List[dict]]:
+    """Read a file written by a row writer (or an NDJSON export) back in batches.
+
+    Values come back as stored: JSON lines hold UUIDs and datetimes as
+    strings, and Parquet holds JSON columns as JSON strings.
+    """
+    name = path.name
+    if name.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for record_batch in pq.ParquetFile(str(path)).iter_batches(batch_size=batch_size):
+            yield record_batch.to_pylist()
+        return
+    if not name.endswith(READABLE_SUFFIXES):
+        raise ValueError(f"Unsupported file: {path}")
+    opener = gzip.open if name.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as fh:
+        batch: List[dict] = []
+        for line in fh:
+            if not line.strip():
+                continue
+            batch.append(json.loads(line))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
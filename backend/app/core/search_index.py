@@ -0,0 +1,107 @@
+"""Full-text index over messages.comms and messages.internal_thoughts.
+
+Postgres
+    ``messages.search_vector`` is a stored generated ``tsvector``
+    (comms weighted A, internal_thoughts B) with a GIN index, so every
+    insert or update maintains it without application code.
+SQLite
+    ``messages_fts`` is an external-content FTS5 table (Porter stemming)
+    kept in step by insert/update/delete triggers. Only the index is
+    stored; the text stays in ``messages``. FTS5 needs an integer key and
+    ``messages.rowid`` will not do: messages has a UUID primary key, so
+    VACUUM may renumber its rowids. ``messages_search_keys`` assigns each
+    message a key (an INTEGER PRIMARY KEY, which VACUUM keeps) and the
+    ``messages_search_source`` view serves the indexed text by that key.
+    The FTS table's UNINDEXED ``message_id`` column is what searches join
+    on.
+
+Neither is part of the ORM model, so ordinary message queries never read
+it. ``ensure_search_index`` creates whatever is missing (at startup,
+after ``create_all``); the 20261019_add_message_search migration does
+the same for existing databases. Messages of archived sessions (see
+core.session_archive) are deleted from ``messages`` and so drop out of
+the index.
+"""
+from __future__ import annotations
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from .logging import get_logger
+
+
+logger = get_logger("core.search_index")
+
+# Text search configuration; changing it means rebuilding the index
+SEARCH_CONFIG = "english"
+FTS_TABLE = "messages_fts"
+
+POSTGRES_DDL = (
+    "ALTER TABLE messages ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(comms, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(internal_thoughts, '')), 'B')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS ix_messages_search_vector ON messages USING GIN (search_vector)",
+)
+
+KEYS_TABLE = "messages_search_keys"  # message_id is declared like messages.id, so values compare alike
+SOURCE_VIEW = "messages_search_source"
+
+SQLITE_DDL = (
+    # Layout of the first version of this index, keyed on messages.rowid
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+    f"CREATE TABLE IF NOT EXISTS {KEYS_TABLE} (key INTEGER PRIMARY KEY, message_id UUID NOT NULL UNIQUE)",
+    f"CREATE VIEW IF NOT EXISTS {SOURCE_VIEW} AS "
+    "SELECT k.key, k.message_id, m.comms, m.internal_thoughts "
+    f"FROM {KEYS_TABLE} k JOIN messages m ON m.id = k.message_id",
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "message_id UNINDEXED, comms, internal_thoughts, "
+    f"content='{SOURCE_VIEW}', content_rowid='key', tokenize='porter unicode61')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON messages BEGIN "
+    f"INSERT INTO {KEYS_TABLE}(message_id) VALUES (new.id); "
+    f"INSERT INTO {FTS_TABLE}(rowid, message_id, comms, internal_thoughts) "
+    f"SELECT key, new.id, new.comms, new.internal_thoughts FROM {KEYS_TABLE} WHERE message_id = new.id; END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON messages BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, message_id, comms, internal_thoughts) "
+    f"SELECT 'delete', key, old.id, old.comms, old.internal_thoughts FROM {KEYS_TABLE} WHERE message_id = old.id; "
+    f"DELETE FROM {KEYS_TABLE} WHERE message_id = old.id; END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF comms, internal_thoughts ON messages BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, message_id, comms, internal_thoughts) "
+    f"SELECT 'delete', key, old.id, old.comms, old.internal_thoughts FROM {KEYS_TABLE} WHERE message_id = old.id; "
+    f"INSERT INTO {FTS_TABLE}(rowid, message_id, comms, internal_thoughts) "
+    f"SELECT key, new.id, new.comms, new.internal_thoughts FROM {KEYS_TABLE} WHERE message_id = new.id; END",
+    # Index rows that existed before the table did
+    f"INSERT OR IGNORE INTO {KEYS_TABLE}(message_id) SELECT id FROM messages",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+)
+
+
+async def has_search_index(conn: AsyncConnection) -> bool:
+    if conn.dialect.name == "postgresql":
+        query = text(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = 'messages' AND column_name = 'search_vector'"
+        )
+    elif conn.dialect.name == "sqlite":
+        query = text(f"SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = '{KEYS_TABLE}'")
+    else:
+        return False
+    return (await conn.execute(query)).first() is not None
+
+
+async def ensure_search_index(conn: AsyncConnection) -> bool:
+    """Create the index for this dialect if it is missing; returns True when it was created."""
+    if conn.dialect.name not in ("postgresql", "sqlite") or await has_search_index(conn):
+        return False
+    if conn.dialect.name == "postgresql":
+        # Adding the generated column rewrites the table once
+        for statement in POSTGRES_DDL:
+            await conn.execute(text(statement))
+    else:
+        for statement in SQLITE_DDL:
+            await conn.execute(text(statement))
+    logger.info("Created the message search index (%s)", conn.dialect.name)
+    return True
@@ -0,0 +1,145 @@
+"""Move finished sessions' transcripts out of the hot tables.
+
+A session whose game ended more than N days ago (by ``updated_at``, else
+``created_at``) has its messages, guesses and LLM call events written to
+the TranscriptStore and then deleted, together with its session_events
+and snapshot, which only matter for playing further turns. The
+``sessions`` row and its participants stay, with ``archived_at`` set:
+listing, status and ETags keep working from the summary columns, and the
+history endpoints read the transcript from the store instead.
+
+Sessions are processed in batches. A batch is fsynced to the store before
+its rows are deleted, so a crash in between leaves the rows hot and a
+duplicate record in the store that the next run supersedes.
+
+API workers need the same TRANSCRIPT_ARCHIVE_DIR as the job, e.g. a
+shared volume.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..models import (
+    GuessModel,
+    LLMCallEventModel,
+    MessageModel,
+    SessionEventModel,
+    SessionModel,
+    SessionSnapshotModel,
+)
+from ..models.database import utcnow
+from .logging import get_logger
+from .transcript_store import TranscriptStore
+
+
+logger = get_logger("core.session_archive")
+
+SESSION_ARCHIVE_AFTER_DAYS = int(os.getenv("SESSION_ARCHIVE_AFTER_DAYS", "30"))
+SESSION_ARCHIVE_BATCH_SIZE = int(os.getenv("SESSION_ARCHIVE_BATCH_SIZE", "100"))
+
+# Copied into the transcript, then deleted
+_ARCHIVED = {"messages": MessageModel, "guesses": GuessModel, "llm_call_events": LLMCallEventModel}
+# Deleted only: the event log and snapshot are derived from the above
+_DROPPED = (SessionEventModel, SessionSnapshotModel)
+
+
+@dataclass
+class SessionArchiveReport:
+    sessions: int = 0
+    messages: int = 0
+    guesses: int = 0
+    llm_call_events: int = 0
+    bytes_written: int = 0
+
+
+def _candidates(cutoff: datetime, limit: Optional[int] = None):
+    last_activity = func.coalesce(SessionModel.updated_at, SessionModel.created_at)
+    query = (
+        select(SessionModel.__table__)
+        .where(
+            SessionModel.game_over.is_(True),
+            SessionModel.archived_at.is_(None),
+            last_activity < cutoff,
+        )
+        .order_by(SessionModel.created_at, SessionModel.id)
+    )
+    return query.limit(limit) if limit is not None else query
+
+
+async def archive_sessions(
+    engine: AsyncEngine,
+    store: TranscriptStore,
+    *,
+    older_than_days: int = SESSION_ARCHIVE_AFTER_DAYS,
+    batch_size: int = SESSION_ARCHIVE_BATCH_SIZE,
+    dry_run: bool = False,
+    now: Optional[datetime] = None,
+) -> SessionArchiveReport:
+    cutoff = (now or utcnow()) - timedelta(days=older_than_days)
+    report = SessionArchiveReport()
+
+    if dry_run:
+        async with engine.connect() as conn:
+            ids = select(_candidates(cutoff).subquery().c.id)
+            report.sessions = (await conn.execute(select(func.count()).select_from(ids.subquery()))).scalar_one()
+            for name, model in _ARCHIVED.items():
+                count = select(func.count()).select_from(model).where(model.session_id.in_(ids))
+                setattr(report, name, (await conn.execute(count)).scalar_one())
+        return report
+
+    while True:
+        async with engine.connect() as conn:
+            sessions = (await conn.execute(_candidates(cutoff, batch_size))).mappings().all()
+            if not sessions:
+                break
+            ids = [row["id"] for row in sessions]
+            transcripts: Dict[UUID, Dict[str, Any]] = {
+                row["id"]: {**dict(row), **{name: [] for name in _ARCHIVED}} for row in sessions
+            }
+            for name, model in _ARCHIVED.items():
+                order = (model.created_at, model.id) if name == "llm_call_events" else (model.turn, model.id)
+                rows = await conn.execute(select(model.__table__).where(model.session_id.in_(ids)).order_by(*order))
+                for row in rows.mappings():
+                    transcripts[row["session_id"]][name].append(
+                        {key: value for key, value in row.items() if key != "session_id"}
+                    )
+
+        report.bytes_written += store.append_many(transcripts)
+
+        archived_at = utcnow()
+        async with engine.begin() as conn:
+            for name, model in _ARCHIVED.items():
+                deleted = (await conn.execute(delete(model).where(model.session_id.in_(ids)))).rowcount
+                setattr(report, name, getattr(report, name) + deleted)
+            for model in _DROPPED:
+                await conn.execute(delete(model).where(model.session_id.in_(ids)))
+            # updated_at is left alone: it feeds ETags, and the game did not change
+            await conn.execute(
+                update(SessionModel)
+                .where(SessionModel.id.in_(ids))
+                .values(archived_at=archived_at, updated_at=SessionModel.updated_at)
+            )
+        report.sessions += len(ids)
+        logger.info("Archived %s sessions (%s so far)", len(ids), report.sessions)
+
+    return report
+
+
+def archived_history(
+    transcript: Dict[str, Any], since_turn: Optional[int] = None
+) -> Tuple[List[SimpleNamespace], List[SimpleNamespace]]:
+    """Messages and guesses of an archived transcript, shaped like the hot ORM rows."""
+    def after(row: Dict[str, Any]) -> bool:
+        return since_turn is None or row["turn"] > since_turn
+
+    messages = [SimpleNamespace(**row) for row in transcript.get("messages", []) if after(row)]
+    guesses = [SimpleNamespace(**row) for row in transcript.get("guesses", []) if after(row)]
+    return messages, guesses
@@ -0,0 +1,186 @@
+"""Append-only, compressed store of archived session transcripts.
+
+Two files in one directory:
+
+``transcripts.dat``
+    Records appended back to back. Each is a 12-byte header (magic,
+    payload length, CRC-32 of the payload) followed by the zlib-compressed
+    JSON transcript.
+``transcripts.idx``
+    Fixed 32-byte entries (session UUID, record offset, record length),
+    appended after the record they point to is durable.
+
+Readers memory-map both files. The index is scanned once into a dict
+(32 bytes per archived session on disk), and records are decompressed
+straight out of the data mapping, so a lookup costs one page fault or
+two, not a file read. Both mappings are refreshed when another process
+has appended.
+
+A record written without its index entry (a crash between the two
+fsyncs) is never referenced and costs only its bytes. Archiving a
+session again appends a new record; the last index entry wins. There
+is a single writer at a time (the archive job); readers may be any
+number of processes.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from .row_writers import to_jsonable
+
+TRANSCRIPT_ARCHIVE_DIR = os.getenv("TRANSCRIPT_ARCHIVE_DIR", "archive/transcripts")
+
+DATA_FILE = "transcripts.dat"
+INDEX_FILE = "transcripts.idx"
+MAGIC = b"HMT1"
+_HEADER = struct.Struct("<4sII")  # magic, payload length, crc32
+_ENTRY = struct.Struct("<16sQI4x")  # session id, record offset, record length
+
+
+class TranscriptCorrupted(Exception):
+    """A record failed its magic or checksum test."""
+
+
+class _Mapping:
+    """Read-only mmap of a file that may grow; remapped on demand."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._map: Optional[mmap.mmap] = None
+        self.size = 0
+
+    def refresh(self) -> bool:
+        """Remap if the file grew; returns True when it did."""
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return False
+        if size == self.size:
+            return False
+        self.close()
+        if size:
+            with open(self.path, "rb") as fh:
+                self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self.size = size
+        return True
+
+    def view(self, start: int, end: int) -> bytes:
+        if self._map is None or end > self.size:
+            self.refresh()
+        if self._map is None or end > self.size:
+            raise TranscriptCorrupted(f"{self.path} ends before byte {end}")
+        return self._map[start:end]
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self.size = 0
+
+
+class TranscriptStore:
+    def __init__(self, directory: Path = Path(TRANSCRIPT_ARCHIVE_DIR)):
+        self.directory = Path(directory)
+        self._data = _Mapping(self.directory / DATA_FILE)
+        self._index_map = _Mapping(self.directory / INDEX_FILE)
+        self._index: Dict[UUID, Tuple[int, int]] = {}
+        self._indexed_bytes = 0
+        self._lock = threading.Lock()
+
+    # Reading
+
+    def _load_index(self) -> None:
+        self._index_map.refresh()
+        # A torn trailing entry (crash mid-append) is ignored until completed
+        end = self._index_map.size - self._index_map.size % _ENTRY.size
+        if end <= self._indexed_bytes:
+            return
+        chunk = self._index_map.view(self._indexed_bytes, end)
+        for raw_id, offset, length in _ENTRY.iter_unpack(chunk):
+            self._index[UUID(bytes=raw_id)] = (offset, length)
+        self._indexed_bytes = end
+
+    def __contains__(self, session_id: UUID) -> bool:
+        with self._lock:
+            self._load_index()
+            return session_id in self._index
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load_index()
+            return len(self._index)
+
+    def get(self, session_id: UUID) -> Optional[Dict[str, Any]]:
+        """The archived transcript of `session_id`, or None if it was never archived."""
+        with self._lock:
+            self._load_index()
+            location = self._index.get(session_id)
+            if location is None:
+                return None
+            offset, length = location
+            record = self._data.view(offset, offset + length)
+        magic, payload_length, checksum = _HEADER.unpack_from(record)
+        payload = record[_HEADER.size:_HEADER.size + payload_length]
+        if magic != MAGIC or len(payload) != payload_length or zlib.crc32(payload) != checksum:
+            raise TranscriptCorrupted(f"Archived transcript of {session_id} at offset {offset} is corrupted")
+        return json.loads(zlib.decompress(payload))
+
+    # Writing
+
+    def append_many(self, transcripts: Dict[UUID, Dict[str, Any]]) -> int:
+        """Append transcripts; they are durable (fsynced) when this returns. Returns bytes written."""
+        if not transcripts:
+            return 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        records = []
+        for session_id, transcript in transcripts.items():
+            payload = zlib.compress(
+                json.dumps(to_jsonable(transcript), separators=(",", ":")).encode("utf-8"), 6
+            )
+            records.append((session_id, _HEADER.pack(MAGIC, len(payload), zlib.crc32(payload)) + payload))
+
+        with open(self.directory / DATA_FILE, "ab") as data:
+            offset = data.seek(0, os.SEEK_END)
+            entries = []
+            for session_id, record in records:
+                data.write(record)
+                entries.append(_ENTRY.pack(session_id.bytes, offset, len(record)))
+                offset += len(record)
+            data.flush()
+            os.fsync(data.fileno())
+
+        with open(self.directory / INDEX_FILE, "ab") as index:
+            # Drop a torn entry left by a crash so the new ones stay aligned
+            size = index.seek(0, os.SEEK_END)
+            if size % _ENTRY.size:
+                index.truncate(size - size % _ENTRY.size)
+            index.write(b"".join(entries))
+            index.flush()
+            os.fsync(index.fileno())
+        return sum(len(record) for _, record in records)
+
+    def close(self) -> None:
+        with self._lock:
+            self._data.close()
+            self._index_map.close()
+            self._index.clear()
+            self._indexed_bytes = 0
+
+
+_store: Optional[TranscriptStore] = None
+
+
+def get_transcript_store() -> TranscriptStore:
+    """Process-wide store at TRANSCRIPT_ARCHIVE_DIR."""
+    global _store
+    if _store is None:
+        _store = TranscriptStore(Path(TRANSCRIPT_ARCHIVE_DIR))
+    return _store
@@ -1,12 +1,26 @@
 from fastapi import FastAPI
+import asyncio
 import logging
 from fastapi.middleware.cors import CORSMiddleware
 import os
 from pathlib import Path
 from dotenv import load_dotenv
 
-from .api import router
+from .api import (
+    router,
+    analytics_router,
+    changes_router,
+    events_router,
+    export_router,
+    metrics_router,
+    search_router,
+)
 from .models import Base, engine
+from .models.database import SessionLocal
+from .core.analytics import ROLLUP_REFRESH_SECONDS, refresh_rollups_periodically
+from .core.db_metrics import QUERY_COUNT_HEADER, QUERY_TIME_HEADER, QueryStatsMiddleware
+from .core.event_archive import ensure_event_partitions
+from .core.search_index import ensure_search_index
 
 # Load environment variables from .env.development for local dev
 # In Docker, environment variables are already set by docker-compose
@@ -32,10 +46,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", QUERY_COUNT_HEADER, QUERY_TIME_HEADER],
 )
+app.add_middleware(QueryStatsMiddleware)
 
 # Include API routes
 app.include_router(router, prefix="/api")
+app.include_router(analytics_router, prefix="/api")
+app.include_router(events_router, prefix="/api")
+app.include_router(changes_router, prefix="/api")
+app.include_router(export_router, prefix="/api")
+app.include_router(metrics_router, prefix="/api")
+app.include_router(search_router, prefix="/api")
 
 @app.on_event("startup")
 async def startup_event():
@@ -49,6 +71,22 @@ async def startup_event():
     async with engine.begin() as conn:
         # Create tables if they don't exist
         await conn.run_sync(Base.metadata.create_all)
+        # Postgres only: make sure this month's and upcoming event partitions exist
+        await ensure_event_partitions(conn)
+        # Full-text index over messages; see core.search_index
+        await ensure_search_index(conn)
+    # Keep /api/analytics rollups current without refreshing on reads
+    if ROLLUP_REFRESH_SECONDS > 0:
+        app.state.rollup_refresh = asyncio.create_task(
+            refresh_rollups_periodically(SessionLocal, ROLLUP_REFRESH_SECONDS)
+        )
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background work started on startup"""
+    task = getattr(app.state, "rollup_refresh", None)
+    if task is not None:
+        task.cancel()
 
 @app.get("/")
 async def root():
@@ -1,16 +1,29 @@
-from .database import Base, Session, engine, get_db
+from .database import Base, Session, engine, get_db, get_read_db, get_read_sessionmaker, read_engine
 from .session import SessionModel
 from .message import MessageModel
 from .guess import GuessModel
 from .llm_call_event import LLMCallEventModel
+from .llm_call_rollup import LLMCallRollupModel, RollupWatermarkModel
+from .session_event import SessionEventModel, SessionSnapshotModel
+from .session_participant import SessionParticipantModel
+from .idempotency_key import IdempotencyKeyModel
 
 __all__ = [
     "Base",
     "Session",
     "engine",
+    "read_engine",
     "get_db",
+    "get_read_db",
+    "get_read_sessionmaker",
     "SessionModel",
     "MessageModel",
     "GuessModel",
     "LLMCallEventModel",
+    "LLMCallRollupModel",
+    "RollupWatermarkModel",
+    "SessionEventModel",
+    "SessionSnapshotModel",
+    "SessionParticipantModel",
+    "IdempotencyKeyModel",
 ]
\ No newline at end of file
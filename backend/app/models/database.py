@@ -1,7 +1,15 @@
+from sqlalchemy import event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from datetime import datetime, timezone
+from typing import Dict, Optional
 import os
+import time
+
+from fastapi import Request, Response
+
+from ..core.db_metrics import InstrumentedAsyncAdaptedQueuePool, instrument_engine
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
@@ -9,25 +17,203 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     DATABASE_URL = "sqlite+aiosqlite:///./hidden_messages_dev.db"
 
-# Normalize/derive async URL
-if DATABASE_URL.startswith("postgresql+psycopg://"):
-    ASYNC_DATABASE_URL = DATABASE_URL.replace("postgresql+psycopg://", "postgresql+asyncpg://")
-elif DATABASE_URL.startswith("postgresql+asyncpg://"):
-    ASYNC_DATABASE_URL = DATABASE_URL
-elif DATABASE_URL.startswith("sqlite+aiosqlite://"):
-    ASYNC_DATABASE_URL = DATABASE_URL
-elif DATABASE_URL.startswith("sqlite://"):
-    ASYNC_DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://")
+
+def to_async_url(url: str) -> Optional[str]:
+    """Normalize/derive the async driver URL; None for schemes we don't support."""
+    if url.startswith("postgresql+psycopg://"):
+        return url.replace("postgresql+psycopg://", "postgresql+asyncpg://")
+    if url.startswith("postgresql+asyncpg://") or url.startswith("sqlite+aiosqlite://"):
+        return url
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://")
+    return None
+
+
+# Unknown scheme → safe dev fallback
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL) or "sqlite+aiosqlite:///./hidden_messages_dev.db"
+
+# Optional replica for read-only endpoints (see get_read_db)
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+if DATABASE_READ_URL:
+    ASYNC_DATABASE_READ_URL = to_async_url(DATABASE_READ_URL)
+    if ASYNC_DATABASE_READ_URL is None:
+        raise ValueError(f"Unsupported DATABASE_READ_URL scheme: {DATABASE_READ_URL.split('://')[0]}")
 else:
-    # Unknown scheme → safe dev fallback
-    ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./hidden_messages_dev.db"
+    ASYNC_DATABASE_READ_URL = None
+# After writing a session, a client reads it from the primary for this long,
+# so replica lag never hides its own writes
+READ_STICKY_SECONDS = float(os.getenv("READ_STICKY_SECONDS", "5"))
+READ_STICKY_COOKIE = "hm_read_primary"
 
 Base = declarative_base()
 
+
+def utcnow() -> datetime:
+    """Python-side timestamp default.
+
+    SQLite's CURRENT_TIMESTAMP only has second resolution, which breaks
+    (created_at, id) keyset cursors; setting the value client-side keeps
+    microseconds on every backend.
+    """
+    return datetime.now(timezone.utc)
+
+
 # Set echo=False to reduce SQL query logging (can be enabled via env var for debugging)
 echo_sql = os.getenv("SQL_ECHO", "false").lower() == "true"
-engine = create_async_engine(ASYNC_DATABASE_URL, echo=echo_sql)
+
+# Connection pool; ignored for in-memory SQLite, which needs a single shared connection
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() == "true"
+# asyncpg prepared statement cache per connection; set to 0 behind pgbouncer in transaction mode
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+# File-backed SQLite: WAL with one writer connection and a separate pool of readers
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "20000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "4"))
+
+
+def is_sqlite_file(url: str) -> bool:
+    return url.startswith("sqlite") and ":memory:" not in url
+
+
+def engine_options(url: str, *, read_only: bool = False) -> dict:
+    """Pool and driver settings for `url` from the DB_* environment variables."""
+    if ":memory:" in url:
+        return {}
+    options = {
+        "poolclass": InstrumentedAsyncAdaptedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if url.startswith("sqlite"):
+        # SQLite admits one writer at a time. Giving the write engine a single
+        # connection turns contention into an orderly wait in the pool's queue
+        # instead of "database is locked"; WAL keeps readers off the writer's back.
+        # That connection serves every SessionLocal user (get_db, LLM event
+        # logging, the session store, rollup refresh, imports), so:
+        # - a transaction holds up all other writers until it commits; keep
+        #   write transactions short and never await a model call inside one
+        # - opening a second SessionLocal session while one in the same task
+        #   still holds the connection deadlocks until DB_POOL_TIMEOUT, then
+        #   raises sqlalchemy.exc.TimeoutError; commit or close the first one
+        #   before starting another
+        options["pool_size"] = SQLITE_READ_POOL_SIZE if read_only else 1
+        options["max_overflow"] = 0
+    if url.startswith("postgresql+asyncpg://"):
+        # asyncpg's own cache and SQLAlchemy's adapter-level one
+        options["connect_args"] = {
+            "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+
+def sqlite_pragmas(*, read_only: bool = False) -> list:
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        # Durable at checkpoints rather than every commit; safe with WAL
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}",
+        f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if read_only:
+        # A write through the read pool is a bug; fail it instead of racing the writer
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def configure_sqlite(engine, *, read_only: bool = False) -> None:
+    """Apply the SQLite pragmas to every new connection of `engine`."""
+    pragmas = sqlite_pragmas(read_only=read_only)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+engine = create_async_engine(ASYNC_DATABASE_URL, echo=echo_sql, **engine_options(ASYNC_DATABASE_URL))
+if is_sqlite_file(ASYNC_DATABASE_URL):
+    configure_sqlite(engine)
+if ASYNC_DATABASE_READ_URL:
+    read_engine = create_async_engine(
+        ASYNC_DATABASE_READ_URL, echo=echo_sql, **engine_options(ASYNC_DATABASE_READ_URL, read_only=True)
+    )
+    if is_sqlite_file(ASYNC_DATABASE_READ_URL):
+        configure_sqlite(read_engine, read_only=True)
+elif is_sqlite_file(ASYNC_DATABASE_URL):
+    # Same file, separate read-only connections
+    read_engine = create_async_engine(
+        ASYNC_DATABASE_URL, echo=echo_sql, **engine_options(ASYNC_DATABASE_URL, read_only=True)
+    )
+    configure_sqlite(read_engine, read_only=True)
+else:
+    read_engine = engine
+instrument_engine(engine)
+instrument_engine(read_engine)
 SessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+ReadSessionLocal = sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+
+# session id -> monotonic deadline of its read-your-writes window in this worker
+_recent_writes: Dict[str, float] = {}
+
+
+def mark_written(session_id, response: Optional[Response] = None) -> None:
+    """Route reads of `session_id` (and, via a cookie, all reads of this client) to the primary for a while.
+
+    The in-process entry covers clients that don't keep cookies as long as
+    they come back to the same worker; the cookie covers the rest.
+    """
+    if not ASYNC_DATABASE_READ_URL or READ_STICKY_SECONDS <= 0:
+        # No replica, no lag: the local SQLite read pool sees every commit
+        return
+    now = time.monotonic()
+    _recent_writes[str(session_id)] = now + READ_STICKY_SECONDS
+    if len(_recent_writes) > 10000:
+        for key in [key for key, deadline in _recent_writes.items() if deadline <= now]:
+            del _recent_writes[key]
+    if response is not None:
+        response.set_cookie(
+            READ_STICKY_COOKIE,
+            f"{time.time() + READ_STICKY_SECONDS:.3f}",
+            max_age=max(1, int(READ_STICKY_SECONDS + 0.999)),
+            httponly=True,
+            samesite="lax",
+        )
+
+
+def reads_from_primary(request: Request) -> bool:
+    """Whether this request falls inside a read-your-writes window."""
+    if not ASYNC_DATABASE_READ_URL:
+        return False
+    cookie = request.cookies.get(READ_STICKY_COOKIE)
+    if cookie:
+        try:
+            if float(cookie) > time.time():
+                return True
+        except ValueError:
+            pass
+    session_id = request.path_params.get("session_id")
+    deadline = _recent_writes.get(str(session_id)) if session_id is not None else None
+    return deadline is not None and deadline > time.monotonic()
+
+
+def reads_are_current(request: Request) -> bool:
+    """Whether get_read_db sees every commit for this request (no replica, or routed to the primary)."""
+    return not ASYNC_DATABASE_READ_URL or reads_from_primary(request)
+
 
 async def get_db():
     async with SessionLocal() as session:
@@ -36,6 +222,29 @@ async def get_db():
         finally:
             await session.close()
 
+
+async def get_read_db(request: Request):
+    """Session for endpoints that only read.
+
+    Served by the replica (DATABASE_READ_URL) or, on SQLite, by read-only
+    connections that never wait for the writer. Requests inside a
+    read-your-writes window go to the primary instead.
+    """
+    factory = SessionLocal if reads_from_primary(request) else ReadSessionLocal
+    async with factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+def get_read_sessionmaker(request: Request):
+    """Session factory picked like get_read_db, for responses that outlive the handler.
+
+    A streamed body is written after dependencies have been torn down, so
+    it opens (and closes) its own session from this factory.
+    """
+    return SessionLocal if reads_from_primary(request) else ReadSessionLocal
+
 Session = SessionLocal
 
 # Import model modules so they register with SQLAlchemy metadata during Base.metadata.create_all
@@ -44,6 +253,10 @@ try:
     from . import message  # noqa: F401
     from . import guess  # noqa: F401
     from . import llm_call_event  # noqa: F401
+    from . import llm_call_rollup  # noqa: F401
+    from . import session_event  # noqa: F401
+    from . import session_participant  # noqa: F401
+    from . import idempotency_key  # noqa: F401
 except ImportError:
     # Imports may fail during certain tooling operations; tables will still be available via migrations
     pass
\ No newline at end of file
@@ -1,8 +1,8 @@
-from sqlalchemy import Column, String, Text, Integer, Boolean, ForeignKey, Index
+from sqlalchemy import Column, DateTime, String, Text, Integer, Boolean, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
-from .database import Base
+from .database import Base, utcnow
 
 class GuessModel(Base):
     __tablename__ = "guesses"
@@ -15,7 +15,11 @@ class GuessModel(Base):
     correct = Column(Boolean, nullable=False)
     tries_remaining = Column(Integer, nullable=False)
 
+    # Change-feed position (with id); see app.api.changes
+    created_at = Column(DateTime(timezone=True), default=utcnow, nullable=True)
+
     __table_args__ = (
+        Index("ix_guesses_created_at_id", "created_at", "id"),
         Index("ix_guesses_session_turn", "session_id", "turn"),
     )
 
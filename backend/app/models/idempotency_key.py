@@ -0,0 +1,30 @@
+from sqlalchemy import Column, DateTime, Index, Integer, JSON, String
+
+from .database import Base, utcnow
+
+
+class IdempotencyKeyModel(Base):
+    """Outcome of a request sent with an Idempotency-Key header.
+
+    A row is inserted when a worker starts on the key (``status_code`` NULL,
+    held until ``locked_until``) and completed with the response it returned,
+    which duplicates are served until ``expires_at``.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    endpoint = Column(String(64), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response = Column(JSON, nullable=True)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), default=utcnow)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    def __repr__(self):
+        return f"<IdempotencyKey {self.key} {self.endpoint} {self.status_code}>"
@@ -2,19 +2,27 @@ from __future__ import annotations
 
 from typing import Optional
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, JSON, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, JSON, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
 
-from .database import Base
+from .database import Base, utcnow
 
 
 class LLMCallEventModel(Base):
     __tablename__ = "llm_call_events"
 
+    # Postgres range-partitions this table by month on created_at, and a
+    # partitioned table's primary key must include the partition column.
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        default=utcnow,
+        server_default=func.now(),
+        nullable=False,
+    )
 
     session_id = Column(UUID(as_uuid=True), ForeignKey("sessions.id", ondelete="SET NULL"), nullable=True)
     participant_id = Column(String(64), nullable=True)
@@ -42,6 +50,15 @@ class LLMCallEventModel(Base):
 
     context_snapshot = Column(JSON, nullable=True)
 
+    __table_args__ = (
+        Index("ix_llm_call_events_session_created_at", "session_id", "created_at"),
+        Index("ix_llm_call_events_created_at_id", "created_at", "id"),
+        Index("ix_llm_call_events_participant_created_at", "participant_id", "created_at"),
+        Index("ix_llm_call_events_provider_model_created_at", "provider", "model", "created_at"),
+        Index("ix_llm_call_events_status_created_at", "status", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
     def __repr__(self) -> str:
         parts = [self.id and str(self.id) or "<pending>"]
         if self.participant_id:
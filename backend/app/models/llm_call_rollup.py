@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, Integer, JSON, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+
+from .database import Base
+
+
+class LLMCallRollupModel(Base):
+    """Hourly aggregate of llm_call_events per provider/model/role/status.
+
+    `latency_buckets` holds counts aligned with `app.core.analytics.LATENCY_BUCKETS_MS`
+    (plus a trailing overflow bucket), so percentiles can be estimated from
+    merged rows without touching raw events.
+    """
+
+    __tablename__ = "llm_call_rollups"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    bucket_start = Column(DateTime(timezone=True), nullable=False)
+
+    provider = Column(String(32), nullable=False)
+    model = Column(String(128), nullable=False)
+    participant_role = Column(String(32), nullable=False)
+    status = Column(String(32), nullable=False)
+
+    call_count = Column(Integer, nullable=False, default=0)
+    latency_count = Column(Integer, nullable=False, default=0)
+    latency_sum_ms = Column(Integer, nullable=False, default=0)
+    latency_max_ms = Column(Integer, nullable=True)
+    latency_buckets = Column(JSON, nullable=False)
+
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    total_tokens = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint(
+            "bucket_start", "provider", "model", "participant_role", "status",
+            name="uq_llm_call_rollups_bucket_key",
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<LLMCallRollup {self.bucket_start} {self.provider}/{self.model} {self.participant_role} {self.status}: {self.call_count}>"
+
+
+class RollupWatermarkModel(Base):
+    """Position of the last raw event folded into a rollup table."""
+
+    __tablename__ = "rollup_watermarks"
+
+    name = Column(String(64), primary_key=True)
+    last_created_at = Column(DateTime(timezone=True), nullable=True)
+    last_event_id = Column(UUID(as_uuid=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self) -> str:
+        return f"<RollupWatermark {self.name}: {self.last_created_at} {self.last_event_id}>"
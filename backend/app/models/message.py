@@ -1,8 +1,8 @@
-from sqlalchemy import Column, String, Text, Integer, ForeignKey, Index
+from sqlalchemy import Column, DateTime, String, Text, Integer, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
-from .database import Base
+from .database import Base, utcnow
 
 class MessageModel(Base):
     __tablename__ = "messages"
@@ -14,7 +14,11 @@ class MessageModel(Base):
     comms = Column(Text, nullable=False)
     internal_thoughts = Column(Text, nullable=False)
 
+    # Change-feed position (with id); see app.api.changes
+    created_at = Column(DateTime(timezone=True), default=utcnow, nullable=True)
+
     __table_args__ = (
+        Index("ix_messages_created_at_id", "created_at", "id"),
         Index("ix_messages_session_turn", "session_id", "turn"),
     )
 
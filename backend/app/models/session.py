@@ -1,17 +1,38 @@
-from sqlalchemy import Column, String, Text, DateTime, JSON
-from sqlalchemy.sql import func
+from sqlalchemy import Boolean, Column, String, Text, DateTime, Integer, JSON, Index
+from sqlalchemy.sql import false, func
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
-from .database import Base
+from .database import Base, utcnow
 
 class SessionModel(Base):
     __tablename__ = "sessions"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
     topic = Column(Text, nullable=False)
     secret_word = Column(Text, nullable=False)
     participants = Column(JSON, nullable=False)  # {participant_id: {provider, role}}
 
+    # Summary maintained by next_turn in the same transaction as the turn's rows,
+    # so listing and status never have to recount messages/guesses.
+    turn_number = Column(Integer, nullable=False, default=1, server_default="1")  # next turn to play
+    message_count = Column(Integer, nullable=False, default=0, server_default="0")
+    tries_remaining = Column(JSON, nullable=True)  # {receiver_id: tries}
+    game_over = Column(Boolean, nullable=False, default=False, server_default=false())
+    game_status = Column(String(16), nullable=True)  # 'win' or 'loss'
+    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow, nullable=True)
+    # Lease on turn_number while a worker is playing it (see app.api.turn_guard):
+    # the holder's random token, and when it was taken for expiry
+    turn_token = Column(UUID(as_uuid=True), nullable=True)
+    turn_started_at = Column(DateTime(timezone=True), nullable=True)
+    # Set when messages, guesses and LLM events moved to the transcript archive
+    # (see app.core.session_archive); history is then read from there
+    archived_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_sessions_created_at_id", "created_at", "id"),
+        Index("ix_sessions_game_status_created_at", "game_status", "created_at"),
+    )
+
     def __repr__(self):
         return f"<Session {self.id}: {self.topic[:50]}>"
\ No newline at end of file
@@ -0,0 +1,47 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, JSON, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+from .database import Base, utcnow
+
+
+class SessionEventModel(Base):
+    """Append-only log of everything that changed a session's in-memory state.
+
+    `seq` is contiguous per session and defines replay order. `kind` is one of
+    'message' and 'system' (payload is the conversation-history entry) or
+    'guess' (payload carries participant_id, guess, correct, tries_remaining).
+    """
+
+    __tablename__ = "session_events"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    session_id = Column(UUID(as_uuid=True), ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False)
+    seq = Column(Integer, nullable=False)
+    turn = Column(Integer, nullable=False)
+    kind = Column(String(16), nullable=False)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=utcnow)
+
+    __table_args__ = (
+        # Doubles as the (session_id, seq) index replay reads through
+        UniqueConstraint("session_id", "seq", name="uq_session_events_session_seq"),
+    )
+
+    def __repr__(self):
+        return f"<SessionEvent {self.session_id} #{self.seq} T{self.turn} {self.kind}>"
+
+
+class SessionSnapshotModel(Base):
+    """Latest serialized SessionState of a session, covering events up to `last_seq`."""
+
+    __tablename__ = "session_snapshots"
+
+    session_id = Column(UUID(as_uuid=True), ForeignKey("sessions.id", ondelete="CASCADE"), primary_key=True)
+    last_seq = Column(Integer, nullable=False)
+    turn_number = Column(Integer, nullable=False)
+    state = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+
+    def __repr__(self):
+        return f"<SessionSnapshot {self.session_id} @#{self.last_seq} T{self.turn_number}>"
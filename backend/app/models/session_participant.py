@@ -0,0 +1,32 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+
+from .database import Base
+
+
+class SessionParticipantModel(Base):
+    """One row per participant of a session, mirroring ``sessions.participants``.
+
+    The JSON column stays the source for hydration; this table exists so
+    provider/model/role questions are answered through indexes instead of
+    scanning every session's blob.
+    """
+
+    __tablename__ = "session_participants"
+
+    session_id = Column(UUID(as_uuid=True), ForeignKey("sessions.id", ondelete="CASCADE"), primary_key=True)
+    participant_id = Column(String(64), primary_key=True)
+    provider = Column(String(32), nullable=False)
+    model = Column(String(128), nullable=True)  # resolved at start; unknown for some backfilled sessions
+    role = Column(String(16), nullable=False)
+    name = Column(Text, nullable=True)
+    order = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        # session_id last so filters can be answered from the index alone
+        Index("ix_session_participants_provider_role", "provider", "role", "session_id"),
+        Index("ix_session_participants_model_role", "model", "role", "session_id"),
+    )
+
+    def __repr__(self):
+        return f"<SessionParticipant {self.session_id}/{self.participant_id} {self.role} {self.provider}>"
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Allow running as `python scripts/archive_llm_events.py` from the backend directory
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.event_archive import (  # noqa: E402
+    RETENTION_MONTHS,
+    archive_llm_events,
+    ensure_event_partitions,
+)
+from app.models.database import engine  # noqa: E402
+
+
+async def run(args: argparse.Namespace) -> None:
+    async with engine.begin() as conn:
+        await ensure_event_partitions(conn)
+
+    results = await archive_llm_events(
+        engine,
+        output_dir=args.output_dir,
+        older_than_months=args.older_than_months,
+        fmt=args.format,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+    )
+    await engine.dispose()
+
+    if not results:
+        print("Nothing to archive")
+    for item in results:
+        action = "would archive" if args.dry_run else f"archived to {item.path}"
+        print(f"{item.month:%Y-%m}: {item.rows} rows {action}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Export llm_call_events months older than the retention window and drop them"
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path("archive"),
+        help="Directory for the exported files (default: ./archive)",
+    )
+    parser.add_argument(
+        "--older-than-months",
+        type=int,
+        default=RETENTION_MONTHS,
+        help=f"Keep this many full months hot (default: {RETENTION_MONTHS})",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["jsonl", "parquet"],
+        default="jsonl",
+        help="jsonl writes .jsonl.gz; parquet requires pyarrow (default: jsonl)",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per read/delete batch")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be archived")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
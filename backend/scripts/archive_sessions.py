@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Allow running as `python scripts/archive_sessions.py` from the backend directory
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.session_archive import (  # noqa: E402
+    SESSION_ARCHIVE_AFTER_DAYS,
+    SESSION_ARCHIVE_BATCH_SIZE,
+    archive_sessions,
+)
+from app.core.transcript_store import TRANSCRIPT_ARCHIVE_DIR, TranscriptStore  # noqa: E402
+from app.models.database import engine  # noqa: E402
+
+
+async def run(args: argparse.Namespace) -> None:
+    store = TranscriptStore(args.archive_dir)
+    report = await archive_sessions(
+        engine,
+        store,
+        older_than_days=args.older_than_days,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+    )
+    await engine.dispose()
+    store.close()
+
+    action = "would archive" if args.dry_run else f"archived to {args.archive_dir}"
+    print(
+        f"{report.sessions} sessions ({report.messages} messages, {report.guesses} guesses, "
+        f"{report.llm_call_events} LLM call events) {action}"
+    )
+    if not args.dry_run:
+        print(f"{report.bytes_written} bytes appended")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Move finished sessions into the transcript store and delete their hot rows"
+    )
+    parser.add_argument(
+        "--archive-dir",
+        type=Path,
+        default=Path(TRANSCRIPT_ARCHIVE_DIR),
+        help=f"Transcript store directory; the API must read the same one (default: {TRANSCRIPT_ARCHIVE_DIR})",
+    )
+    parser.add_argument(
+        "--older-than-days",
+        type=int,
+        default=SESSION_ARCHIVE_AFTER_DAYS,
+        help=f"Archive games finished more than this many days ago (default: {SESSION_ARCHIVE_AFTER_DAYS})",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=SESSION_ARCHIVE_BATCH_SIZE, help="Sessions per write/delete batch"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be archived")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
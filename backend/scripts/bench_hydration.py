@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Measure cold-session latency and query counts for /next-turn and /status.
+
+Seeds a throwaway SQLite database, evicts each session from memory before the
+request and runs the app in-process with the model calls stubbed out, so the
+numbers reflect only hydration and persistence.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+# Allow running as `python scripts/bench_hydration.py` from the backend directory
+sys.path.append(str(Path(__file__).parent.parent))
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.api.hydration import participants_from_meta  # noqa: E402
+from app.api.routes import agent_manager  # noqa: E402
+from app.api.session_log import SNAPSHOT_EVERY  # noqa: E402
+from app.api.session_state import SessionState, active_sessions  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import (  # noqa: E402
+    Base,
+    MessageModel,
+    SessionEventModel,
+    SessionModel,
+    SessionSnapshotModel,
+    get_db,
+    get_read_db,
+)
+
+THOUGHTS = "Considering how to weave the word in without being obvious. " * 20
+
+
+async def seed(session_factory, sessions: int, turns: int) -> list:
+    ids = []
+    async with session_factory() as db:
+        for _ in range(sessions):
+            participants = {
+                "comm": {"provider": "openai", "role": "communicator", "name": "Alpha"},
+                "recv": {"provider": "anthropic", "role": "receiver", "name": "Beta"},
+                "byst": {"provider": "google-gla", "role": "bystander", "name": "Gamma"},
+            }
+            session = SessionModel(
+                id=uuid4(),
+                topic="benchmarking",
+                secret_word="horizon",
+                participants=participants,
+                turn_number=turns + 1,
+                message_count=turns * 3,
+                tries_remaining={"recv": 3},
+            )
+            db.add(session)
+            # Mirror what next_turn writes: messages, their events and a
+            # snapshot every SNAPSHOT_EVERY turns
+            history = []
+            for turn in range(1, turns + 1):
+                if (turn - 1) % SNAPSHOT_EVERY == 0:
+                    snapshot = (len(history), turn, list(history))
+                for pid, meta in participants.items():
+                    comms = f"Turn {turn} contribution from {pid}"
+                    db.add(MessageModel(
+                        session_id=session.id,
+                        turn=turn,
+                        participant_id=pid,
+                        comms=comms,
+                        internal_thoughts=THOUGHTS,
+                    ))
+                    history.append({"participant_id": pid, "comms": comms, "participant_name": meta["name"]})
+                    db.add(SessionEventModel(
+                        session_id=session.id, seq=len(history), turn=turn, kind="message", payload=history[-1],
+                    ))
+            if turns % SNAPSHOT_EVERY == 0:
+                snapshot = (len(history), turns + 1, list(history))
+            last_seq, snapshot_turn, snapshot_history = snapshot
+            state = SessionState(
+                session_id=session.id,
+                topic=session.topic,
+                secret_word=session.secret_word,
+                participants=participants_from_meta(participants),
+                conversation_history=snapshot_history,
+                turn_number=snapshot_turn,
+                tries_remaining={"recv": 3},
+            )
+            db.add(SessionSnapshotModel(
+                session_id=session.id, last_seq=last_seq, turn_number=snapshot_turn, state=state.to_dict(),
+            ))
+            ids.append(session.id)
+        await db.commit()
+    return ids
+
+
+def summarize(label: str, timings: list, queries: list) -> None:
+    timings = sorted(timings)
+    p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+    print(
+        f"{label:<12} median={statistics.median(timings):7.2f}ms  p95={p95:7.2f}ms  "
+        f"queries/request={statistics.mean(queries):.1f}"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *a: statements.append(1))
+
+        async def override_get_db():
+            async with session_factory() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_read_db] = override_get_db
+        # One extra session per endpoint absorbs first-request warm-up costs
+        status_ids = await seed(session_factory, args.sessions + 1, args.turns)
+        turn_ids = await seed(session_factory, args.sessions + 1, args.turns)
+
+        turn_result = {
+            "messages": [{"participant_id": "byst", "comms": "ok", "internal_thoughts": "ok", "guess": None}],
+            "errors": [],
+        }
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            with patch.object(agent_manager, "initialize_agents", AsyncMock(return_value="horizon")), \
+                    patch.object(agent_manager, "run_conversation_turn", AsyncMock(return_value=turn_result)):
+                for label, ids, call in (
+                    ("status", status_ids, lambda sid: client.get(f"/api/session/{sid}/status")),
+                    ("next-turn", turn_ids, lambda sid: client.post("/api/next-turn", json={"session_id": str(sid)})),
+                ):
+                    timings, queries = [], []
+                    for sid in ids:
+                        active_sessions.clear()
+                        statements.clear()
+                        start = time.perf_counter()
+                        response = await call(sid)
+                        timings.append((time.perf_counter() - start) * 1000)
+                        queries.append(len(statements))
+                        response.raise_for_status()
+                    summarize(label, timings[1:], queries[1:])
+
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark cold-session hydration")
+    parser.add_argument("--sessions", type=int, default=50, help="Sessions per endpoint (default: 50)")
+    parser.add_argument("--turns", type=int, default=40, help="Turns of history per session (default: 40)")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
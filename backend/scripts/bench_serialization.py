@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Compare bytes on the wire and serialization CPU for the history response.
+
+"before" builds SessionHistoryResponse with a Pydantic model per message and
+encodes it with model_dump_json, uncompressed (the previous code path).
+"after" builds plain dicts, encodes them with app.api.serialization.dumps
+(orjson when installed) and compresses as http_cache would. MessagePack and
+brotli rows are printed only when those optional packages are installed.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from uuid import uuid4
+
+# Allow running as `python scripts/bench_serialization.py` from the backend directory
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.api import http_cache, serialization  # noqa: E402
+from app.api.schemas import SessionHistoryMessage, SessionHistoryResponse  # noqa: E402
+
+THOUGHTS = "Considering how to weave the word in without being obvious. " * 20
+
+PARTICIPANTS = {
+    "comm": {"provider": "openai", "role": "communicator", "name": "Alpha"},
+    "recv": {"provider": "anthropic", "role": "receiver", "name": "Beta"},
+    "byst": {"provider": "google-gla", "role": "bystander", "name": "Gamma"},
+}
+
+
+def make_rows(turns: int) -> list:
+    return [
+        {"turn": turn, "participant_id": pid, "comms": f"Turn {turn} contribution from {pid}", "internal_thoughts": THOUGHTS}
+        for turn in range(1, turns + 1)
+        for pid in PARTICIPANTS
+    ]
+
+
+def render_before(session_id, created_at, rows) -> bytes:
+    return SessionHistoryResponse(
+        session_id=session_id,
+        topic="benchmarking",
+        secret_word="horizon",
+        created_at=created_at,
+        participants=PARTICIPANTS,
+        messages=[
+            SessionHistoryMessage(
+                participant_name=PARTICIPANTS[row["participant_id"]]["name"],
+                participant_role=PARTICIPANTS[row["participant_id"]]["role"],
+                **row,
+            )
+            for row in rows
+        ],
+        guesses=[],
+        latest_turn=len(rows) // len(PARTICIPANTS),
+    ).model_dump_json().encode("utf-8")
+
+
+def render_after(session_id, created_at, rows) -> bytes:
+    return serialization.dumps({
+        "session_id": session_id,
+        "topic": "benchmarking",
+        "secret_word": "horizon",
+        "created_at": created_at,
+        "participants": PARTICIPANTS,
+        "messages": [
+            {
+                "turn": row["turn"],
+                "participant_id": row["participant_id"],
+                "participant_name": PARTICIPANTS[row["participant_id"]]["name"],
+                "participant_role": PARTICIPANTS[row["participant_id"]]["role"],
+                "comms": row["comms"],
+                "internal_thoughts": row["internal_thoughts"],
+            }
+            for row in rows
+        ],
+        "guesses": [],
+        "latest_turn": len(rows) // len(PARTICIPANTS),
+    })
+
+
+def measure(label: str, render, repeat: int) -> None:
+    timings = []
+    for _ in range(repeat):
+        start = time.process_time()
+        body = render()
+        timings.append((time.process_time() - start) * 1000)
+    print(f"{label:<24} bytes={len(body):>9}  cpu median={statistics.median(timings):7.2f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark history serialization and compression")
+    parser.add_argument("--turns", type=int, default=200, help="Turns of history (default: 200)")
+    parser.add_argument("--repeat", type=int, default=30, help="Renders per variant (default: 30)")
+    args = parser.parse_args()
+
+    session_id, created_at = uuid4(), datetime.now(timezone.utc)
+    rows = make_rows(args.turns)
+    json_body = render_after(session_id, created_at, rows)
+    print(f"orjson={'yes' if serialization.orjson else 'no'}  messages={len(rows)}")
+
+    measure("before: pydantic", lambda: render_before(session_id, created_at, rows), args.repeat)
+    measure("after: dicts", lambda: render_after(session_id, created_at, rows), args.repeat)
+    measure(
+        "after: dicts + gzip",
+        lambda: http_cache.compress(render_after(session_id, created_at, rows), "gzip"),
+        args.repeat,
+    )
+    if http_cache.brotli is not None:
+        measure(
+            "after: dicts + br",
+            lambda: http_cache.compress(render_after(session_id, created_at, rows), "br"),
+            args.repeat,
+        )
+    if serialization.msgpack is not None:
+        measure("after: msgpack", lambda: serialization.json_to_msgpack(json_body), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Allow running as `python scripts/export_data.py` from the backend directory
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.export import (  # noqa: E402
+    EXPORT_BATCH_SIZE,
+    EXPORT_TABLES,
+    SESSION_STATUSES,
+    ExportFilters,
+    export_tables,
+)
+from app.models.database import read_engine  # noqa: E402
+
+
+async def run(args: argparse.Namespace) -> None:
+    filters = ExportFilters(
+        created_after=args.created_after,
+        created_before=args.created_before,
+        provider=args.provider,
+        status=args.status,
+    )
+    results = await export_tables(
+        read_engine,
+        args.output_dir,
+        tables=args.tables,
+        filters=filters,
+        fmt=args.format,
+        batch_size=args.batch_size,
+    )
+    await read_engine.dispose()
+
+    for item in results:
+        print(f"{item.table}: {item.rows} rows to {item.path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Export sessions, messages, guesses and llm_call_events for analysis in DuckDB or pandas"
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path("export"),
+        help="Directory for the exported files (default: ./export)",
+    )
+    parser.add_argument(
+        "--tables",
+        nargs="+",
+        choices=EXPORT_TABLES,
+        default=list(EXPORT_TABLES),
+        help="Tables to export (default: all)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["jsonl", "parquet"],
+        default="parquet",
+        help="parquet requires pyarrow and falls back to .jsonl.gz without it (default: parquet)",
+    )
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE, help="Rows per read/write batch")
+    parser.add_argument("--created-after", type=datetime.fromisoformat, help="ISO date or datetime, inclusive")
+    parser.add_argument("--created-before", type=datetime.fromisoformat, help="ISO date or datetime, exclusive")
+    parser.add_argument("--provider", help="Sessions with a participant from this provider, and its events")
+    parser.add_argument("--status", choices=SESSION_STATUSES, help="Game outcome of the exported sessions")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Allow running as `python scripts/import_data.py` from the backend directory
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.data_import import IMPORT_BATCH_SIZE, import_tables  # noqa: E402
+from app.core.export import EXPORT_TABLES  # noqa: E402
+from app.models import Base  # noqa: E402
+from app.models.database import engine  # noqa: E402
+
+
+def show_progress(report) -> None:
+    print(
+        f"\r{report.table}: {report.rows_read} rows ({report.rows_per_second:,.0f} rows/s)",
+        end="",
+        flush=True,
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    if args.create_tables:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    results = await import_tables(
+        engine,
+        args.input_dir,
+        tables=args.tables,
+        batch_size=args.batch_size,
+        progress=show_progress,
+    )
+    await engine.dispose()
+
+    print()
+    for item in results:
+        if not item.files:
+            print(f"{item.table}: no files")
+            continue
+        print(
+            f"{item.table}: {item.rows_read} rows from {len(item.files)} file(s), "
+            f"{item.rows_inserted} inserted, {item.rows_skipped} already present, "
+            f"{item.seconds:.1f}s ({item.rows_per_second:,.0f} rows/s)"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Load files from scripts/export_data.py or scripts/archive_llm_events.py into the database"
+    )
+    parser.add_argument("input_dir", type=Path, help="Directory holding the exported files")
+    parser.add_argument(
+        "--tables",
+        nargs="+",
+        choices=EXPORT_TABLES,
+        default=list(EXPORT_TABLES),
+        help="Tables to import (default: all); parents are always loaded first",
+    )
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="Rows per insert/commit")
+    parser.add_argument(
+        "--create-tables",
+        action="store_true",
+        help="Create missing tables first (for an empty SQLite database; use alembic on Postgres)",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Allow running as `python scripts/refresh_rollups.py` from the backend directory
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.analytics import refresh_rollups  # noqa: E402
+from app.models.database import SessionLocal, engine  # noqa: E402
+
+
+async def run(args: argparse.Namespace) -> None:
+    async with SessionLocal() as session:
+        folded = await refresh_rollups(session, batch_size=args.batch_size)
+    await engine.dispose()
+    print(f"Folded {folded} llm_call_events into rollups")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Fold new llm_call_events into the hourly analytics rollups (for cron when ROLLUP_REFRESH_SECONDS=0)"
+    )
+    parser.add_argument("--batch-size", type=int, default=5000, help="Events per committed batch")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
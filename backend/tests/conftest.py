@@ -4,8 +4,11 @@ import pytest_asyncio
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from typing import AsyncGenerator
+from unittest.mock import patch
 from uuid import uuid4
+from httpx import AsyncClient, ASGITransport
 
+from app.api.response_cache import InMemoryResponseCache
 from app.models.database import Base
 from app.agents.schemas import AgentOutput
 
@@ -41,6 +44,30 @@ async def db_session(db_engine) -> AsyncGenerator[AsyncSession, None]:
         await session.rollback()
 
 
+@pytest_asyncio.fixture
+async def client(db_engine, db_session):
+    """Create test client with database override"""
+    from app.main import app
+    from app.models.database import get_db, get_read_db, get_read_sessionmaker
+
+    async def override_get_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_read_sessionmaker] = lambda: sessionmaker(
+        db_engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    # Cached responses must not leak between tests' databases
+    transport = ASGITransport(app=app)
+    with patch("app.api.routes.response_cache", InMemoryResponseCache()):
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            yield ac
+
+    app.dependency_overrides.clear()
+
+
 @pytest.fixture
 def mock_agent_output():
     """Factory for creating mock AgentOutput responses"""
@@ -109,3 +136,55 @@ def mock_conversation_history():
             "comms": "I agree, reaching new frontiers is exciting."
         }
     ]
+
+
+class FakeRedis:
+    """In-process stand-in for the subset of redis.asyncio.Redis the app uses"""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    async def get(self, name):
+        return self.data.get(name)
+
+    async def set(self, name, value, ex=None):
+        self.data[name] = value if isinstance(value, bytes) else str(value).encode()
+        self.expiry[name] = ex
+        return True
+
+    async def delete(self, *names):
+        removed = 0
+        for name in names:
+            name = name.decode() if isinstance(name, bytes) else name
+            removed += self.data.pop(name, None) is not None
+            self.expiry.pop(name, None)
+        return removed
+
+    async def hget(self, name, key):
+        return self.data.get(name, {}).get(key)
+
+    async def hset(self, name, key, value):
+        self.data.setdefault(name, {})[key] = value if isinstance(value, bytes) else str(value).encode()
+        return 1
+
+    async def sadd(self, name, *values):
+        members = self.data.setdefault(name, set())
+        before = len(members)
+        members.update(v if isinstance(v, bytes) else str(v).encode() for v in values)
+        return len(members) - before
+
+    async def smembers(self, name):
+        return set(self.data.get(name, set()))
+
+    async def expire(self, name, seconds):
+        if name not in self.data:
+            return False
+        self.expiry[name] = seconds
+        return True
+
+
+@pytest.fixture
+def fake_redis():
+    """Empty in-process Redis stand-in"""
+    return FakeRedis()
@@ -0,0 +1,152 @@
+"""Tests for incremental llm_call_events rollups and the analytics endpoint"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.analytics import (
+    LATENCY_BUCKETS_MS,
+    bucket_index,
+    estimate_percentile,
+    refresh_rollups,
+    refresh_rollups_periodically,
+)
+from app.models import LLMCallEventModel, LLMCallRollupModel, RollupWatermarkModel
+
+
+def _event(created_at, *, provider="openai", role="communicator", status="success", latency_ms=300, tokens=10):
+    return LLMCallEventModel(
+        created_at=created_at,
+        provider=provider,
+        model=f"{provider}:test",
+        participant_role=role,
+        status=status,
+        latency_ms=latency_ms,
+        prompt_tokens=tokens,
+        completion_tokens=tokens,
+        total_tokens=tokens * 2,
+    )
+
+
+@pytest.mark.unit
+class TestHistogramHelpers:
+    """Test latency histogram bucketing and percentile estimates"""
+
+    def test_bucket_index_bounds(self):
+        assert bucket_index(0) == 0
+        assert bucket_index(LATENCY_BUCKETS_MS[0]) == 0
+        assert bucket_index(LATENCY_BUCKETS_MS[0] + 1) == 1
+        assert bucket_index(10**9) == len(LATENCY_BUCKETS_MS)
+
+    def test_estimate_percentile(self):
+        buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        buckets[bucket_index(90)] = 9
+        buckets[bucket_index(4000)] = 1
+        assert estimate_percentile(buckets, 0.5) == 100
+        assert estimate_percentile(buckets, 0.99, max_ms=4000) == 4000
+        assert estimate_percentile([0, 0], 0.5) is None
+
+
+@pytest.mark.integration
+class TestRefreshRollups:
+    """Test watermark-based incremental rollup maintenance"""
+
+    @pytest.mark.asyncio
+    async def test_refresh_is_incremental(self, db_session):
+        hour = datetime(2026, 5, 1, 10, tzinfo=timezone.utc)
+        now = hour + timedelta(days=1)
+        db_session.add_all([
+            _event(hour + timedelta(minutes=1), latency_ms=200),
+            _event(hour + timedelta(minutes=2), latency_ms=800),
+            _event(hour + timedelta(minutes=3), status="error", latency_ms=50),
+        ])
+        await db_session.commit()
+
+        assert await refresh_rollups(db_session, batch_size=2, now=now) == 3
+        assert await refresh_rollups(db_session, now=now) == 0
+
+        db_session.add(_event(hour + timedelta(minutes=30), latency_ms=100))
+        await db_session.commit()
+        assert await refresh_rollups(db_session, now=now) == 1
+
+        rows = (await db_session.execute(select(LLMCallRollupModel))).scalars().all()
+        by_status = {r.status: r for r in rows}
+        assert set(by_status) == {"success", "error"}
+        success = by_status["success"]
+        assert success.call_count == 3
+        assert success.latency_sum_ms == 1100
+        assert success.total_tokens == 60
+        assert sum(success.latency_buckets) == 3
+
+    @pytest.mark.asyncio
+    async def test_refresh_skips_events_inside_lag_window(self, db_session):
+        now = datetime(2026, 5, 1, 12, tzinfo=timezone.utc)
+        db_session.add(_event(now - timedelta(seconds=1)))
+        await db_session.commit()
+
+        assert await refresh_rollups(db_session, now=now) == 0
+
+    @pytest.mark.asyncio
+    async def test_periodic_refresh_uses_its_own_sessions(self, db_engine, db_session):
+        db_session.add(_event(datetime.now(timezone.utc) - timedelta(hours=1)))
+        await db_session.commit()
+
+        task = asyncio.create_task(refresh_rollups_periodically(
+            sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False), interval=0.01
+        ))
+        try:
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if (await db_session.execute(select(LLMCallRollupModel))).first():
+                    break
+        finally:
+            task.cancel()
+
+        rows = (await db_session.execute(select(LLMCallRollupModel))).scalars().all()
+        assert [r.call_count for r in rows] == [1]
+
+
+@pytest.mark.integration
+class TestAnalyticsEndpoint:
+    """Test /api/analytics/llm-calls"""
+
+    @pytest.mark.asyncio
+    async def test_grouped_by_provider(self, client, db_session):
+        base = datetime.now(timezone.utc) - timedelta(hours=2)
+        db_session.add_all([
+            _event(base, provider="openai", latency_ms=200),
+            _event(base, provider="openai", status="error", latency_ms=None),
+            _event(base, provider="anthropic", latency_ms=1200),
+        ])
+        await db_session.commit()
+        await refresh_rollups(db_session)
+
+        response = await client.get("/api/analytics/llm-calls", params={"group_by": "provider"})
+
+        assert response.status_code == 200
+        items = {item["provider"]: item for item in response.json()["items"]}
+        assert items["openai"]["calls"] == 2
+        assert items["openai"]["errors"] == 1
+        assert items["openai"]["error_rate"] == 0.5
+        assert items["anthropic"]["latency_p50_ms"] == 1200
+        assert items["anthropic"]["total_tokens"] == 20
+
+    @pytest.mark.asyncio
+    async def test_reads_do_not_refresh(self, client, db_session):
+        """Test the endpoint answers from existing rollups and leaves folding to the background refresh"""
+        db_session.add(_event(datetime.now(timezone.utc) - timedelta(hours=2)))
+        await db_session.commit()
+
+        response = await client.get("/api/analytics/llm-calls")
+
+        assert response.status_code == 200
+        assert response.json()["items"] == []
+        assert await db_session.get(RollupWatermarkModel, "llm_call_rollups") is None
+
+    @pytest.mark.asyncio
+    async def test_unknown_group_by_rejected(self, client):
+        response = await client.get("/api/analytics/llm-calls", params={"group_by": "colour"})
+        assert response.status_code == 422
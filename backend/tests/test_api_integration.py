@@ -1,34 +1,16 @@
 """Integration tests for API endpoints"""
 import pytest
-import pytest_asyncio
-from httpx import AsyncClient, ASGITransport
 from unittest.mock import AsyncMock, Mock, patch
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from app.main import app
-from app.models import SessionModel, MessageModel, GuessModel
+from app.models import SessionModel, MessageModel, GuessModel, SessionParticipantModel
 from app.api.session_state import SessionState, active_sessions
 from app.api.routes import agent_manager
+from app.agents import default_model
 from app.agents.schemas import AgentOutput
 
 
-@pytest_asyncio.fixture
-async def client(db_session):
-    """Create test client with database override"""
-    from app.models.database import get_db
-    
-    async def override_get_db():
-        yield db_session
-    
-    app.dependency_overrides[get_db] = override_get_db
-    
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as ac:
-        yield ac
-    
-    app.dependency_overrides.clear()
-
-
 @pytest.mark.integration
 class TestHealthEndpoint:
     """Test health check endpoint"""
@@ -120,6 +102,30 @@ class TestStartSessionEndpoint:
             
             assert response.status_code == 200
 
+    @pytest.mark.asyncio
+    async def test_start_session_writes_participant_rows(self, client, db_session):
+        """Test participants are stored one row each for indexed filtering"""
+        from sqlalchemy import select
+
+        with patch('app.agents.agent_manager.HiddenMessageAgent.initialize_agents') as mock_init:
+            mock_init.return_value = "horizon"
+            response = await client.post("/api/start-session", json={"topic": "rivers"})
+
+        assert response.status_code == 200
+        session_id = UUID(response.json()["session_id"])
+        rows = (await db_session.execute(
+            select(SessionParticipantModel)
+            .where(SessionParticipantModel.session_id == session_id)
+            .order_by(SessionParticipantModel.order)
+        )).scalars().all()
+        assert [(r.provider, r.role, r.order) for r in rows] == [
+            ("openai", "communicator", 0),
+            ("anthropic", "receiver", 1),
+            ("google-gla", "bystander", 2),
+        ]
+        assert rows[0].model == default_model("openai")
+        assert {r.participant_id for r in rows} == {p["id"] for p in response.json()["participants"]}
+
     @pytest.mark.asyncio
     async def test_start_session_invalid_topic(self, client):
         """Test that empty topic is rejected"""
@@ -180,6 +186,7 @@ class TestNextTurnEndpoint:
                 }
                 for p in sample_session_data["participants"]
             },
+            turn_number=3,
         )
         db_session.add(session)
         await db_session.commit()
@@ -434,6 +441,81 @@ class TestNextTurnEndpoint:
                     assert data["game_over"] is True
                     assert data["game_status"] == "loss"
 
+    @pytest.mark.asyncio
+    async def test_next_turn_updates_session_summary(self, client, db_session, sample_session_data):
+        """Test that each turn keeps the denormalized session summary in step"""
+        session = SessionModel(
+            topic=sample_session_data["topic"],
+            secret_word=sample_session_data["secret_word"],
+            participants={
+                p["id"]: {"provider": p["provider"], "role": p["role"], "name": p["name"]}
+                for p in sample_session_data["participants"]
+            }
+        )
+        db_session.add(session)
+        await db_session.commit()
+
+        communicator_id = sample_session_data["participants"][0]["id"]
+        receiver_id = sample_session_data["participants"][1]["id"]
+
+        try:
+            with patch('app.api.routes.agent_manager') as mock_manager:
+                mock_manager.initialize_agents = AsyncMock(return_value=sample_session_data["secret_word"])
+                mock_manager.run_conversation_turn = AsyncMock(return_value={
+                    "messages": [
+                        {"participant_id": communicator_id, "comms": "Look at the horizon", "internal_thoughts": "hint", "guess": None},
+                        {"participant_id": receiver_id, "comms": "Is it sunset?", "internal_thoughts": "guessing", "guess": "sunset"},
+                    ],
+                    "errors": []
+                })
+                response = await client.post("/api/next-turn", json={"session_id": str(session.id)})
+            assert response.status_code == 200
+
+            await db_session.refresh(session)
+            assert session.turn_number == 2
+            assert session.message_count == 2
+            assert session.tries_remaining == {receiver_id: 2}
+            assert session.game_over is False
+
+            # A cold status read is answered from the summary alone
+            active_sessions.pop(session.id, None)
+            status = (await client.get(f"/api/session/{session.id}/status")).json()
+            assert status["turn_number"] == 2
+            assert status["tries_remaining"] == {receiver_id: 2}
+        finally:
+            active_sessions.pop(session.id, None)
+
+    @pytest.mark.asyncio
+    async def test_next_turn_rejects_finished_session_after_restart(self, client, db_session, sample_session_data):
+        """Test that a finished game hydrated from the DB cannot be continued"""
+        receiver_id = sample_session_data["participants"][1]["id"]
+        session = SessionModel(
+            topic=sample_session_data["topic"],
+            secret_word=sample_session_data["secret_word"],
+            participants={
+                p["id"]: {"provider": p["provider"], "role": p["role"], "name": p["name"]}
+                for p in sample_session_data["participants"]
+            },
+            turn_number=4,
+            message_count=3,
+            tries_remaining={receiver_id: 2},
+            game_over=True,
+            game_status="win",
+        )
+        db_session.add(session)
+        await db_session.commit()
+
+        try:
+            with patch('app.api.routes.agent_manager') as mock_manager:
+                mock_manager.initialize_agents = AsyncMock(return_value=sample_session_data["secret_word"])
+                mock_manager.run_conversation_turn = AsyncMock()
+                response = await client.post("/api/next-turn", json={"session_id": str(session.id)})
+
+            assert response.status_code == 400
+            mock_manager.run_conversation_turn.assert_not_awaited()
+        finally:
+            active_sessions.pop(session.id, None)
+
     @pytest.mark.asyncio
     async def test_next_turn_all_agents_fail(self, client, db_session, sample_session_data):
         """Test handling when all agents fail to respond"""
@@ -467,6 +549,86 @@ class TestNextTurnEndpoint:
             assert "failed" in response.json()["detail"].lower()
 
 
+@pytest.mark.integration
+class TestSessionEventLog:
+    """Test that turns are persisted as events and replayed on hydration"""
+
+    async def _play(self, client, session_id, messages):
+        with patch('app.api.routes.agent_manager') as mock_manager:
+            mock_manager.initialize_agents = AsyncMock(return_value="horizon")
+            mock_manager.run_conversation_turn = AsyncMock(return_value={"messages": messages, "errors": []})
+            response = await client.post("/api/next-turn", json={"session_id": str(session_id)})
+        assert response.status_code == 200
+        return mock_manager.run_conversation_turn.await_args.kwargs
+
+    @pytest.mark.asyncio
+    async def test_guess_feedback_survives_restart(self, client, db_session, sample_session_data):
+        """Test that [System] guess feedback is still in the history after eviction"""
+        session = SessionModel(
+            topic=sample_session_data["topic"],
+            secret_word=sample_session_data["secret_word"],
+            participants={
+                p["id"]: {"provider": p["provider"], "role": p["role"], "name": p["name"]}
+                for p in sample_session_data["participants"]
+            }
+        )
+        db_session.add(session)
+        await db_session.commit()
+        receiver_id = sample_session_data["participants"][1]["id"]
+
+        try:
+            await self._play(client, session.id, [
+                {"participant_id": receiver_id, "comms": "Sunset?", "internal_thoughts": "guess", "guess": "sunset"},
+            ])
+            expected = list(active_sessions[session.id].conversation_history)
+            active_sessions.pop(session.id)
+
+            kwargs = await self._play(client, session.id, [
+                {"participant_id": receiver_id, "comms": "Hmm", "internal_thoughts": "think", "guess": None},
+            ])
+            assert kwargs["conversation_history"][:len(expected)] == expected
+            assert expected[0] == {
+                "participant_id": "system",
+                "comms": "Guess from Bob: 'sunset'. Result: Incorrect.",
+            }
+            assert kwargs["turn_number"] == 2
+            assert kwargs["tries_remaining"] == {receiver_id: 2}
+        finally:
+            active_sessions.pop(session.id, None)
+
+    @pytest.mark.asyncio
+    async def test_hydration_replays_from_latest_snapshot(self, client, db_session, sample_session_data):
+        """Test hydration starts at the latest snapshot and replays only later events"""
+        from app.api import session_log
+        from app.api.hydration import load_session_state
+        from app.models import SessionSnapshotModel
+
+        with patch('app.api.routes.agent_manager') as mock_manager:
+            mock_manager.initialize_agents = AsyncMock(return_value="horizon")
+            response = await client.post("/api/start-session", json={"topic": "space exploration"})
+        session_id = UUID(response.json()["session_id"])
+        participant_id = response.json()["participants"][0]["id"]
+
+        try:
+            with patch.object(session_log, "SNAPSHOT_EVERY", 2):
+                for turn in range(1, 4):
+                    await self._play(client, session_id, [
+                        {"participant_id": participant_id, "comms": f"turn {turn}", "internal_thoughts": "", "guess": None},
+                    ])
+            live = active_sessions.pop(session_id)
+
+            snapshot = await db_session.get(SessionSnapshotModel, session_id)
+            assert snapshot.turn_number == 3
+            assert len(snapshot.state["conversation_history"]) == 2
+
+            loaded = await load_session_state(db_session, session_id)
+            assert loaded.to_dict() == live.to_dict()
+            assert loaded.event_seq == live.event_seq == 3
+            assert loaded.snapshot_turn == 3
+        finally:
+            active_sessions.pop(session_id, None)
+
+
 @pytest.mark.integration
 class TestSessionStatusEndpoint:
     """Test session status retrieval"""
@@ -515,6 +677,44 @@ class TestSessionStatusEndpoint:
         assert data["game_over"] is False
         assert receiver_id in data["tries_remaining"]
 
+    @pytest.mark.asyncio
+    async def test_cold_status_hydrates_in_one_query(self, client, db_session, db_engine, sample_session_data):
+        """Test a session missing from memory is restored from its summary row in one query"""
+        from sqlalchemy import event
+
+        receiver_id = sample_session_data["participants"][1]["id"]
+        session = SessionModel(
+            topic=sample_session_data["topic"],
+            secret_word=sample_session_data["secret_word"],
+            participants={
+                p["id"]: {"provider": p["provider"], "role": p["role"], "name": p["name"], "order": p["order"]}
+                for p in sample_session_data["participants"]
+            },
+            turn_number=4,
+            tries_remaining={receiver_id: 1},
+        )
+        db_session.add(session)
+        await db_session.commit()
+        active_sessions.pop(session.id, None)
+
+        statements = []
+
+        def _count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db_engine.sync_engine, "before_cursor_execute", _count)
+        try:
+            response = await client.get(f"/api/session/{session.id}/status")
+        finally:
+            event.remove(db_engine.sync_engine, "before_cursor_execute", _count)
+
+        assert response.status_code == 200
+        assert len(statements) == 1
+        data = response.json()
+        assert data["turn_number"] == 4
+        assert data["tries_remaining"] == {receiver_id: 1}
+        assert [p["order"] for p in active_sessions[session.id].participants] == [0, 1, 2]
+
 
 @pytest.mark.integration
 class TestSessionHistoryEndpoint:
@@ -607,3 +807,281 @@ class TestSessionHistoryEndpoint:
         assert len(data["guesses"]) == 1
         assert data["guesses"][0]["correct"] is True
         assert data["guesses"][0]["guess"] == "horizon"
+
+    async def _seed_turns(self, db_session, sample_session_data, turns):
+        participant_ids = [p["id"] for p in sample_session_data["participants"]]
+        session = SessionModel(
+            topic=sample_session_data["topic"],
+            secret_word=sample_session_data["secret_word"],
+            participants={
+                p["id"]: {"provider": p["provider"], "role": p["role"], "name": p["name"]}
+                for p in sample_session_data["participants"]
+            },
+            turn_number=turns + 1,
+            message_count=turns,
+        )
+        db_session.add(session)
+        await db_session.flush()
+        for turn in range(1, turns + 1):
+            db_session.add(MessageModel(
+                session_id=session.id, turn=turn, participant_id=participant_ids[0],
+                comms=f"message {turn}", internal_thoughts="",
+            ))
+        db_session.add(GuessModel(
+            session_id=session.id, turn=turns, participant_id=participant_ids[1],
+            guess="nope", correct=False, tries_remaining=2,
+        ))
+        await db_session.commit()
+        return session
+
+    @pytest.mark.asyncio
+    async def test_history_since_turn(self, client, db_session, sample_session_data):
+        """Test since_turn returns only later messages and guesses"""
+        session = await self._seed_turns(db_session, sample_session_data, 3)
+
+        full = (await client.get(f"/api/session/{session.id}/history")).json()
+        assert full["latest_turn"] == 3
+        assert [m["turn"] for m in full["messages"]] == [1, 2, 3]
+
+        newer = (await client.get(f"/api/session/{session.id}/history", params={"since_turn": 2})).json()
+        assert [m["comms"] for m in newer["messages"]] == ["message 3"]
+        assert len(newer["guesses"]) == 1
+
+        caught_up = (await client.get(f"/api/session/{session.id}/history", params={"since_turn": 3})).json()
+        assert caught_up["messages"] == [] and caught_up["guesses"] == []
+
+    @pytest.mark.asyncio
+    async def test_history_etag_revalidation(self, client, db_session, db_engine, sample_session_data):
+        """Test unchanged polls get 304 after reading only the session row"""
+        from sqlalchemy import event, update
+        from app.api.response_cache import NullResponseCache
+
+        # Exercise the database path; cached responses are covered in test_response_cache
+        with patch("app.api.routes.response_cache", NullResponseCache()):
+            session = await self._seed_turns(db_session, sample_session_data, 2)
+            session_id = session.id
+            url = f"/api/session/{session_id}/history"
+
+            first = await client.get(url)
+            etag = first.headers["ETag"]
+            assert etag.startswith('"') and etag.endswith('"')
+
+            statements = []
+
+            def _count(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            event.listen(db_engine.sync_engine, "before_cursor_execute", _count)
+            try:
+                cached = await client.get(url, headers={"If-None-Match": etag})
+            finally:
+                event.remove(db_engine.sync_engine, "before_cursor_execute", _count)
+            assert cached.status_code == 304
+            assert cached.headers["ETag"] == etag
+            assert len(statements) == 1
+            assert "messages" not in statements[0]
+
+            # A variant has its own tag
+            since = await client.get(url, params={"since_turn": 1}, headers={"If-None-Match": etag})
+            assert since.status_code == 200
+
+            # The next turn changes the tag
+            await db_session.execute(
+                update(SessionModel).where(SessionModel.id == session_id).values(turn_number=4, message_count=3)
+            )
+            await db_session.commit()
+            changed = await client.get(url, headers={"If-None-Match": etag})
+            assert changed.status_code == 200
+            assert changed.headers["ETag"] != etag
+
+    @pytest.mark.asyncio
+    async def test_history_stream_ndjson(self, client, db_session, sample_session_data):
+        """Test the NDJSON stream carries the same rows as the JSON history"""
+        import json
+
+        session = await self._seed_turns(db_session, sample_session_data, 3)
+        url = f"/api/session/{session.id}/history/stream"
+
+        response = await client.get(url)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[0]["type"] == "session"
+        assert lines[0]["latest_turn"] == 3
+        assert [line["type"] for line in lines[1:]] == ["message"] * 3 + ["guess"]
+
+        full = (await client.get(f"/api/session/{session.id}/history")).json()
+        assert [{k: v for k, v in line.items() if k != "type"} for line in lines[1:4]] == full["messages"]
+
+        newer = await client.get(url, params={"since_turn": 2, "include_thoughts": "false"})
+        lines = [json.loads(line) for line in newer.text.splitlines()]
+        assert [line.get("comms") for line in lines[1:]] == ["message 3", None]
+        assert "internal_thoughts" not in lines[1]
+
+        revalidated = await client.get(url, headers={"If-None-Match": response.headers["ETag"]})
+        assert revalidated.status_code == 304
+
+    @pytest.mark.asyncio
+    async def test_history_stream_not_found(self, client):
+        """Test streaming an unknown session is a 404, not an empty stream"""
+        response = await client.get(f"/api/session/{uuid4()}/history/stream")
+        assert response.status_code == 404
+
+
+@pytest.mark.integration
+class TestListSessionsEndpoint:
+    """Test the paginated session list served from session summary columns"""
+
+    async def _seed(self, db_session, sample_session_data):
+        from datetime import datetime, timedelta, timezone
+
+        participants = {
+            p["id"]: {"provider": p["provider"], "role": p["role"], "name": p["name"]}
+            for p in sample_session_data["participants"]
+        }
+        receiver_id = sample_session_data["participants"][1]["id"]
+        base = datetime(2026, 5, 1, tzinfo=timezone.utc)
+        sessions = []
+        for i, outcome in enumerate(["win", "loss", None, None]):
+            session = SessionModel(
+                topic=f"topic {i}",
+                secret_word="horizon",
+                participants=participants,
+                created_at=base + timedelta(hours=i),
+                turn_number=i + 2,
+                message_count=i + 1,
+                game_over=outcome is not None,
+                game_status=outcome,
+            )
+            db_session.add(session)
+            await db_session.flush()
+            db_session.add_all([
+                SessionParticipantModel(
+                    session_id=session.id,
+                    participant_id=p["id"],
+                    provider=p["provider"],
+                    model=f"{p['provider']}:test-model",
+                    role=p["role"],
+                    name=p["name"],
+                )
+                for p in sample_session_data["participants"]
+            ])
+            for turn in range(1, i + 2):
+                db_session.add(MessageModel(
+                    session_id=session.id,
+                    turn=turn,
+                    participant_id=receiver_id,
+                    comms="hello",
+                    internal_thoughts="hmm",
+                ))
+            if outcome == "win":
+                db_session.add(GuessModel(
+                    session_id=session.id, turn=1, participant_id=receiver_id,
+                    guess="horizon", correct=True, tries_remaining=2,
+                ))
+            elif outcome == "loss":
+                db_session.add(GuessModel(
+                    session_id=session.id, turn=2, participant_id=receiver_id,
+                    guess="nope", correct=False, tries_remaining=0,
+                ))
+            sessions.append(session)
+        await db_session.commit()
+        return sessions
+
+    @pytest.mark.asyncio
+    async def test_list_is_a_single_query(self, client, db_session, db_engine, sample_session_data):
+        from sqlalchemy import event
+
+        sessions = await self._seed(db_session, sample_session_data)
+
+        statements = []
+
+        def _count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db_engine.sync_engine, "before_cursor_execute", _count)
+        try:
+            response = await client.get("/api/sessions")
+        finally:
+            event.remove(db_engine.sync_engine, "before_cursor_execute", _count)
+
+        assert response.status_code == 200
+        assert len(statements) == 1
+        items = response.json()["sessions"]
+        assert [item["session_id"] for item in items] == [str(s.id) for s in reversed(sessions)]
+        by_topic = {item["topic"]: item for item in items}
+        assert by_topic["topic 0"]["game_status"] == "win"
+        assert by_topic["topic 1"]["game_status"] == "loss"
+        assert by_topic["topic 1"]["message_count"] == 2
+        assert by_topic["topic 3"]["game_over"] is False
+        assert by_topic["topic 3"]["message_count"] == 4
+
+    @pytest.mark.asyncio
+    async def test_keyset_pagination(self, client, db_session, sample_session_data):
+        sessions = await self._seed(db_session, sample_session_data)
+
+        first = (await client.get("/api/sessions", params={"limit": 3})).json()
+        assert len(first["sessions"]) == 3
+        assert first["next_cursor"]
+
+        second = (await client.get("/api/sessions", params={"limit": 3, "cursor": first["next_cursor"]})).json()
+        assert [item["session_id"] for item in second["sessions"]] == [str(sessions[0].id)]
+        assert second["next_cursor"] is None
+
+        by_count = (await client.get(
+            "/api/sessions", params={"sort": "message_count", "order": "asc", "limit": 2}
+        )).json()
+        rest = (await client.get(
+            "/api/sessions",
+            params={"sort": "message_count", "order": "asc", "limit": 2, "cursor": by_count["next_cursor"]},
+        )).json()
+        counts = [item["message_count"] for item in by_count["sessions"] + rest["sessions"]]
+        assert counts == [1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_unpaged_without_limit_or_cursor(self, client, db_session, sample_session_data):
+        """Test the list stays complete for clients that don't page, and pages once a cursor is passed"""
+        await self._seed(db_session, sample_session_data)
+
+        with patch("app.api.routes.DEFAULT_LIST_PAGE_SIZE", 1):
+            everything = (await client.get("/api/sessions")).json()
+            assert len(everything["sessions"]) == 4
+            assert everything["next_cursor"] is None
+
+            first = (await client.get("/api/sessions", params={"limit": 1})).json()
+            second = (await client.get("/api/sessions", params={"cursor": first["next_cursor"]})).json()
+            assert len(second["sessions"]) == 1
+            assert second["next_cursor"]
+
+    @pytest.mark.asyncio
+    async def test_filters(self, client, db_session, sample_session_data):
+        await self._seed(db_session, sample_session_data)
+
+        active = (await client.get("/api/sessions", params={"status": "active"})).json()["sessions"]
+        assert {item["topic"] for item in active} == {"topic 2", "topic 3"}
+
+        over = (await client.get("/api/sessions", params={"status": "over"})).json()["sessions"]
+        assert {item["game_status"] for item in over} == {"win", "loss"}
+
+        anthropic = (await client.get("/api/sessions", params={"provider": "anthropic"})).json()["sessions"]
+        assert len(anthropic) == 4
+        google = (await client.get("/api/sessions", params={"provider": "google"})).json()["sessions"]
+        assert google == []
+        receiver = sample_session_data["participants"][1]
+        as_receiver = (await client.get(
+            "/api/sessions", params={"provider": receiver["provider"], "role": "receiver"}
+        )).json()["sessions"]
+        assert len(as_receiver) == 4
+        as_communicator = (await client.get(
+            "/api/sessions", params={"provider": receiver["provider"], "role": "communicator"}
+        )).json()["sessions"]
+        assert as_communicator == []
+        by_model = (await client.get(
+            "/api/sessions", params={"model": f"{receiver['provider']}:test-model"}
+        )).json()["sessions"]
+        assert len(by_model) == 4
+
+        recent = (await client.get(
+            "/api/sessions", params={"created_after": "2026-05-01T02:00:00+00:00"}
+        )).json()["sessions"]
+        assert {item["topic"] for item in recent} == {"topic 2", "topic 3"}
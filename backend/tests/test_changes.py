@@ -0,0 +1,98 @@
+"""Tests for the /api/changes feed"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models import GuessModel, LLMCallEventModel, MessageModel, SessionModel
+
+
+def _at(minute: int) -> datetime:
+    return datetime(2026, 10, 1, 12, minute, tzinfo=timezone.utc)
+
+
+async def _seed(db_session):
+    session = SessionModel(topic="t", secret_word="w", participants={})
+    db_session.add(session)
+    await db_session.flush()
+    for minute in (1, 3, 5):
+        db_session.add(MessageModel(
+            session_id=session.id, turn=minute, participant_id="p1", comms=f"m{minute}",
+            internal_thoughts="", created_at=_at(minute),
+        ))
+    db_session.add(GuessModel(
+        session_id=session.id, turn=3, participant_id="p2", guess="w", correct=False,
+        tries_remaining=2, created_at=_at(4),
+    ))
+    db_session.add(LLMCallEventModel(session_id=session.id, status="success", created_at=_at(2)))
+    await db_session.commit()
+    return session
+
+
+def _label(change):
+    row = change["row"]
+    return row.get("comms") or row.get("guess") or row["status"]
+
+
+@pytest.mark.integration
+class TestChangeFeed:
+    """Test ordering, paging and cursors of the change feed"""
+
+    async def test_pages_in_order_across_tables(self, client, db_session):
+        session = await _seed(db_session)
+
+        seen, since = [], None
+        while True:
+            params = {"limit": 2} if since is None else {"limit": 2, "since": since}
+            page = (await client.get("/api/changes", params=params)).json()
+            seen.extend((change["table"], _label(change)) for change in page["changes"])
+            since = page["next_cursor"]
+            if not page["has_more"]:
+                break
+
+        assert seen == [
+            ("messages", "m1"),
+            ("llm_call_events", "success"),
+            ("messages", "m3"),
+            ("guesses", "w"),
+            ("messages", "m5"),
+        ]
+
+        # Tailing from the last cursor returns nothing new, then only new rows
+        assert (await client.get("/api/changes", params={"since": since})).json()["changes"] == []
+        db_session.add(MessageModel(
+            session_id=session.id, turn=6, participant_id="p1", comms="m6", internal_thoughts="",
+            created_at=_at(6),
+        ))
+        await db_session.commit()
+        newer = (await client.get("/api/changes", params={"since": since})).json()
+        assert [_label(change) for change in newer["changes"]] == ["m6"]
+
+    async def test_since_timestamp_and_table_filter(self, client, db_session):
+        await _seed(db_session)
+
+        response = await client.get(
+            "/api/changes", params={"since": _at(3).isoformat(), "tables": "messages,guesses"}
+        )
+        assert [_label(change) for change in response.json()["changes"]] == ["m3", "w", "m5"]
+
+    @pytest.mark.parametrize("since", ["2026-10-01T12:03:00", "2026-10-01T14:03:00+02:00"])
+    async def test_since_timestamp_is_normalised_to_utc(self, client, db_session, since):
+        await _seed(db_session)
+
+        response = await client.get("/api/changes", params={"since": since, "tables": "messages"})
+        assert [_label(change) for change in response.json()["changes"]] == ["m3", "m5"]
+
+    async def test_recent_rows_wait_for_the_settle_window(self, client, db_session):
+        session = await _seed(db_session)
+        db_session.add(MessageModel(
+            session_id=session.id, turn=9, participant_id="p1", comms="just now", internal_thoughts="",
+            created_at=datetime.now(timezone.utc) - timedelta(seconds=1),
+        ))
+        await db_session.commit()
+
+        response = await client.get("/api/changes", params={"tables": "messages"})
+        assert "just now" not in [_label(change) for change in response.json()["changes"]]
+
+    async def test_rejects_bad_input(self, client):
+        assert (await client.get("/api/changes", params={"tables": "sessions"})).status_code == 422
+        assert (await client.get("/api/changes", params={"since": "not-a-cursor"})).status_code == 400
@@ -0,0 +1,107 @@
+"""Tests that a turn only holds a pooled connection while it talks to the database"""
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.session_state import active_sessions
+from app.main import app
+from app.models import SessionModel, get_db
+from app.models.database import Base
+
+
+@pytest_asyncio.fixture
+async def pooled_engine(tmp_path):
+    """File-backed engine with a real connection pool, instrumented for checkout time"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", pool_size=2, max_overflow=0)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    held = []
+    checked_out = {}
+
+    def _checkout(dbapi_conn, record, proxy):
+        checked_out[id(record)] = time.perf_counter()
+
+    def _checkin(dbapi_conn, record):
+        started = checked_out.pop(id(record), None)
+        if started is not None:
+            held.append(time.perf_counter() - started)
+
+    event.listen(engine.sync_engine, "checkout", _checkout)
+    event.listen(engine.sync_engine, "checkin", _checkin)
+    yield SimpleNamespace(engine=engine, held=held)
+    await engine.dispose()
+
+
+@pytest.mark.integration
+class TestConnectionUsage:
+    """Test that model latency doesn't translate into pool checkout time"""
+
+    async def _play(self, pooled, sample_session_data, latency):
+        engine = pooled.engine
+        factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with factory() as db:
+            session = SessionModel(
+                topic=sample_session_data["topic"],
+                secret_word=sample_session_data["secret_word"],
+                participants={
+                    p["id"]: {"provider": p["provider"], "role": p["role"], "name": p["name"]}
+                    for p in sample_session_data["participants"]
+                },
+            )
+            db.add(session)
+            await db.commit()
+            session_id = session.id
+
+        async def override_get_db():
+            async with factory() as db:
+                yield db
+
+        connections_during_models = []
+
+        async def slow_models(**kwargs):
+            connections_during_models.append(engine.sync_engine.pool.checkedout())
+            await asyncio.sleep(latency)
+            return {
+                "messages": [{
+                    "participant_id": sample_session_data["participants"][0]["id"],
+                    "comms": "hint",
+                    "internal_thoughts": "",
+                    "guess": None,
+                }],
+                "errors": [],
+            }
+
+        from httpx import ASGITransport, AsyncClient
+
+        app.dependency_overrides[get_db] = override_get_db
+        pooled.held.clear()
+        try:
+            with patch('app.api.routes.agent_manager') as mock_manager:
+                mock_manager.initialize_agents = AsyncMock(return_value="horizon")
+                mock_manager.run_conversation_turn = AsyncMock(side_effect=slow_models)
+                async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                    response = await client.post("/api/next-turn", json={"session_id": str(session_id)})
+        finally:
+            app.dependency_overrides.clear()
+            active_sessions.pop(session_id, None)
+
+        assert response.status_code == 200
+        return sum(pooled.held), connections_during_models
+
+    @pytest.mark.asyncio
+    async def test_checkout_time_independent_of_model_latency(self, pooled_engine, sample_session_data):
+        fast_held, fast_during = await self._play(pooled_engine, sample_session_data, latency=0.0)
+        slow_held, slow_during = await self._play(pooled_engine, sample_session_data, latency=0.5)
+
+        assert fast_during == slow_during == [0]
+        # Half a second of model latency must not show up as checkout time
+        assert slow_held < fast_held + 0.25
+        assert slow_held < 0.25
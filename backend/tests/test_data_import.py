@@ -0,0 +1,115 @@
+"""Tests for importing exported and archived files"""
+import json
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.data_import import find_table_files, import_tables
+from app.core.export import export_tables
+from app.models import Base, LLMCallEventModel, MessageModel, SessionModel, SessionParticipantModel
+
+
+@pytest.fixture
+async def target_engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+async def _seed(db_session, sessions=3, turns=4):
+    for i in range(sessions):
+        session = SessionModel(
+            topic=f"topic {i}", secret_word="w",
+            participants={"p1": {"provider": "openai", "role": "communicator", "name": "A"}},
+            tries_remaining={"p2": 3},
+        )
+        db_session.add(session)
+        await db_session.flush()
+        db_session.add(SessionParticipantModel(
+            session_id=session.id, participant_id="p1", provider="openai", role="communicator", name="A", order=0,
+        ))
+        for turn in range(1, turns + 1):
+            db_session.add(MessageModel(
+                session_id=session.id, turn=turn, participant_id="p1", comms=f"{i}/{turn}", internal_thoughts="t",
+            ))
+        db_session.add(LLMCallEventModel(
+            session_id=session.id, provider="openai", status="success",
+            created_at=datetime(2026, 1, 1 + i, tzinfo=timezone.utc), request_payload={"turn": 1},
+        ))
+    await db_session.commit()
+
+
+async def _count(engine, model):
+    async with engine.connect() as conn:
+        return (await conn.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+@pytest.mark.unit
+class TestFindTableFiles:
+    """Test which files belong to a table"""
+
+    def test_matches_export_archive_and_endpoint_names(self, tmp_path):
+        for name in (
+            "sessions.jsonl.gz", "session_participants.parquet", "messages-20261019-120000.ndjson",
+            "llm_call_events_2026-01.jsonl.gz", "llm_call_events_2026-02.jsonl.gz", "notes.txt",
+        ):
+            (tmp_path / name).touch()
+
+        assert [p.name for p in find_table_files(tmp_path, "sessions")] == ["sessions.jsonl.gz"]
+        assert [p.name for p in find_table_files(tmp_path, "messages")] == ["messages-20261019-120000.ndjson"]
+        assert len(find_table_files(tmp_path, "llm_call_events")) == 2
+        assert find_table_files(tmp_path, "guesses") == []
+
+
+@pytest.mark.integration
+class TestImportTables:
+    """Test export/import round trips"""
+
+    async def test_round_trip_and_rerun_skips_duplicates(self, db_engine, db_session, target_engine, tmp_path):
+        await _seed(db_session)
+        await export_tables(db_engine, tmp_path, fmt="jsonl")
+
+        first = {r.table: r for r in await import_tables(target_engine, tmp_path, batch_size=5)}
+        assert first["messages"].rows_inserted == 12
+        assert first["sessions"].rows_inserted == 3
+        assert first["messages"].rows_per_second > 0
+
+        async with target_engine.connect() as conn:
+            session = (await conn.execute(select(SessionModel.__table__).limit(1))).mappings().one()
+            event = (await conn.execute(select(LLMCallEventModel.__table__).limit(1))).mappings().one()
+        assert session["participants"]["p1"]["provider"] == "openai"
+        assert event["request_payload"] == {"turn": 1}
+        for model in (SessionParticipantModel, MessageModel, LLMCallEventModel):
+            assert await _count(target_engine, model) == await _count(db_engine, model)
+
+        again = {r.table: r for r in await import_tables(target_engine, tmp_path)}
+        assert again["messages"].rows_inserted == 0
+        assert again["messages"].rows_skipped == 12
+        assert await _count(target_engine, MessageModel) == 12
+
+    async def test_ndjson_export_with_unknown_columns(self, db_engine, db_session, target_engine, tmp_path, client):
+        await _seed(db_session, sessions=1, turns=2)
+        for table in ("sessions", "messages"):
+            response = await client.get(f"/api/export/{table}")
+            lines = [dict(json.loads(line), added_later="x") for line in response.text.splitlines()]
+            (tmp_path / f"{table}-20261019.ndjson").write_text("".join(json.dumps(line) + "\n" for line in lines))
+
+        results = await import_tables(target_engine, tmp_path, tables=["messages", "sessions"])
+
+        assert [r.table for r in results] == ["sessions", "messages"]
+        assert await _count(target_engine, MessageModel) == 2
+
+    async def test_parquet_round_trip(self, db_engine, db_session, target_engine, tmp_path):
+        pytest.importorskip("pyarrow")
+        await _seed(db_session, sessions=2, turns=2)
+        await export_tables(db_engine, tmp_path, fmt="parquet")
+
+        await import_tables(target_engine, tmp_path)
+
+        assert await _count(target_engine, MessageModel) == 4
+        assert await _count(target_engine, LLMCallEventModel) == 2
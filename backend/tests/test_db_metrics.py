@@ -0,0 +1,103 @@
+"""Tests for query/pool instrumentation"""
+import logging
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import db_metrics
+from app.core.db_metrics import (
+    QUERY_COUNT_HEADER,
+    QUERY_TIME_HEADER,
+    InstrumentedAsyncAdaptedQueuePool,
+    QueryStats,
+    instrument_engine,
+    pool_stats,
+    redact_parameters,
+)
+from app.models import SessionModel
+
+
+@pytest.mark.unit
+class TestRedaction:
+    """Test slow-query parameters never carry values"""
+
+    def test_values_become_type_names(self):
+        assert redact_parameters({"secret": "horizon", "turn": 3}) == {"secret": "str", "turn": "int"}
+        assert redact_parameters(("horizon", None)) == ["str", "NoneType"]
+
+    def test_executemany_is_summarised(self):
+        redacted = redact_parameters([("a", 1), ("b", 2), ("c", 3)])
+        assert redacted == {"rows": 3, "first": ["str", "int"]}
+
+
+@pytest.mark.integration
+class TestQueryInstrumentation:
+    """Test per-request query counts and the slow-query log"""
+
+    async def test_debug_headers_report_request_queries(self, client, db_engine, db_session):
+        instrument_engine(db_engine)
+        session = SessionModel(topic="t", secret_word="w", participants={})
+        db_session.add(session)
+        await db_session.commit()
+
+        with patch.object(db_metrics, "DB_DEBUG_HEADERS", True):
+            response = await client.get(f"/api/session/{session.id}/status")
+
+        assert response.status_code == 200
+        assert int(response.headers[QUERY_COUNT_HEADER]) >= 1
+        assert float(response.headers[QUERY_TIME_HEADER]) >= 0
+
+    async def test_headers_are_off_by_default(self, client):
+        response = await client.get("/api/metrics/session-store")
+        assert QUERY_COUNT_HEADER not in response.headers
+
+    async def test_slow_queries_are_logged_without_values(self, db_engine, caplog):
+        instrument_engine(db_engine)
+        with patch.object(db_metrics, "DB_SLOW_QUERY_MS", 0), patch.object(db_metrics, "query_totals", QueryStats()):
+            with caplog.at_level(logging.WARNING, logger=db_metrics.logger.name):
+                async with db_engine.connect() as conn:
+                    await conn.execute(text("SELECT :secret"), {"secret": "horizon"})
+            assert db_metrics.query_totals.slow == 1
+
+        messages = [record.getMessage() for record in caplog.records if "Slow query" in record.getMessage()]
+        assert messages
+        assert "horizon" not in messages[0]
+        assert "params=['str']" in messages[0]
+
+
+@pytest.mark.integration
+class TestPoolMetrics:
+    """Test checkout wait and timeout accounting"""
+
+    async def test_waits_and_timeouts_are_counted(self, tmp_path):
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.1,
+        )
+        try:
+            async with engine.connect():
+                with pytest.raises(PoolTimeoutError):
+                    async with engine.connect():
+                        pass
+                stats = pool_stats(engine)
+                assert stats["checkedout"] == 1
+
+            assert stats["timeouts"] == 1
+            assert stats["checkouts"] == 2
+            assert stats["max_wait_ms"] >= 100
+        finally:
+            await engine.dispose()
+
+    async def test_metrics_endpoint(self, client):
+        response = await client.get("/api/metrics/db")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert "pool_class" in data["pool"]
+        assert data["slow_query_threshold_ms"] == db_metrics.DB_SLOW_QUERY_MS
@@ -54,12 +54,13 @@ def available_providers():
 @pytest.fixture
 async def client(db_session):
     """Test client with database override"""
-    from app.models.database import get_db
+    from app.models.database import get_db, get_read_db
     
     async def override_get_db():
         yield db_session
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
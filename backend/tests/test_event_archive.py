@@ -0,0 +1,87 @@
+"""Tests for llm_call_events rollover archival"""
+import gzip
+import json
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.core.event_archive import add_months, archive_llm_events, month_start, partition_name
+from app.models.llm_call_event import LLMCallEventModel
+
+
+@pytest.mark.unit
+class TestMonthHelpers:
+    """Test month arithmetic used for partition bounds"""
+
+    def test_month_start_truncates(self):
+        value = datetime(2026, 3, 17, 13, 45, tzinfo=timezone.utc)
+        assert month_start(value) == datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+    def test_add_months_crosses_year(self):
+        start = datetime(2026, 11, 1, tzinfo=timezone.utc)
+        assert add_months(start, 2) == datetime(2027, 1, 1, tzinfo=timezone.utc)
+        assert add_months(start, -11) == datetime(2025, 12, 1, tzinfo=timezone.utc)
+
+    def test_partition_name(self):
+        assert partition_name(datetime(2026, 4, 1, tzinfo=timezone.utc)) == "llm_call_events_y2026m04"
+
+
+@pytest.mark.integration
+class TestArchiveLLMEvents:
+    """Test the SQLite archive path (export then batched delete)"""
+
+    async def _seed(self, db_session):
+        for created_at, pid in [
+            (datetime(2026, 1, 5, tzinfo=timezone.utc), "jan-1"),
+            (datetime(2026, 1, 20, tzinfo=timezone.utc), "jan-2"),
+            (datetime(2026, 2, 11, tzinfo=timezone.utc), "feb-1"),
+            (datetime(2026, 6, 2, tzinfo=timezone.utc), "jun-1"),
+        ]:
+            db_session.add(
+                LLMCallEventModel(
+                    created_at=created_at,
+                    participant_id=pid,
+                    status="success",
+                    request_payload={"role": "receiver"},
+                )
+            )
+        await db_session.commit()
+
+    @pytest.mark.asyncio
+    async def test_archive_exports_and_deletes_old_months(self, db_engine, db_session, tmp_path):
+        await self._seed(db_session)
+
+        results = await archive_llm_events(
+            db_engine,
+            output_dir=tmp_path,
+            older_than_months=3,
+            batch_size=1,
+            now=datetime(2026, 6, 15, tzinfo=timezone.utc),
+        )
+
+        assert [(r.month.month, r.rows) for r in results] == [(1, 2), (2, 1)]
+        with gzip.open(tmp_path / "llm_call_events_2026-01.jsonl.gz", "rt") as fh:
+            rows = [json.loads(line) for line in fh]
+        assert [r["participant_id"] for r in rows] == ["jan-1", "jan-2"]
+        assert rows[0]["request_payload"] == {"role": "receiver"}
+
+        remaining = (await db_session.execute(select(LLMCallEventModel.participant_id))).scalars().all()
+        assert remaining == ["jun-1"]
+
+    @pytest.mark.asyncio
+    async def test_archive_dry_run_keeps_rows(self, db_engine, db_session, tmp_path):
+        await self._seed(db_session)
+
+        results = await archive_llm_events(
+            db_engine,
+            output_dir=tmp_path,
+            older_than_months=3,
+            dry_run=True,
+            now=datetime(2026, 6, 15, tzinfo=timezone.utc),
+        )
+
+        assert sum(r.rows for r in results) == 3
+        assert not any(tmp_path.iterdir())
+        count = len((await db_session.execute(select(LLMCallEventModel.id))).scalars().all())
+        assert count == 4
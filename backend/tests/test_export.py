@@ -0,0 +1,149 @@
+"""Tests for bulk export of sessions, messages, guesses and LLM events"""
+import gzip
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.export import ExportFilters, export_tables
+from app.models import (
+    GuessModel,
+    LLMCallEventModel,
+    MessageModel,
+    SessionModel,
+    SessionParticipantModel,
+)
+
+
+async def _seed(db_session):
+    """Two sessions: an OpenAI win in January and an active Anthropic game in March"""
+    won = SessionModel(
+        topic="won", secret_word="w", participants={}, game_over=True, game_status="win",
+        created_at=datetime(2026, 1, 10, tzinfo=timezone.utc),
+    )
+    active = SessionModel(
+        topic="active", secret_word="w", participants={},
+        created_at=datetime(2026, 3, 10, tzinfo=timezone.utc),
+    )
+    db_session.add_all([won, active])
+    await db_session.flush()
+    for session, provider in ((won, "openai"), (active, "anthropic")):
+        db_session.add(SessionParticipantModel(
+            session_id=session.id, participant_id="p1", provider=provider, role="communicator", name="A", order=0,
+        ))
+        for turn in (1, 2):
+            db_session.add(MessageModel(
+                session_id=session.id, turn=turn, participant_id="p1", comms=f"{session.topic} {turn}",
+                internal_thoughts="",
+            ))
+        db_session.add(GuessModel(
+            session_id=session.id, turn=2, participant_id="p1", guess="w", correct=True, tries_remaining=2,
+        ))
+        db_session.add(LLMCallEventModel(
+            session_id=session.id, provider=provider, status="success",
+            created_at=session.created_at, request_payload={"turn": 1},
+        ))
+    await db_session.commit()
+    return won, active
+
+
+def _read_jsonl(path):
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh]
+
+
+@pytest.mark.integration
+class TestExportTables:
+    """Test the CLI export path (gzip JSONL fallback without pyarrow)"""
+
+    async def test_exports_every_table_in_batches(self, db_engine, db_session, tmp_path):
+        won, active = await _seed(db_session)
+
+        results = await export_tables(db_engine, tmp_path, fmt="jsonl", batch_size=1)
+
+        counts = {item.table: item.rows for item in results}
+        assert counts == {"sessions": 2, "session_participants": 2, "messages": 4, "guesses": 2, "llm_call_events": 2}
+        sessions = _read_jsonl(results[0].path)
+        assert [row["topic"] for row in sessions] == ["won", "active"]
+        events = _read_jsonl(results[4].path)
+        assert events[0]["request_payload"] == {"turn": 1}
+
+    @pytest.mark.parametrize("filters, topics", [
+        (ExportFilters(status="win"), {"won"}),
+        (ExportFilters(provider="anthropic"), {"active"}),
+        (ExportFilters(created_after=datetime(2026, 2, 1, tzinfo=timezone.utc)), {"active"}),
+        (ExportFilters(created_before=datetime(2026, 2, 1, tzinfo=timezone.utc)), {"won"}),
+    ])
+    async def test_filters_select_sessions_and_their_rows(self, db_engine, db_session, tmp_path, filters, topics):
+        won, active = await _seed(db_session)
+        ids = {str(s.id) for s in (won, active) if s.topic in topics}
+
+        results = {item.table: item for item in await export_tables(db_engine, tmp_path, fmt="jsonl", filters=filters)}
+
+        assert {row["topic"] for row in _read_jsonl(results["sessions"].path)} == topics
+        for table in ("session_participants", "messages", "guesses", "llm_call_events"):
+            assert {row["session_id"] for row in _read_jsonl(results[table].path)} == ids
+
+    async def test_parquet_columns_null_in_first_batch(self, db_engine, db_session, tmp_path):
+        """Types come from the table, so a column NULL in the first batch takes later values"""
+        pq = pytest.importorskip("pyarrow.parquet")
+        won, active = await _seed(db_session)
+        active.turn_started_at = datetime(2026, 3, 10, 12, tzinfo=timezone.utc)
+        db_session.add(LLMCallEventModel(
+            session_id=active.id, provider="anthropic", status="success", prompt_tokens=120, latency_ms=850,
+            created_at=datetime(2026, 3, 11, tzinfo=timezone.utc),
+        ))
+        await db_session.commit()
+
+        results = await export_tables(
+            db_engine, tmp_path, tables=["sessions", "llm_call_events"], fmt="parquet", batch_size=1
+        )
+
+        sessions, events = (pq.read_table(item.path).to_pylist() for item in results)
+        assert [row["turn_started_at"] for row in sessions] == [None, datetime(2026, 3, 10, 12, tzinfo=timezone.utc)]
+        assert [row["prompt_tokens"] for row in events] == [None, None, 120]
+        assert events[2]["latency_ms"] == 850
+
+    async def test_unknown_table_is_rejected(self, db_engine, tmp_path):
+        with pytest.raises(ValueError):
+            await export_tables(db_engine, tmp_path, tables=["users"])
+        assert not list(tmp_path.iterdir())
+
+    def test_unknown_status_is_rejected(self):
+        with pytest.raises(ValueError):
+            ExportFilters(status="draw")
+
+
+@pytest.mark.integration
+class TestExportEndpoint:
+    """Test the streamed export endpoint"""
+
+    async def test_ndjson_stream_with_filters(self, client, db_session):
+        won, _ = await _seed(db_session)
+
+        response = await client.get("/api/export/messages", params={"status": "win"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert "attachment" in response.headers["Content-Disposition"]
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["comms"] for row in rows] == ["won 1", "won 2"]
+        assert {row["session_id"] for row in rows} == {str(won.id)}
+
+    async def test_parquet(self, client, db_session):
+        await _seed(db_session)
+        response = await client.get("/api/export/guesses", params={"format": "parquet"})
+        assert response.status_code == 200
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            # Without pyarrow the same rows come back as NDJSON
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+            assert len(response.text.splitlines()) == 2
+            return
+        import io
+
+        assert pq.read_table(io.BytesIO(response.content)).num_rows == 2
+
+    async def test_unknown_table(self, client):
+        response = await client.get("/api/export/users")
+        assert response.status_code == 404
@@ -0,0 +1,179 @@
+"""Tests for Idempotency-Key handling on start-session and next-turn"""
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+
+from app.api import idempotency
+from app.api.schemas import NextTurnRequest
+from app.api.session_state import active_sessions
+from app.models import IdempotencyKeyModel, MessageModel, SessionModel
+from app.models.database import utcnow
+
+
+async def _seed(db_session, sample_session_data):
+    session = SessionModel(
+        topic=sample_session_data["topic"],
+        secret_word=sample_session_data["secret_word"],
+        participants={
+            p["id"]: {"provider": p["provider"], "role": p["role"], "name": p["name"]}
+            for p in sample_session_data["participants"]
+        },
+    )
+    db_session.add(session)
+    await db_session.commit()
+    return session.id
+
+
+def _turn_result(sample_session_data):
+    return {
+        "messages": [{
+            "participant_id": sample_session_data["participants"][0]["id"],
+            "comms": "Look at the horizon",
+            "internal_thoughts": "hint",
+            "guess": None,
+        }],
+        "errors": [],
+    }
+
+
+async def _message_count(db_session, session_id):
+    return (await db_session.execute(
+        select(func.count()).select_from(MessageModel).where(MessageModel.session_id == session_id)
+    )).scalar_one()
+
+
+@pytest.mark.integration
+class TestIdempotencyKeys:
+    """Test that retried requests are answered from the first outcome"""
+
+    @pytest.fixture(autouse=True)
+    def _manager(self, sample_session_data):
+        with patch('app.api.routes.agent_manager') as mock_manager:
+            mock_manager.initialize_agents = AsyncMock(return_value="horizon")
+            mock_manager.run_conversation_turn = AsyncMock(return_value=_turn_result(sample_session_data))
+            self.manager = mock_manager
+            yield
+        active_sessions.clear()
+
+    async def _turn(self, client, session_id, key, **body):
+        return await client.post(
+            "/api/next-turn",
+            json={"session_id": str(session_id), **body},
+            headers={"Idempotency-Key": key},
+        )
+
+    @pytest.mark.asyncio
+    async def test_retry_replays_stored_turn(self, client, db_session, sample_session_data):
+        session_id = await _seed(db_session, sample_session_data)
+        key = str(uuid4())
+
+        first = await self._turn(client, session_id, key)
+        second = await self._turn(client, session_id, key)
+
+        assert first.status_code == second.status_code == 200
+        assert second.json() == first.json()
+        assert second.headers[idempotency.REPLAY_HEADER] == "true"
+        assert idempotency.REPLAY_HEADER not in first.headers
+        assert self.manager.run_conversation_turn.await_count == 1
+        assert await _message_count(db_session, session_id) == 1
+
+    @pytest.mark.asyncio
+    async def test_replay_survives_restart(self, client, db_session, sample_session_data):
+        session_id = await _seed(db_session, sample_session_data)
+        key = str(uuid4())
+        first = await self._turn(client, session_id, key)
+
+        idempotency._completed.pop(key)
+        active_sessions.clear()
+        second = await self._turn(client, session_id, key)
+
+        assert second.json() == first.json()
+        assert self.manager.run_conversation_turn.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_wait_for_the_first(self, client, db_session, sample_session_data):
+        session_id = await _seed(db_session, sample_session_data)
+        key = str(uuid4())
+        release = asyncio.Event()
+
+        async def slow_turn(**kwargs):
+            await release.wait()
+            return _turn_result(sample_session_data)
+
+        self.manager.run_conversation_turn = AsyncMock(side_effect=slow_turn)
+        first = asyncio.create_task(self._turn(client, session_id, key))
+        second = asyncio.create_task(self._turn(client, session_id, key))
+        await asyncio.sleep(0.05)
+        release.set()
+        responses = await asyncio.gather(first, second)
+
+        assert [r.status_code for r in responses] == [200, 200]
+        assert responses[0].json() == responses[1].json()
+        assert self.manager.run_conversation_turn.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_key_reused_for_different_request(self, client, db_session, sample_session_data):
+        session_id = await _seed(db_session, sample_session_data)
+        key = str(uuid4())
+        await self._turn(client, session_id, key)
+
+        other = await client.post(
+            "/api/start-session", json={"topic": "oceans"}, headers={"Idempotency-Key": key}
+        )
+        assert other.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_failure_releases_key(self, client, db_session, sample_session_data):
+        session_id = await _seed(db_session, sample_session_data)
+        key = str(uuid4())
+
+        self.manager.run_conversation_turn = AsyncMock(return_value={"messages": [], "errors": ["down"]})
+        assert (await self._turn(client, session_id, key)).status_code == 503
+        assert await db_session.get(IdempotencyKeyModel, key) is None
+
+        self.manager.run_conversation_turn = AsyncMock(return_value=_turn_result(sample_session_data))
+        retry = await self._turn(client, session_id, key)
+        assert retry.status_code == 200
+        assert idempotency.REPLAY_HEADER not in retry.headers
+
+    @pytest.mark.asyncio
+    async def test_start_session_is_not_repeated(self, client, db_session):
+        key = str(uuid4())
+        first = await client.post("/api/start-session", json={"topic": "oceans"}, headers={"Idempotency-Key": key})
+        second = await client.post("/api/start-session", json={"topic": "oceans"}, headers={"Idempotency-Key": key})
+
+        assert second.json()["session_id"] == first.json()["session_id"]
+        count = (await db_session.execute(select(func.count()).select_from(SessionModel))).scalar_one()
+        assert count == 1
+
+    @pytest.mark.asyncio
+    async def test_key_in_progress_elsewhere(self, client, db_session, sample_session_data):
+        session_id = await _seed(db_session, sample_session_data)
+        key = str(uuid4())
+        request = NextTurnRequest(session_id=session_id)
+        now = utcnow()
+        db_session.add(IdempotencyKeyModel(
+            key=key,
+            endpoint="next-turn",
+            request_hash=idempotency.request_fingerprint("next-turn", request),
+            locked_until=now + timedelta(minutes=5),
+            expires_at=now + timedelta(days=1),
+        ))
+        await db_session.commit()
+
+        with patch.object(idempotency, "IDEMPOTENCY_LOCK_SECONDS", 0):
+            response = await self._turn(client, session_id, key)
+        assert response.status_code == 409
+        self.manager.run_conversation_turn.assert_not_awaited()
+
+        # Once the other worker's lock lapses the key is taken over
+        row = await db_session.get(IdempotencyKeyModel, key)
+        row.locked_until = now - timedelta(seconds=1)
+        await db_session.commit()
+        response = await self._turn(client, session_id, key)
+        assert response.status_code == 200
+        assert self.manager.run_conversation_turn.await_count == 1
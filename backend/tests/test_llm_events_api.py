@@ -0,0 +1,95 @@
+"""Tests for the LLM call event query endpoints"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models import LLMCallEventModel
+
+
+async def _seed_events(db_session, count=5):
+    base = datetime(2026, 5, 1, 12, tzinfo=timezone.utc)
+    events = [
+        LLMCallEventModel(
+            created_at=base + timedelta(minutes=i),
+            participant_id=f"p-{i % 2}",
+            provider="openai" if i % 2 else "anthropic",
+            model="test-model",
+            status="success" if i < 4 else "error",
+            prompt_text="a very long prompt" * 50,
+            response_text="response",
+        )
+        for i in range(count)
+    ]
+    db_session.add_all(events)
+    await db_session.commit()
+    return events
+
+
+@pytest.mark.integration
+class TestListLLMEvents:
+    """Test /api/llm-events filtering, projection and keyset pagination"""
+
+    @pytest.mark.asyncio
+    async def test_pages_newest_first_without_overlap(self, client, db_session):
+        events = await _seed_events(db_session)
+
+        seen = []
+        cursor = None
+        for _ in range(3):
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = await client.get("/api/llm-events", params=params)
+            assert response.status_code == 200
+            data = response.json()
+            seen.extend(item["id"] for item in data["items"])
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+
+        assert seen == [str(e.id) for e in reversed(events)]
+
+    @pytest.mark.asyncio
+    async def test_large_fields_skipped_by_default(self, client, db_session):
+        await _seed_events(db_session, count=1)
+
+        item = (await client.get("/api/llm-events")).json()["items"][0]
+        assert "prompt_text" not in item
+        assert "response_payload" not in item
+        assert item["status"] == "success"
+
+        item = (await client.get("/api/llm-events", params={"fields": "prompt_text"})).json()["items"][0]
+        assert set(item) == {"id", "created_at", "prompt_text"}
+
+    @pytest.mark.asyncio
+    async def test_filters(self, client, db_session):
+        await _seed_events(db_session)
+
+        data = (await client.get("/api/llm-events", params={"provider": "openai"})).json()
+        assert len(data["items"]) == 2
+        assert all(item["provider"] == "openai" for item in data["items"])
+
+        data = (await client.get("/api/llm-events", params={"status": "error"})).json()
+        assert len(data["items"]) == 1
+
+        data = (await client.get(
+            "/api/llm-events",
+            params={"since": "2026-05-01T12:01:00+00:00", "until": "2026-05-01T12:03:00+00:00"},
+        )).json()
+        assert len(data["items"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_and_fields(self, client):
+        assert (await client.get("/api/llm-events", params={"cursor": "garbage"})).status_code == 400
+        assert (await client.get("/api/llm-events", params={"fields": "nope"})).status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_get_single_event_includes_bodies(self, client, db_session):
+        events = await _seed_events(db_session, count=1)
+
+        response = await client.get(f"/api/llm-events/{events[0].id}")
+        assert response.status_code == 200
+        assert response.json()["response_text"] == "response"
+
+        missing = await client.get("/api/llm-events/00000000-0000-0000-0000-000000000000")
+        assert missing.status_code == 404
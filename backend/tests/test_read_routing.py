@@ -0,0 +1,135 @@
+"""Tests for replica routing of read-only endpoints"""
+import time
+from unittest.mock import patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.response_cache import NullResponseCache
+from app.main import app
+from app.models import Base, SessionModel
+from app.models import database
+
+
+@pytest.fixture
+async def primary_and_replica(tmp_path):
+    """Two SQLite files; the replica never receives the primary's writes (infinite lag)"""
+    engines = [
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}")
+        for name in ("primary.db", "replica.db")
+    ]
+    for engine in engines:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    primary, replica = (sessionmaker(e, class_=AsyncSession, expire_on_commit=False) for e in engines)
+
+    with patch.object(database, "ASYNC_DATABASE_READ_URL", "sqlite+aiosqlite:///replica.db"), \
+            patch.object(database, "SessionLocal", primary), \
+            patch.object(database, "ReadSessionLocal", replica), \
+            patch.dict(database._recent_writes, clear=True), \
+            patch("app.api.routes.response_cache", NullResponseCache()):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            yield client, primary
+
+    for engine in engines:
+        await engine.dispose()
+
+
+@pytest.mark.integration
+class TestReadRouting:
+    """Test read endpoints use the replica except inside a read-your-writes window"""
+
+    async def test_reads_go_to_replica(self, primary_and_replica):
+        client, primary = primary_and_replica
+        async with primary() as db:
+            session = SessionModel(topic="t", secret_word="w", participants={})
+            db.add(session)
+            await db.commit()
+
+        response = await client.get(f"/api/session/{session.id}/history")
+        assert response.status_code == 404
+
+    async def test_recent_write_reads_from_primary(self, primary_and_replica):
+        client, primary = primary_and_replica
+        async with primary() as db:
+            session = SessionModel(topic="t", secret_word="w", participants={})
+            db.add(session)
+            await db.commit()
+
+        database.mark_written(session.id)
+        response = await client.get(f"/api/session/{session.id}/history")
+        assert response.status_code == 200
+
+        database._recent_writes[str(session.id)] = time.monotonic() - 1
+        response = await client.get(f"/api/session/{session.id}/history")
+        assert response.status_code == 404
+
+    async def test_replica_status_is_not_stored(self, primary_and_replica):
+        """Test a status read from the replica does not seed the store next_turn relies on"""
+        from app.api.session_store import session_store
+
+        client, primary = primary_and_replica
+        async with primary() as db:
+            session = SessionModel(topic="t", secret_word="w", participants={}, turn_number=3)
+            db.add(session)
+            await db.commit()
+        async with database.ReadSessionLocal() as db:
+            db.add(SessionModel(id=session.id, topic="t", secret_word="w", participants={}, turn_number=1))
+            await db.commit()
+        await session_store.delete(session.id)
+
+        response = await client.get(f"/api/session/{session.id}/status")
+        assert response.json()["turn_number"] == 1
+        assert await session_store.get(session.id) is None
+
+        database.mark_written(session.id)
+        response = await client.get(f"/api/session/{session.id}/status")
+        assert response.json()["turn_number"] == 3
+        assert (await session_store.get(session.id)).turn_number == 3
+        await session_store.delete(session.id)
+
+    async def test_writer_cookie_covers_list_reads(self, primary_and_replica):
+        client, _ = primary_and_replica
+        with patch('app.agents.agent_manager.HiddenMessageAgent.initialize_agents') as mock_init:
+            mock_init.return_value = "horizon"
+            response = await client.post("/api/start-session", json={"topic": "oceans"})
+        assert response.status_code == 200
+        assert database.READ_STICKY_COOKIE in response.cookies
+        session_id = response.json()["session_id"]
+
+        listed = await client.get("/api/sessions")
+        assert [s["session_id"] for s in listed.json()["sessions"]] == [session_id]
+
+        client.cookies.clear()
+        database._recent_writes.clear()
+        listed = await client.get("/api/sessions")
+        assert listed.json()["sessions"] == []
+
+    async def test_replayed_write_sets_cookie(self, primary_and_replica):
+        """Test a retry answered from the Idempotency-Key store still opens a read-your-writes window"""
+        client, _ = primary_and_replica
+        headers = {"Idempotency-Key": "replayed-start"}
+        with patch('app.agents.agent_manager.HiddenMessageAgent.initialize_agents') as mock_init:
+            mock_init.return_value = "horizon"
+            first = await client.post("/api/start-session", json={"topic": "oceans"}, headers=headers)
+            client.cookies.clear()
+            database._recent_writes.clear()
+            second = await client.post("/api/start-session", json={"topic": "oceans"}, headers=headers)
+        assert mock_init.call_count == 1
+        assert second.json()["session_id"] == first.json()["session_id"]
+        assert database.READ_STICKY_COOKIE in second.cookies
+
+        listed = await client.get("/api/sessions")
+        assert [s["session_id"] for s in listed.json()["sessions"]] == [first.json()["session_id"]]
+
+    async def test_expired_cookie_is_ignored(self, primary_and_replica):
+        client, primary = primary_and_replica
+        async with primary() as db:
+            db.add(SessionModel(topic="t", secret_word="w", participants={}))
+            await db.commit()
+
+        client.cookies.set(database.READ_STICKY_COOKIE, f"{time.time() - 1:.3f}")
+        listed = await client.get("/api/sessions")
+        assert listed.json()["sessions"] == []
@@ -0,0 +1,178 @@
+"""Tests for the history/status/list response cache"""
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import event
+
+from app.api import routes
+from app.api.schemas import NextTurnResponse
+from app.api.response_cache import (
+    LIST_SCOPE,
+    RESPONSE_CACHE_TTL_SECONDS,
+    CachedBody,
+    InMemoryResponseCache,
+    RedisResponseCache,
+    create_response_cache,
+)
+from app.models import SessionModel
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.unit
+class TestInMemoryResponseCache:
+    """Test bounds, expiry and scope invalidation"""
+
+    async def test_invalidate_drops_every_variant_of_a_scope(self):
+        cache = InMemoryResponseCache()
+        await cache.set("s1", "status", CachedBody(b"{}"))
+        await cache.set("s1", "history:None", CachedBody(b"[]"))
+        await cache.set("s2", "status", CachedBody(b"{}"))
+
+        await cache.invalidate("s1")
+
+        assert await cache.get("s1", "status") is None
+        assert await cache.get("s1", "history:None") is None
+        assert await cache.get("s2", "status") is not None
+
+    async def test_final_entries_outlive_active_ones(self):
+        clock = FakeClock()
+        cache = InMemoryResponseCache(clock=clock)
+        await cache.set("done", "status", CachedBody(b"{}", final=True))
+        await cache.set("active", "status", CachedBody(b"{}"))
+
+        clock.now += 60
+        assert await cache.get("active", "status") is None
+        assert await cache.get("done", "status") is not None
+
+    async def test_lru_bounds(self):
+        cache = InMemoryResponseCache(max_entries=2, max_bytes=10)
+        await cache.set("a", "v", CachedBody(b"1234"))
+        await cache.set("b", "v", CachedBody(b"1234"))
+        await cache.get("a", "v")
+        await cache.set("c", "v", CachedBody(b"1234"))
+
+        assert await cache.get("b", "v") is None
+        assert await cache.get("a", "v") is not None
+
+        await cache.set("d", "v", CachedBody(b"123456789"))
+        assert cache.stats()["bytes"] <= 10
+        assert cache.stats()["evictions"] == 3
+
+    async def test_redis_backend_round_trip(self, fake_redis):
+        cache = RedisResponseCache(fake_redis)
+        entry = CachedBody(b'{"a":1}', etag='"t2-m1-win"', final=True)
+        await cache.set("s1", "status", entry)
+
+        assert await cache.get("s1", "status") == entry
+        assert fake_redis.expiry["hm:response:s1:status"] >= 3600
+
+        await cache.invalidate("s1")
+        assert await cache.get("s1", "status") is None
+        assert fake_redis.data == {}
+
+    async def test_redis_entries_keep_their_own_ttl(self, fake_redis):
+        """Test a final entry written later doesn't extend a stale in-progress one"""
+        cache = RedisResponseCache(fake_redis)
+        await cache.set("s1", "status", CachedBody(b'{"game_over":false}'))
+        await cache.set("s1", "history:None", CachedBody(b"{}", final=True))
+
+        assert fake_redis.expiry["hm:response:s1:status"] == int(RESPONSE_CACHE_TTL_SECONDS)
+        assert fake_redis.expiry["hm:response:s1:history:None"] >= 3600
+        # The scope's index outlives every entry it names
+        assert fake_redis.expiry["hm:response:s1"] > fake_redis.expiry["hm:response:s1:history:None"]
+
+    async def test_redis_outage_is_a_miss(self):
+        client = AsyncMock()
+        client.get.side_effect = ConnectionError("down")
+        assert await RedisResponseCache(client).get("s1", "status") is None
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            create_response_cache("memcached")
+
+
+def _participants(sample_session_data):
+    return {
+        p["id"]: {"provider": p["provider"], "role": p["role"], "name": p["name"]}
+        for p in sample_session_data["participants"]
+    }
+
+
+@pytest.mark.integration
+class TestCachedEndpoints:
+    """Test cached responses, their headers and invalidation by writes"""
+
+    async def _count_queries(self, db_engine, call):
+        statements = []
+
+        def _count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db_engine.sync_engine, "before_cursor_execute", _count)
+        try:
+            response = await call()
+        finally:
+            event.remove(db_engine.sync_engine, "before_cursor_execute", _count)
+        return response, len(statements)
+
+    async def test_completed_history_is_served_from_cache(self, client, db_session, db_engine, sample_session_data):
+        session = SessionModel(
+            topic="t", secret_word="w", participants=_participants(sample_session_data),
+            turn_number=3, message_count=0, game_over=True, game_status="win",
+        )
+        db_session.add(session)
+        await db_session.commit()
+        url = f"/api/session/{session.id}/history"
+
+        first = await client.get(url)
+        assert first.status_code == 200
+        assert first.headers["Cache-Control"].startswith("public, max-age=")
+        assert "immutable" in first.headers["Cache-Control"]
+
+        second, queries = await self._count_queries(db_engine, lambda: client.get(url))
+        assert queries == 0
+        assert second.json() == first.json()
+        assert second.headers["ETag"] == first.headers["ETag"]
+
+        revalidated, queries = await self._count_queries(
+            db_engine, lambda: client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+        )
+        assert revalidated.status_code == 304
+        assert queries == 0
+
+    async def test_active_session_is_not_publicly_cacheable(self, client, db_session, sample_session_data):
+        session = SessionModel(topic="t", secret_word="w", participants=_participants(sample_session_data))
+        db_session.add(session)
+        await db_session.commit()
+
+        status = await client.get(f"/api/session/{session.id}/status")
+        history = await client.get(f"/api/session/{session.id}/history")
+
+        assert status.headers["Cache-Control"] == "no-cache"
+        assert history.headers["Cache-Control"] == "no-cache"
+
+    async def test_next_turn_invalidates_session_and_list(self, client, db_session, sample_session_data):
+        session = SessionModel(topic="t", secret_word="w", participants=_participants(sample_session_data))
+        db_session.add(session)
+        await db_session.commit()
+        session_id = session.id
+
+        await client.get(f"/api/session/{session_id}/status")
+        await client.get("/api/sessions")
+        cache = routes.response_cache
+        assert await cache.get(str(session_id), "status") is not None
+        assert await cache.get(LIST_SCOPE, "list:") is not None
+
+        with patch("app.api.routes._play_turn", AsyncMock(return_value=NextTurnResponse(messages=[]))):
+            response = await client.post("/api/next-turn", json={"session_id": str(session_id)})
+        assert response.status_code == 200
+
+        assert await cache.get(str(session_id), "status") is None
+        assert await cache.get(LIST_SCOPE, "list:") is None
@@ -0,0 +1,151 @@
+"""Tests for full-text search over message comms and internal_thoughts"""
+import pytest
+from sqlalchemy import delete, update
+
+from app.api.search import fts5_query
+from app.core.search_index import ensure_search_index
+from app.models import MessageModel, SessionModel, SessionParticipantModel
+
+PARTICIPANTS = (
+    ("p1", "openai", "communicator", "Alice"),
+    ("p2", "anthropic", "receiver", "Bob"),
+)
+
+
+async def _seed(db_session, topic, messages):
+    """`messages` is a list of (participant_id, comms, internal_thoughts)"""
+    session = SessionModel(
+        topic=topic, secret_word="horizon",
+        participants={pid: {"provider": p, "role": r, "name": n} for pid, p, r, n in PARTICIPANTS},
+    )
+    db_session.add(session)
+    await db_session.flush()
+    for order, (pid, provider, role, name) in enumerate(PARTICIPANTS):
+        db_session.add(SessionParticipantModel(
+            session_id=session.id, participant_id=pid, provider=provider, role=role, name=name, order=order,
+        ))
+    for turn, (pid, comms, thoughts) in enumerate(messages, start=1):
+        db_session.add(MessageModel(
+            session_id=session.id, turn=turn, participant_id=pid, comms=comms, internal_thoughts=thoughts,
+        ))
+    await db_session.commit()
+    return session
+
+
+@pytest.fixture
+async def search_index(db_engine):
+    async with db_engine.begin() as conn:
+        assert await ensure_search_index(conn)
+        assert not await ensure_search_index(conn)
+
+
+@pytest.mark.unit
+class TestFts5Query:
+    """Test translating websearch-style input to FTS5"""
+
+    @pytest.mark.parametrize("q, expected", [
+        ("acrostic", '"acrostic"'),
+        ('first letters "read down"', '"first" AND "letters" AND "read down"'),
+        ("acrostic -poem", '"acrostic" NOT "poem"'),
+        ('say "a""b" OR', '"say" AND "a" AND "b" AND "OR"'),
+        ("-poem", None),
+        ('""', None),
+    ])
+    def test_translation(self, q, expected):
+        assert fts5_query(q) == expected
+
+
+@pytest.mark.integration
+class TestSearchEndpoint:
+    """Test /api/search on the SQLite FTS5 index"""
+
+    async def test_ranks_comms_matches_first_and_stems(self, client, db_session, search_index):
+        session = await _seed(db_session, "ocean", [
+            ("p1", "Hidden acrostics in every line", "plan"),
+            ("p2", "No idea", "could this be an acrostic?"),
+            ("p1", "The weather is nice", "nothing to see"),
+        ])
+
+        response = await client.get("/api/search", params={"q": "acrostic"})
+
+        assert response.status_code == 200
+        hits = response.json()["hits"]
+        assert [hit["turn"] for hit in hits] == [1, 2]
+        assert hits[0]["score"] > hits[1]["score"]
+        assert hits[0]["session_id"] == str(session.id)
+        assert hits[0]["topic"] == "ocean"
+        assert (hits[0]["participant_name"], hits[0]["participant_role"], hits[0]["provider"]) == (
+            "Alice", "communicator", "openai",
+        )
+        assert response.json()["next_cursor"] is None
+
+    async def test_filters_and_exclusions(self, client, db_session, search_index):
+        await _seed(db_session, "ocean", [
+            ("p1", "acrostic poem", ""),
+            ("p2", "acrostic guess", ""),
+        ])
+
+        by_role = (await client.get("/api/search", params={"q": "acrostic", "role": "receiver"})).json()
+        assert [hit["comms"] for hit in by_role["hits"]] == ["acrostic guess"]
+        by_provider = (await client.get("/api/search", params={"q": "acrostic", "provider": "openai"})).json()
+        assert [hit["comms"] for hit in by_provider["hits"]] == ["acrostic poem"]
+        excluded = (await client.get("/api/search", params={"q": "acrostic -poem"})).json()
+        assert [hit["comms"] for hit in excluded["hits"]] == ["acrostic guess"]
+        phrase = (await client.get("/api/search", params={"q": '"poem acrostic"'})).json()
+        assert phrase["hits"] == []
+
+    async def test_keyset_pagination_covers_every_hit_once(self, client, db_session, search_index):
+        await _seed(db_session, "a", [("p1", f"acrostic number {i}", "acrostic " * (i % 3)) for i in range(7)])
+
+        seen, cursor = [], None
+        while True:
+            params = {"q": "acrostic", "limit": 3, **({"cursor": cursor} if cursor else {})}
+            page = (await client.get("/api/search", params=params)).json()
+            seen.extend(hit["message_id"] for hit in page["hits"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert len(seen) == len(set(seen)) == 7
+        assert (await client.get("/api/search", params={"q": "acrostic", "cursor": "bad"})).status_code == 400
+
+    async def test_index_follows_updates_and_deletes(self, client, db_session, search_index):
+        session = await _seed(db_session, "ocean", [("p1", "acrostic", ""), ("p1", "plain", "")])
+
+        await db_session.execute(
+            update(MessageModel).where(MessageModel.turn == 2).values(comms="now an acrostic too")
+        )
+        await db_session.execute(delete(MessageModel).where(MessageModel.turn == 1))
+        await db_session.commit()
+
+        hits = (await client.get("/api/search", params={"q": "acrostic"})).json()["hits"]
+        assert [hit["comms"] for hit in hits] == ["now an acrostic too"]
+        assert hits[0]["session_id"] == str(session.id)
+
+    async def test_index_survives_renumbered_message_rowids(self, client, db_engine, db_session, search_index):
+        """Test the index does not depend on messages.rowid, which VACUUM may change"""
+        await _seed(db_session, "ocean", [("p1", "acrostic one", ""), ("p1", "acrostic two", ""), ("p1", "plain", "")])
+        async with db_engine.begin() as conn:
+            # What VACUUM is allowed to do to a table without an INTEGER PRIMARY KEY
+            await conn.exec_driver_sql("UPDATE messages SET rowid = 1000 - rowid")
+
+        hits = (await client.get("/api/search", params={"q": "acrostic"})).json()["hits"]
+        assert sorted(hit["comms"] for hit in hits) == ["acrostic one", "acrostic two"]
+
+        await db_session.execute(delete(MessageModel).where(MessageModel.comms == "acrostic one"))
+        await db_session.commit()
+        async with db_engine.begin() as conn:
+            await conn.exec_driver_sql("INSERT INTO messages_fts(messages_fts, rank) VALUES ('integrity-check', 1)")
+        hits = (await client.get("/api/search", params={"q": "acrostic"})).json()["hits"]
+        assert [hit["comms"] for hit in hits] == ["acrostic two"]
+
+    async def test_existing_rows_are_indexed_when_created(self, client, db_engine, db_session):
+        await _seed(db_session, "ocean", [("p1", "an acrostic from before the index", "")])
+        async with db_engine.begin() as conn:
+            await ensure_search_index(conn)
+
+        hits = (await client.get("/api/search", params={"q": "acrostic"})).json()["hits"]
+        assert len(hits) == 1
+
+    async def test_query_required(self, client):
+        assert (await client.get("/api/search")).status_code == 422
@@ -0,0 +1,116 @@
+"""Tests for response encoding, MessagePack negotiation and compression"""
+import gzip
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.api import serialization
+from app.api.http_cache import choose_encoding, compress
+from app.api.schemas import SessionListItem, SessionListResponse
+from app.api.serialization import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, dumps, negotiate_media_type
+from app.models import MessageModel, SessionModel
+
+
+@pytest.mark.unit
+class TestEncoding:
+    """Test plain-dict encoding matches the Pydantic models it replaces"""
+
+    @pytest.mark.parametrize("created_at", [
+        datetime(2026, 10, 19, 12, 30, 5, 123456),
+        datetime(2026, 10, 19, 12, 30, 5, tzinfo=timezone.utc),
+    ])
+    def test_matches_pydantic(self, created_at):
+        item = {
+            "session_id": uuid4(),
+            "topic": "oceans — deep",
+            "created_at": created_at,
+            "message_count": 3,
+            "game_over": False,
+            "game_status": None,
+        }
+        expected = SessionListResponse(sessions=[SessionListItem(**item)], next_cursor=None)
+        assert dumps({"sessions": [item], "next_cursor": None}) == expected.model_dump_json().encode("utf-8")
+
+    def test_stdlib_fallback_matches(self, monkeypatch):
+        payload = {"id": uuid4(), "at": datetime(2026, 10, 19, tzinfo=timezone.utc), "text": "café"}
+        fast = dumps(payload)
+        monkeypatch.setattr(serialization, "orjson", None)
+        assert dumps(payload) == fast
+
+    def test_negotiation(self, monkeypatch):
+        monkeypatch.setattr(serialization, "msgpack", object())
+        assert negotiate_media_type(None) == JSON_MEDIA_TYPE
+        assert negotiate_media_type("*/*") == JSON_MEDIA_TYPE
+        assert negotiate_media_type("application/msgpack") == MSGPACK_MEDIA_TYPE
+        assert negotiate_media_type("application/json, application/x-msgpack;q=0.5") == JSON_MEDIA_TYPE
+        monkeypatch.setattr(serialization, "msgpack", None)
+        assert negotiate_media_type("application/msgpack") == JSON_MEDIA_TYPE
+
+    def test_choose_encoding(self):
+        assert choose_encoding(None) is None
+        assert choose_encoding("identity") is None
+        assert choose_encoding("gzip, deflate") == "gzip"
+        assert choose_encoding("gzip;q=0") is None
+        assert choose_encoding("*") in ("br", "gzip")
+
+    def test_gzip_round_trip_is_deterministic(self):
+        body = b'{"a":1}' * 500
+        assert compress(body, "gzip") == compress(body, "gzip")
+        assert gzip.decompress(compress(body, "gzip")) == body
+
+
+@pytest.mark.integration
+class TestNegotiatedResponses:
+    """Test compression and MessagePack on the history endpoint"""
+
+    async def _seed(self, db_session, turns=20):
+        session = SessionModel(
+            topic="t", secret_word="w",
+            participants={"a": {"provider": "openai", "role": "communicator", "name": "A"}},
+            turn_number=turns + 1, message_count=turns,
+        )
+        db_session.add(session)
+        await db_session.flush()
+        for turn in range(1, turns + 1):
+            db_session.add(MessageModel(
+                session_id=session.id, turn=turn, participant_id="a",
+                comms=f"message {turn}", internal_thoughts="thinking it over " * 20,
+            ))
+        await db_session.commit()
+        return session
+
+    async def test_large_history_is_gzipped(self, client, db_session):
+        session = await self._seed(db_session)
+        url = f"/api/session/{session.id}/history"
+
+        plain = await client.get(url, headers={"Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in plain.headers
+
+        response = await client.get(url, headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["ETag"] == "W/" + plain.headers["ETag"]
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert int(response.headers["Content-Length"]) < len(plain.content)
+        # httpx decodes the body transparently
+        assert response.json() == plain.json()
+
+        revalidated = await client.get(
+            url, headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["ETag"]}
+        )
+        assert revalidated.status_code == 304
+
+    async def test_small_bodies_are_not_compressed(self, client, db_session):
+        session = await self._seed(db_session, turns=0)
+        response = await client.get(f"/api/session/{session.id}/status", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in response.headers
+
+    async def test_msgpack(self, client, db_session):
+        msgpack = pytest.importorskip("msgpack")
+        session = await self._seed(db_session)
+        url = f"/api/session/{session.id}/history"
+
+        as_json = (await client.get(url)).json()
+        response = await client.get(url, headers={"Accept": "application/msgpack"})
+        assert response.headers["content-type"] == MSGPACK_MEDIA_TYPE
+        assert msgpack.unpackb(response.content) == as_json
@@ -0,0 +1,218 @@
+"""Tests for archiving finished sessions into the transcript store"""
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+
+from app.api.response_cache import InMemoryResponseCache
+from app.core.session_archive import _candidates, archive_sessions
+from app.core.transcript_store import INDEX_FILE, TranscriptCorrupted, TranscriptStore
+from app.models import (
+    GuessModel,
+    LLMCallEventModel,
+    MessageModel,
+    SessionEventModel,
+    SessionModel,
+)
+
+NOW = datetime(2026, 10, 19, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TranscriptStore(tmp_path / "transcripts")
+    with patch("app.api.routes.get_transcript_store", lambda: store):
+        yield store
+    store.close()
+
+
+async def _seed(db_session, topic, *, finished_days_ago=None, turns=3):
+    participants = {
+        "p1": {"provider": "openai", "role": "communicator", "name": "Alice"},
+        "p2": {"provider": "anthropic", "role": "receiver", "name": "Bob"},
+    }
+    updated = NOW - timedelta(days=finished_days_ago or 0)
+    session = SessionModel(
+        topic=topic, secret_word="horizon", participants=participants, tries_remaining={"p2": 2},
+        game_over=finished_days_ago is not None, game_status="loss" if finished_days_ago is not None else None,
+        turn_number=turns + 1, message_count=turns,
+        created_at=updated - timedelta(hours=1), updated_at=updated,
+    )
+    db_session.add(session)
+    await db_session.flush()
+    for turn in range(1, turns + 1):
+        db_session.add(MessageModel(
+            session_id=session.id, turn=turn, participant_id="p1",
+            comms=f"{topic} {turn}", internal_thoughts=f"thinking {turn}",
+        ))
+    db_session.add(GuessModel(
+        session_id=session.id, turn=turns, participant_id="p2", guess="sunset", correct=False, tries_remaining=2,
+    ))
+    db_session.add(LLMCallEventModel(
+        session_id=session.id, provider="openai", status="success", created_at=updated, request_payload={"turn": 1},
+    ))
+    db_session.add(SessionEventModel(session_id=session.id, seq=1, turn=1, kind="message", payload={"turn": 1}))
+    await db_session.commit()
+    return session
+
+
+async def _count(db_session, model, session_id):
+    query = select(func.count()).select_from(model).where(model.session_id == session_id)
+    return (await db_session.execute(query)).scalar_one()
+
+
+@pytest.mark.unit
+class TestTranscriptStore:
+    """Test the append-only transcript files"""
+
+    def test_round_trip_and_last_record_wins(self, tmp_path):
+        store = TranscriptStore(tmp_path)
+        first, second = uuid4(), uuid4()
+        written = store.append_many({first: {"topic": "a", "messages": [{"turn": 1}]}, second: {"topic": "b"}})
+
+        assert written == (tmp_path / "transcripts.dat").stat().st_size
+        assert store.get(first) == {"topic": "a", "messages": [{"turn": 1}]}
+        assert store.get(uuid4()) is None
+
+        store.append_many({first: {"topic": "again"}})
+        assert store.get(first) == {"topic": "again"}
+        assert len(store) == 2
+
+        # A second reader (another worker) sees the same records
+        assert TranscriptStore(tmp_path).get(second) == {"topic": "b"}
+
+    def test_torn_index_entry_is_ignored_then_overwritten(self, tmp_path):
+        store = TranscriptStore(tmp_path)
+        kept = uuid4()
+        store.append_many({kept: {"topic": "kept"}})
+        with open(tmp_path / INDEX_FILE, "ab") as index:
+            index.write(b"\x00" * 7)
+
+        reader = TranscriptStore(tmp_path)
+        assert len(reader) == 1
+
+        later = uuid4()
+        store.append_many({later: {"topic": "later"}})
+        assert reader.get(later) == {"topic": "later"}
+        assert reader.get(kept) == {"topic": "kept"}
+
+    def test_corrupted_record_is_detected(self, tmp_path):
+        store = TranscriptStore(tmp_path)
+        session_id = uuid4()
+        store.append_many({session_id: {"topic": "x" * 100}})
+        data = bytearray((tmp_path / "transcripts.dat").read_bytes())
+        data[-1] ^= 0xFF
+        (tmp_path / "transcripts.dat").write_bytes(bytes(data))
+
+        with pytest.raises(TranscriptCorrupted):
+            TranscriptStore(tmp_path).get(session_id)
+
+
+@pytest.mark.unit
+class TestCandidates:
+    """Test the query selecting sessions to archive"""
+
+    def test_unbounded_query_compiles_for_postgres(self):
+        from sqlalchemy.dialects import postgresql
+
+        sql = str(_candidates(NOW).compile(dialect=postgresql.dialect()))
+        assert "LIMIT" not in sql
+        assert "LIMIT" in str(_candidates(NOW, 10).compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.integration
+class TestArchiveSessions:
+    """Test the archive job and reading archived history through the API"""
+
+    async def test_archives_only_old_finished_sessions(self, db_engine, db_session, store):
+        old = (await _seed(db_session, "old", finished_days_ago=40)).id
+        recent = (await _seed(db_session, "recent", finished_days_ago=5)).id
+        active = (await _seed(db_session, "active")).id
+
+        planned = await archive_sessions(db_engine, store, older_than_days=30, dry_run=True, now=NOW)
+        assert (planned.sessions, planned.messages, planned.guesses) == (1, 3, 1)
+        assert len(store) == 0
+
+        report = await archive_sessions(db_engine, store, older_than_days=30, batch_size=1, now=NOW)
+
+        assert (report.sessions, report.messages, report.guesses, report.llm_call_events) == (1, 3, 1, 1)
+        assert report.bytes_written > 0
+        db_session.expire_all()
+        for model in (MessageModel, GuessModel, LLMCallEventModel, SessionEventModel):
+            assert await _count(db_session, model, old) == 0
+            assert await _count(db_session, model, recent) > 0
+            assert await _count(db_session, model, active) > 0
+
+        row = await db_session.get(SessionModel, old)
+        assert row.archived_at is not None
+        assert row.updated_at.replace(tzinfo=timezone.utc) == NOW - timedelta(days=40)
+        transcript = store.get(old)
+        assert [m["comms"] for m in transcript["messages"]] == ["old 1", "old 2", "old 3"]
+        assert transcript["llm_call_events"][0]["request_payload"] == {"turn": 1}
+
+        again = await archive_sessions(db_engine, store, older_than_days=30, now=NOW)
+        assert again.sessions == 0
+
+    async def test_history_reads_archived_transcript(self, client, db_engine, db_session, store):
+        session = await _seed(db_session, "old", finished_days_ago=40)
+        url = f"/api/session/{session.id}/history"
+        # Read the row back as the API would, not from the objects just added
+        db_session.expire_all()
+        before = {
+            "full": (await client.get(url)).json(),
+            "since": (await client.get(url, params={"since_turn": 2})).json(),
+            "stream": (await client.get(f"{url}/stream")).text,
+            "etag": (await client.get(url)).headers["ETag"],
+        }
+
+        await archive_sessions(db_engine, store, older_than_days=30, now=NOW)
+        db_session.expire_all()
+
+        with patch("app.api.routes.response_cache", InMemoryResponseCache()):
+            full = await client.get(url)
+            assert full.status_code == 200
+            assert full.json() == before["full"]
+            assert full.headers["ETag"] == before["etag"]
+            assert (await client.get(url, params={"since_turn": 2})).json() == before["since"]
+
+            stream = await client.get(f"{url}/stream")
+            assert stream.text == before["stream"]
+            lines = [json.loads(line) for line in (
+                await client.get(f"{url}/stream", params={"include_thoughts": "false"})
+            ).text.splitlines()]
+            assert [line["type"] for line in lines] == ["session", "message", "message", "message", "guess"]
+            assert "internal_thoughts" not in lines[1]
+
+    async def test_transcript_is_read_off_the_event_loop(self, client, db_engine, db_session, store):
+        session_id = (await _seed(db_session, "old", finished_days_ago=40)).id
+        await archive_sessions(db_engine, store, older_than_days=30, now=NOW)
+        db_session.expire_all()
+
+        loop_thread = threading.get_ident()
+        reader_threads = []
+        original_get = store.get
+
+        def recording_get(session_id):
+            reader_threads.append(threading.get_ident())
+            return original_get(session_id)
+
+        url = f"/api/session/{session_id}/history"
+        with patch.object(store, "get", recording_get), \
+                patch("app.api.routes.response_cache", InMemoryResponseCache()):
+            assert (await client.get(url)).status_code == 200
+            assert (await client.get(f"{url}/stream")).status_code == 200
+
+        assert len(reader_threads) == 2
+        assert loop_thread not in reader_threads
+
+    async def test_missing_transcript_is_unavailable(self, client, db_session, store):
+        session = await _seed(db_session, "lost", finished_days_ago=40)
+        session.archived_at = NOW
+        await db_session.commit()
+
+        response = await client.get(f"/api/session/{session.id}/history")
+        assert response.status_code == 503
@@ -0,0 +1,214 @@
+"""Tests for the pluggable SessionState stores"""
+from unittest.mock import AsyncMock, patch
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.api.session_state import SessionState, active_sessions
+from app.api.session_store import (
+    DatabaseSessionStore,
+    InMemorySessionStore,
+    RedisSessionStore,
+    create_session_store,
+    deserialize_state,
+    serialize_state,
+)
+
+
+def _state(**overrides):
+    values = dict(
+        session_id=uuid4(),
+        topic="space exploration",
+        secret_word="horizon",
+        participants=[{"id": "r", "role": "receiver", "provider": "openai", "order": 1, "name": "Bob"}],
+        conversation_history=[{"participant_id": "system", "comms": "Guess from Bob: 'x'. Result: Incorrect."}],
+        turn_number=3,
+        tries_remaining={"r": 2},
+        event_seq=7,
+        snapshot_turn=1,
+    )
+    values.update(overrides)
+    return SessionState(**values)
+
+
+@pytest.mark.unit
+class TestSerialization:
+    """Test SessionState round-trips through the shared-store encoding"""
+
+    def test_round_trip(self):
+        state = _state(game_over=True, game_status="loss")
+        assert deserialize_state(serialize_state(state)) == state
+
+    def test_unknown_backend_rejected(self):
+        with pytest.raises(ValueError):
+            create_session_store("memcached")
+
+
+@pytest.mark.unit
+class TestStores:
+    """Test the store backends in isolation"""
+
+    @pytest.mark.asyncio
+    async def test_memory_store_wraps_active_sessions(self):
+        store = InMemorySessionStore()
+        state = _state()
+        try:
+            await store.put(state)
+            assert active_sessions[state.session_id] is state
+            assert await store.get(state.session_id) is state
+        finally:
+            await store.delete(state.session_id)
+        assert state.session_id not in active_sessions
+
+    @pytest.mark.asyncio
+    async def test_redis_store_returns_copies_with_ttl(self, fake_redis):
+        store = RedisSessionStore(fake_redis, ttl_seconds=60)
+        state = _state()
+
+        await store.put(state)
+        assert fake_redis.expiry[f"hm:session:{state.session_id}"] == 60
+
+        loaded = await store.get(state.session_id)
+        assert loaded == state and loaded is not state
+
+        await store.delete(state.session_id)
+        assert await store.get(state.session_id) is None
+
+
+@pytest.mark.unit
+class TestInMemoryEviction:
+    """Test the bounds on the in-memory store"""
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_session_is_evicted(self):
+        store = InMemorySessionStore({}, max_sessions=2, max_bytes=0, idle_ttl_seconds=0)
+        first, second, third = _state(), _state(), _state()
+        await store.put(first)
+        await store.put(second)
+        await store.get(first.session_id)
+        await store.put(third)
+
+        assert await store.get(second.session_id) is None
+        assert await store.get(first.session_id) is first
+        assert store.stats()["evictions"]["capacity"] == 1
+        assert store.stats()["resident_sessions"] == 2
+
+    @pytest.mark.asyncio
+    async def test_memory_budget(self):
+        size = len(serialize_state(_state()))
+        store = InMemorySessionStore({}, max_sessions=0, max_bytes=size * 2, idle_ttl_seconds=0)
+        states = [_state() for _ in range(3)]
+        for state in states:
+            await store.put(state)
+
+        stats = store.stats()
+        assert stats["resident_sessions"] == 2
+        assert stats["estimated_bytes"] <= size * 2
+        assert stats["evictions"]["memory"] == 1
+        assert await store.get(states[0].session_id) is None
+
+    @pytest.mark.asyncio
+    async def test_idle_sessions_expire(self):
+        now = [0.0]
+        store = InMemorySessionStore({}, max_sessions=0, max_bytes=0, idle_ttl_seconds=60, clock=lambda: now[0])
+        stale, fresh = _state(), _state()
+        await store.put(stale)
+        now[0] = 45
+        await store.put(fresh)
+        now[0] = 90
+
+        assert await store.get(stale.session_id) is None
+        assert await store.get(fresh.session_id) is fresh
+        assert store.stats()["evictions"]["idle"] == 1
+
+    @pytest.mark.asyncio
+    async def test_finished_games_are_demoted(self):
+        store = InMemorySessionStore({})
+        state = _state()
+        await store.put(state)
+        state.game_over, state.game_status = True, "win"
+        await store.put(state)
+
+        assert await store.get(state.session_id) is None
+        stats = store.stats()
+        assert stats["evictions"]["game_over"] == 1
+        assert stats["estimated_bytes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint(self, client):
+        store = InMemorySessionStore({})
+        await store.put(_state())
+        with patch('app.api.metrics.session_store', store):
+            data = (await client.get("/api/metrics/session-store")).json()
+
+        assert data["backend"] == "memory"
+        assert data["resident_sessions"] == 1
+        assert data["estimated_bytes"] > 0
+
+
+@pytest.mark.integration
+class TestSharedStoreEndpoints:
+    """Test the API against stores shared between workers"""
+
+    async def _start(self, client):
+        with patch('app.api.routes.agent_manager') as mock_manager:
+            mock_manager.initialize_agents = AsyncMock(return_value="horizon")
+            response = await client.post("/api/start-session", json={"topic": "space exploration"})
+        assert response.status_code == 200
+        data = response.json()
+        return UUID(data["session_id"]), data["participants"][0]["id"]
+
+    async def _turn(self, client, session_id, result):
+        with patch('app.api.routes.agent_manager') as mock_manager:
+            mock_manager.initialize_agents = AsyncMock(return_value="horizon")
+            mock_manager.agents = {}
+            mock_manager.run_conversation_turn = AsyncMock(return_value=result)
+            return await client.post("/api/next-turn", json={"session_id": str(session_id)})
+
+    @pytest.mark.asyncio
+    async def test_turns_are_published_to_redis(self, client, fake_redis):
+        store = RedisSessionStore(fake_redis)
+        with patch('app.api.routes.session_store', store):
+            session_id, participant_id = await self._start(client)
+            for turn in (1, 2):
+                response = await self._turn(client, session_id, {
+                    "messages": [{"participant_id": participant_id, "comms": f"turn {turn}", "internal_thoughts": "", "guess": None}],
+                    "errors": [],
+                })
+                assert response.status_code == 200
+
+            shared = await store.get(session_id)
+            assert shared.turn_number == 3
+            assert [m["comms"] for m in shared.conversation_history] == ["turn 1", "turn 2"]
+            assert session_id not in active_sessions
+
+            status = (await client.get(f"/api/session/{session_id}/status")).json()
+            assert status["turn_number"] == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_turn_evicts_shared_state(self, client, fake_redis):
+        store = RedisSessionStore(fake_redis)
+        with patch('app.api.routes.session_store', store):
+            session_id, _ = await self._start(client)
+            response = await self._turn(client, session_id, {"messages": [], "errors": ["boom"]})
+
+        assert response.status_code == 503
+        assert await store.get(session_id) is None
+
+    @pytest.mark.asyncio
+    async def test_database_store_rehydrates_every_request(self, client, db_engine):
+        store = DatabaseSessionStore(sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False))
+        with patch('app.api.routes.session_store', store):
+            session_id, participant_id = await self._start(client)
+            response = await self._turn(client, session_id, {
+                "messages": [{"participant_id": participant_id, "comms": "hello", "internal_thoughts": "", "guess": None}],
+                "errors": [],
+            })
+            assert response.status_code == 200
+
+        state = await store.get(session_id)
+        assert state.turn_number == 2
+        assert state.conversation_history[0]["comms"] == "hello"
+        assert session_id not in active_sessions
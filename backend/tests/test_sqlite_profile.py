@@ -0,0 +1,109 @@
+"""Tests for the file-backed SQLite profile (WAL, single writer, read pool)"""
+import asyncio
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, SessionModel
+from app.models.database import (
+    SQLITE_BUSY_TIMEOUT_MS,
+    configure_sqlite,
+    engine_options,
+    is_sqlite_file,
+)
+
+
+@pytest.fixture
+async def sqlite_engines(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'demo.db'}"
+    writer = create_async_engine(url, **engine_options(url))
+    reader = create_async_engine(url, **engine_options(url, read_only=True))
+    configure_sqlite(writer)
+    configure_sqlite(reader, read_only=True)
+    async with writer.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield writer, reader
+    await reader.dispose()
+    await writer.dispose()
+
+
+@pytest.mark.unit
+class TestEngineOptions:
+    """Test pool settings per backend"""
+
+    def test_sqlite_file_gets_one_writer(self):
+        url = "sqlite+aiosqlite:///./demo.db"
+        assert is_sqlite_file(url)
+        assert engine_options(url)["pool_size"] == 1
+        assert engine_options(url)["max_overflow"] == 0
+        assert engine_options(url, read_only=True)["pool_size"] > 1
+
+    def test_memory_database_keeps_default_pool(self):
+        assert not is_sqlite_file("sqlite+aiosqlite:///:memory:")
+        assert engine_options("sqlite+aiosqlite:///:memory:") == {}
+
+
+@pytest.mark.integration
+class TestSQLiteProfile:
+    """Test pragmas and concurrent writes on a file database"""
+
+    async def test_pragmas_applied_on_connect(self, sqlite_engines):
+        writer, reader = sqlite_engines
+        async with writer.connect() as conn:
+            assert (await conn.exec_driver_sql("PRAGMA journal_mode")).scalar() == "wal"
+            assert (await conn.exec_driver_sql("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert (await conn.exec_driver_sql("PRAGMA busy_timeout")).scalar() == SQLITE_BUSY_TIMEOUT_MS
+        async with reader.connect() as conn:
+            assert (await conn.exec_driver_sql("PRAGMA query_only")).scalar() == 1
+
+    async def test_read_pool_rejects_writes(self, sqlite_engines):
+        _, reader = sqlite_engines
+        async with reader.connect() as conn:
+            with pytest.raises(OperationalError):
+                await conn.execute(text("INSERT INTO sessions (id, topic, secret_word) VALUES ('x', 't', 'w')"))
+
+    async def test_concurrent_writes_queue_instead_of_locking(self, sqlite_engines):
+        writer, reader = sqlite_engines
+        write_session = sessionmaker(writer, class_=AsyncSession, expire_on_commit=False)
+        read_session = sessionmaker(reader, class_=AsyncSession, expire_on_commit=False)
+
+        async def write(i):
+            async with write_session() as db:
+                db.add(SessionModel(topic=f"topic {i}", secret_word="w", participants={}))
+                await db.commit()
+
+        async def read():
+            async with read_session() as db:
+                return (await db.execute(select(func.count(SessionModel.id)))).scalar_one()
+
+        results = await asyncio.gather(*(write(i) for i in range(30)), *(read() for _ in range(10)))
+
+        assert all(isinstance(r, int) for r in results[30:])
+        assert await read() == 30
+
+    async def test_nested_write_session_waits_for_the_only_connection(self, tmp_path):
+        """Test the single-writer hazard: a second write session in the same task cannot get a connection"""
+        url = f"sqlite+aiosqlite:///{tmp_path / 'nested.db'}"
+        writer = create_async_engine(url, **{**engine_options(url), "pool_timeout": 0.2})
+        configure_sqlite(writer)
+        async with writer.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        write_session = sessionmaker(writer, class_=AsyncSession, expire_on_commit=False)
+
+        try:
+            async with write_session() as outer:
+                outer.add(SessionModel(topic="outer", secret_word="w", participants={}))
+                await outer.flush()  # checks out the writer connection until commit
+                async with write_session() as inner:
+                    with pytest.raises(PoolTimeoutError):
+                        await inner.execute(select(func.count(SessionModel.id)))
+                await outer.commit()
+
+            # Once the first session has committed, the next one gets the connection
+            async with write_session() as inner:
+                assert (await inner.execute(select(func.count(SessionModel.id)))).scalar_one() == 1
+        finally:
+            await writer.dispose()
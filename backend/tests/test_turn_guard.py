@@ -0,0 +1,166 @@
+"""Tests for per-session turn serialization"""
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app.api.session_state import active_sessions
+from app.models import MessageModel, SessionModel
+from app.models.database import utcnow
+
+
+async def _seed(db_session, sample_session_data):
+    session = SessionModel(
+        topic=sample_session_data["topic"],
+        secret_word=sample_session_data["secret_word"],
+        participants={
+            p["id"]: {"provider": p["provider"], "role": p["role"], "name": p["name"]}
+            for p in sample_session_data["participants"]
+        },
+    )
+    db_session.add(session)
+    await db_session.commit()
+    return session
+
+
+def _turn_result(sample_session_data):
+    return {
+        "messages": [{
+            "participant_id": sample_session_data["participants"][0]["id"],
+            "comms": "Look at the horizon",
+            "internal_thoughts": "hint",
+            "guess": None,
+        }],
+        "errors": [],
+    }
+
+
+async def _message_count(db_session, session_id):
+    return (await db_session.execute(
+        select(func.count()).select_from(MessageModel).where(MessageModel.session_id == session_id)
+    )).scalar_one()
+
+
+@pytest.mark.integration
+class TestTurnSerialization:
+    """Test that concurrent next-turn calls play a turn exactly once"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_turn(self, client, db_session, sample_session_data):
+        session = await _seed(db_session, sample_session_data)
+        release = asyncio.Event()
+
+        async def slow_turn(**kwargs):
+            await release.wait()
+            return _turn_result(sample_session_data)
+
+        try:
+            with patch('app.api.routes.agent_manager') as mock_manager:
+                mock_manager.initialize_agents = AsyncMock(return_value="horizon")
+                mock_manager.run_conversation_turn = AsyncMock(side_effect=slow_turn)
+                first = asyncio.create_task(client.post("/api/next-turn", json={"session_id": str(session.id)}))
+                second = asyncio.create_task(client.post("/api/next-turn", json={"session_id": str(session.id)}))
+                await asyncio.sleep(0.05)
+                release.set()
+                responses = await asyncio.gather(first, second)
+
+            assert [r.status_code for r in responses] == [200, 200]
+            assert responses[0].json() == responses[1].json()
+            assert mock_manager.run_conversation_turn.await_count == 1
+            assert await _message_count(db_session, session.id) == 1
+        finally:
+            active_sessions.pop(session.id, None)
+
+    @pytest.mark.asyncio
+    async def test_turn_held_by_another_worker_conflicts(self, client, db_session, sample_session_data):
+        session = await _seed(db_session, sample_session_data)
+        session.turn_started_at = utcnow()
+        await db_session.commit()
+
+        try:
+            with patch('app.api.routes.agent_manager') as mock_manager:
+                mock_manager.initialize_agents = AsyncMock(return_value="horizon")
+                mock_manager.run_conversation_turn = AsyncMock(return_value=_turn_result(sample_session_data))
+                response = await client.post("/api/next-turn", json={"session_id": str(session.id)})
+
+            assert response.status_code == 409
+            mock_manager.run_conversation_turn.assert_not_awaited()
+            assert session.id not in active_sessions
+        finally:
+            active_sessions.pop(session.id, None)
+
+    @pytest.mark.asyncio
+    async def test_losing_the_lease_mid_turn_writes_nothing(self, client, db_session, sample_session_data):
+        session = await _seed(db_session, sample_session_data)
+        session_id = session.id  # the route's rollback expires the instance
+
+        async def overtaken(**kwargs):
+            # Another worker reclaims the turn while our models are running
+            await db_session.execute(
+                update(SessionModel)
+                .where(SessionModel.id == session_id)
+                .values(turn_token=uuid4(), turn_started_at=utcnow())
+            )
+            await db_session.commit()
+            return _turn_result(sample_session_data)
+
+        try:
+            with patch('app.api.routes.agent_manager') as mock_manager:
+                mock_manager.initialize_agents = AsyncMock(return_value="horizon")
+                mock_manager.run_conversation_turn = AsyncMock(side_effect=overtaken)
+                response = await client.post("/api/next-turn", json={"session_id": str(session_id)})
+
+            assert response.status_code == 409
+            assert await _message_count(db_session, session_id) == 0
+            await db_session.refresh(session)
+            assert session.turn_number == 1
+        finally:
+            active_sessions.pop(session_id, None)
+
+    @pytest.mark.asyncio
+    async def test_reclaim_with_the_same_timestamp_is_told_apart(self, client, db_session, sample_session_data):
+        """Test ownership follows the lease token, not turn_started_at, which two claims can share"""
+        session = await _seed(db_session, sample_session_data)
+        session_id = session.id
+
+        async def overtaken(**kwargs):
+            # Another worker's claim lands on exactly the same timestamp
+            await db_session.execute(
+                update(SessionModel).where(SessionModel.id == session_id).values(turn_token=uuid4())
+            )
+            await db_session.commit()
+            return _turn_result(sample_session_data)
+
+        try:
+            with patch('app.api.routes.agent_manager') as mock_manager:
+                mock_manager.initialize_agents = AsyncMock(return_value="horizon")
+                mock_manager.run_conversation_turn = AsyncMock(side_effect=overtaken)
+                response = await client.post("/api/next-turn", json={"session_id": str(session_id)})
+
+            assert response.status_code == 409
+            assert await _message_count(db_session, session_id) == 0
+        finally:
+            active_sessions.pop(session_id, None)
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_reclaimed(self, client, db_session, sample_session_data):
+        session = await _seed(db_session, sample_session_data)
+        session.turn_started_at = utcnow() - timedelta(hours=1)
+        await db_session.commit()
+
+        try:
+            with patch('app.api.routes.agent_manager') as mock_manager:
+                mock_manager.initialize_agents = AsyncMock(return_value="horizon")
+                mock_manager.run_conversation_turn = AsyncMock(return_value=_turn_result(sample_session_data))
+                response = await client.post("/api/next-turn", json={"session_id": str(session.id)})
+
+            assert response.status_code == 200
+            await db_session.refresh(session)
+            assert session.turn_number == 2
+            assert session.turn_token is None
+            assert session.turn_started_at is None
+        finally:
+            active_sessions.pop(session.id, None)
@@ -30,6 +30,14 @@ const resolveApiBaseUrl = (): string => {
 
 const API_BASE_URL = resolveApiBaseUrl();
 
+// Send and accept cookies cross-origin (the dev UI on :5173 calls the API on :8000).
+// Writes set hm_read_primary; reads must send it back so they are routed to the
+// primary instead of a replica that may not have the write yet.
+const WITH_CREDENTIALS: RequestInit = { credentials: 'include' };
+
+// Largest page /api/sessions serves
+const SESSION_LIST_PAGE_SIZE = 500;
+
 // Check if we're in mock mode (stored in localStorage)
 const isMockMode = () => {
   if (FORCE_MOCK_MODE) return true;
@@ -52,6 +60,7 @@ class ApiClient {
     }
 
     const response = await fetch(`${this.baseUrl}/start-session`, {
+      ...WITH_CREDENTIALS,
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(request),
@@ -69,6 +78,7 @@ class ApiClient {
     }
 
     const response = await fetch(`${this.baseUrl}/next-turn`, {
+      ...WITH_CREDENTIALS,
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(request),
@@ -80,12 +90,14 @@ class ApiClient {
     return response.json();
   }
 
-  async getSessionHistory(sessionId: string): Promise<SessionHistoryResponse> {
+  async getSessionHistory(sessionId: string, sinceTurn?: number): Promise<SessionHistoryResponse> {
     if (isMockMode()) {
       return mockApiClient.getSessionHistory(sessionId);
     }
 
-    const response = await fetch(`${this.baseUrl}/session/${sessionId}/history`);
+    // The server sends ETags, so the browser cache turns unchanged polls into 304s
+    const query = sinceTurn !== undefined ? `?since_turn=${sinceTurn}` : '';
+    const response = await fetch(`${this.baseUrl}/session/${sessionId}/history${query}`, WITH_CREDENTIALS);
     if (!response.ok) {
       const errorData = await response.json().catch(() => ({}));
       throw new Error(errorData.detail || `Failed to fetch history: ${response.statusText}`);
@@ -98,7 +110,7 @@ class ApiClient {
       return mockApiClient.getSessionStatus(sessionId);
     }
 
-    const response = await fetch(`${this.baseUrl}/session/${sessionId}/status`);
+    const response = await fetch(`${this.baseUrl}/session/${sessionId}/status`, WITH_CREDENTIALS);
     if (!response.ok) {
       const errorData = await response.json().catch(() => ({}));
       throw new Error(errorData.detail || `Failed to fetch status: ${response.statusText}`);
@@ -111,12 +123,24 @@ class ApiClient {
       return mockApiClient.listSessions();
     }
 
-    const response = await fetch(`${this.baseUrl}/sessions`);
-    if (!response.ok) {
-      const errorData = await response.json().catch(() => ({}));
-      throw new Error(errorData.detail || `Failed to fetch sessions: ${response.statusText}`);
-    }
-    return response.json();
+    // Follow next_cursor so every session is listed, one page at a time
+    const sessions: SessionListResponse['sessions'] = [];
+    let cursor: string | null | undefined = null;
+    do {
+      const params = new URLSearchParams({ limit: String(SESSION_LIST_PAGE_SIZE) });
+      if (cursor) {
+        params.set('cursor', cursor);
+      }
+      const response = await fetch(`${this.baseUrl}/sessions?${params}`, WITH_CREDENTIALS);
+      if (!response.ok) {
+        const errorData = await response.json().catch(() => ({}));
+        throw new Error(errorData.detail || `Failed to fetch sessions: ${response.statusText}`);
+      }
+      const page: SessionListResponse = await response.json();
+      sessions.push(...page.sessions);
+      cursor = page.next_cursor;
+    } while (cursor);
+    return { sessions, next_cursor: null };
   }
 
   async healthCheck(): Promise<{ status: string }> {
@@ -86,6 +86,8 @@ export interface SessionHistoryResponse {
   }>;
   messages: SessionHistoryMessage[];
   guesses: SessionHistoryGuess[];
+  // Last completed turn; pass as sinceTurn to fetch only newer entries
+  latest_turn?: number;
 }
 
 export interface SessionStatusResponse {
@@ -109,4 +111,6 @@ export interface SessionListItem {
 
 export interface SessionListResponse {
   sessions: SessionListItem[];
+  // Set when more sessions follow; pass back as `cursor`
+  next_cursor?: string | null;
 }